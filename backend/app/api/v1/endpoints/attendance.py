@@ -3,15 +3,18 @@ Attendance Endpoints (API v1)
 Handles attendance file upload and record management
 """
 from app.core.azure_utils import logger
-from fastapi import APIRouter, Depends, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, Depends, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+import datetime
 from typing import Optional
-import io
+import asyncio
 
 from app.api.dependencies import get_db, get_current_user, check_admin
 from app.services.attendance_service import AttendanceService
+from app.core.executors import get_parse_pool, get_io_pool, run_in_pool
 from app.models.models import Employee
 import logging
 logger = logging.getLogger(__name__)
@@ -26,9 +29,24 @@ class AttendanceUpdate(BaseModel):
     out_duration: Optional[str] = None
     attendance_status: Optional[str] = None
 
+class AttendanceCorrection(AttendanceUpdate):
+    """One entry of a bulk correction, addressed by id or by emp_id + date"""
+    id: Optional[int] = Field(None, gt=0)
+    emp_id: Optional[str] = None
+    date: Optional[datetime.date] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if not self.id and not (self.emp_id and self.date):
+            raise ValueError("Each correction needs an id or an emp_id and date")
+        return self
+
+class AttendanceBulkCorrection(BaseModel):
+    """Schema for bulk attendance corrections"""
+    corrections: List[AttendanceCorrection] = Field(..., min_length=1, max_length=5000)
+
 @router.post("/upload/files")
 async def upload_files(
-    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     admin: Employee = Depends(check_admin),
     db: Session = Depends(get_db)
@@ -37,22 +55,29 @@ async def upload_files(
     Upload attendance files
     
     - Accepts Excel/CSV files
-    - Processes in BACKGROUND (non-blocking)
-    - Returns immediate "Processing started" message
+    - Files are parsed in parallel on the parse process pool
+    - Valid files are queued as ingestion jobs for the worker process
+    - Returns immediately with one job id per file for progress polling
     
     Requires: Admin/HR/CEO role
     """
-    # 1. Read and VALIDATE all files synchronously
-    from app.services.cleaner import detect_and_clean_memory
+    # 1. Read and VALIDATE all files before queueing anything
+    from app.services.parse_cache import validate_and_cache_file
     from fastapi import HTTPException
     
+    contents = [await file.read() for file in files]
+    
+    # Parsing is CPU-bound: run it in worker processes so the event loop
+    # keeps serving other requests, one file per process. The cleaned records
+    # land in the parse cache, so the ingestion worker does not parse again.
+    parse_pool = get_parse_pool()
+    validations = await asyncio.gather(*(
+        run_in_pool(parse_pool, validate_and_cache_file, content) for content in contents
+    ))
+    
     file_data_list = []
-    for file in files:
-        content = await file.read()
-        
-        # Synchronous Validation
-        cleaned_data, detected_type = detect_and_clean_memory(content)
-        if not cleaned_data:
+    for file, content, (record_count, detected_type) in zip(files, contents, validations):
+        if record_count is None:
             logger.error(f"Upload rejected for {file.filename}: {detected_type}")
             raise HTTPException(status_code=400, detail=f"File '{file.filename}' rejected: {detected_type}")
             
@@ -60,68 +85,65 @@ async def upload_files(
             "filename": file.filename,
             "content": content,
             "content_type": file.content_type,
-            "cleaned_data": cleaned_data,
             "detected_type": detected_type
         })
     
-    # 2. Add to background tasks only after validation passes for ALL files
-    background_tasks.add_task(process_files_background, file_data_list, admin.email)
+    # 2. Queue durable ingestion jobs only after validation passes for ALL files;
+    # the ingestion worker process picks them up (see ingestion_worker.py)
+    service = AttendanceService(db)
+    jobs = await run_in_pool(get_io_pool(), service.enqueue_upload_jobs, file_data_list, admin)
     
-    return {"message": f"Successfully validated {len(files)} file(s). Processing has started."}
+    return {
+        "message": f"Successfully validated {len(files)} file(s). Processing has started.",
+        "jobs": jobs
+    }
 
-from app.core.database import SessionLocal
-from app.models.models import Employee
+@router.get("/upload/jobs")
+def list_upload_jobs(
+    limit: int = 50,
+    admin: Employee = Depends(check_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    List recent attendance upload jobs
+    
+    - Newest first
+    - Returns status and row counts for each job
+    
+    Requires: Admin/HR/CEO role
+    """
+    service = AttendanceService(db)
+    return [service.get_upload_job(job.id) for job in service.job_repo.get_recent(limit)]
 
-def process_files_background(file_data_list: List[dict], admin_email: str):
-    """Background task to process files"""
-    db = SessionLocal()
-    try:
-        # Re-fetch admin because object detaches
-        admin = db.query(Employee).filter(Employee.email == admin_email).first()
-        if not admin:
-            logger.error(f"Admin {admin_email} not found during background processing")
-            return
-
-        service = AttendanceService(db)
-        
-        # We need to mock UploadFile-like objects for the service
-        # or refactor service to accept bytes.
-        # Let's mock it to minimize service refactoring.
-        class MockUploadFile:
-            def __init__(self, filename, content, content_type, cleaned_data=None, detected_type=None):
-                self.filename = filename
-                self.content_type = content_type
-                self.file = io.BytesIO(content) 
-                self.cleaned_data = cleaned_data
-                self.detected_type = detected_type
-            
-            async def read(self):
-                return self.file.getvalue()
-
-        mock_files = [
-            MockUploadFile(
-                f["filename"], 
-                f["content"], 
-                f["content_type"], 
-                f.get("cleaned_data"), 
-                f.get("detected_type")
-            ) 
-            for f in file_data_list
-        ]
-        
-        # Call the synchronous service method
-        service.process_uploaded_files(mock_files, admin)
-        
-    except Exception as e:
-        logger.error(f"Background processing error: {e}")
-    finally:
-        db.close()
+@router.get("/upload/jobs/{job_id}")
+def get_upload_job(
+    job_id: int,
+    admin: Employee = Depends(check_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Get attendance upload job progress
+    
+    - Status: QUEUED, PARSING, WRITING, DONE or FAILED
+    - rows_processed / rows_written are updated after every chunk
+    - error holds the rejection reason for FAILED jobs
+    
+    Requires: Admin/HR/CEO role
+    """
+    service = AttendanceService(db)
+    return service.get_upload_job(job_id)
 
 
 @router.get("/")
 def get_attendance(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    emp_id: Optional[str] = None,
+    department: Optional[str] = None,
+    status: Optional[str] = None,
+    source_file: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
     user: Employee = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -131,10 +153,106 @@ def get_attendance(
     - Employees see only their own records
     - Admin/HR/CEO see all records
     - Supports optional date range filtering
-    - Returns list of attendance records
+    - Optional filters: emp_id, department, status, source_file
+    - With limit (and cursor for later pages): returns {"items", "next_cursor"},
+      ordered by date then id, newest first
+    - Without limit: returns list of attendance records, streamed as a JSON array
+    """
+    service = AttendanceService(db)
+    filters = {
+        "emp_id": emp_id,
+        "department": department,
+        "status": status,
+        "source_file": source_file
+    }
+    
+    if limit or cursor:
+        return service.get_attendance_page(user, start_date, end_date, filters, cursor, limit or 100)
+    
+    return StreamingResponse(
+        service.stream_attendance_records(user, start_date, end_date, filters),
+        media_type="application/json"
+    )
+
+@router.get("/summary/status")
+def get_attendance_status_summary(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    emp_id: Optional[str] = None,
+    department: Optional[str] = None,
+    user: Employee = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get attendance status counts per employee
+    
+    - Days per attendance status, total/average worked minutes and
+      overtime minutes (above 8 hours a day) for each employee
+    - Defaults to the current month
+    - Optional filters: emp_id, department
+    - Employees see only their own summary
+    """
+    service = AttendanceService(db)
+    return service.get_status_summary(user, start_date, end_date, emp_id, department)
+
+@router.get("/calendar/{year}")
+def get_attendance_calendar(
+    year: int,
+    emp_id: Optional[str] = None,
+    user: Employee = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get yearly attendance bitmaps for calendar and heatmap views
+    
+    - One base64 bitset per status (present, on_leave, absent) per employee
+    - Bit n (byte n // 8, least significant bit first) is day n of the
+      year, counting 1 January as day 0
+    - Optional filter: emp_id
+    - Employees see only their own calendar
+    """
+    service = AttendanceService(db)
+    return service.get_year_calendar(user, year, emp_id)
+
+@router.post("/recompute-status")
+def recompute_attendance_status(
+    start_date: str,
+    end_date: str,
+    admin: Employee = Depends(check_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Re-derive Present/Absent for a date range
+    
+    - Applies the current present threshold (ATTENDANCE_PRESENT_THRESHOLD_MIN)
+      to the stored worked minutes, without re-uploading files
+    - Manually corrected and "On Leave" days are not changed
+    - Returns the number of records whose status changed
+    
+    Requires: Admin/HR/CEO role
+    """
+    service = AttendanceService(db)
+    return service.recompute_attendance_status(start_date, end_date)
+
+@router.post("/corrections")
+def bulk_correct_attendance(
+    data: AttendanceBulkCorrection,
+    admin: Employee = Depends(check_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Correct many attendance records at once
+    
+    - Each entry targets a record by id or by emp_id + date
+    - All corrections are applied in one transaction; if any entry does
+      not match a record nothing is changed
+    - Corrected records are flagged as manually corrected by the caller
+    
+    Requires: Admin/HR/CEO role
     """
     service = AttendanceService(db)
-    return service.get_attendance_records(user, start_date, end_date)
+    corrections = [entry.model_dump(exclude_unset=True) for entry in data.corrections]
+    return service.bulk_correct_attendance(corrections, admin.emp_id)
 
 @router.put("/{id}")
 def update_attendance(
@@ -154,7 +272,7 @@ def update_attendance(
     """
     service = AttendanceService(db)
     update_dict = data.dict(exclude_unset=True)
-    return service.update_attendance_record(id, update_dict)
+    return service.update_attendance_record(id, update_dict, corrected_by=admin.emp_id)
 
 @router.delete("/{id}")
 def delete_attendance(
@@ -2,13 +2,15 @@
 Payroll API Endpoints
 Handles payroll processing and payslip generation
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.api.dependencies.database import get_db
 from app.api.dependencies.auth import get_current_user
+from app.core.executors import get_io_pool, run_in_pool
 from app.services.payroll_service import PayrollService
+from app.services.payroll_run_service import run_parallel_payroll
 from app.services.pdf_service import PDFService
 from app.repositories.payroll_repository import PayrollRepository
 from app.repositories.employee_repository import EmployeeRepository
@@ -46,27 +48,66 @@ async def process_all_payroll(
     if current_user.role not in ["HR", "SUPER_ADMIN", "CEO"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    from app.repositories.salary_repository import SalaryRepository
-    salary_repo = SalaryRepository(db)
+    # Computes and writes the whole month: keep the event loop free meanwhile
     payroll_service = PayrollService(db)
+    return await run_in_pool(get_io_pool(), payroll_service.process_all_payroll, month, year, processed_by=current_user.emp_id)
+
+@router.post("/run/{month}/{year}")
+async def run_payroll_parallel(
+    month: int,
+    year: int,
+    workers: Optional[int] = Query(None, ge=1, le=64),
+    db: Session = Depends(get_db),
+    current_user: Employee = Depends(get_current_user)
+):
+    """Process payroll for all employees for a month, sharded across worker processes"""
+    if current_user.role not in ["HR", "SUPER_ADMIN", "CEO"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail="Invalid month")
+    
+    # The run waits on its worker processes; keep the event loop free meanwhile
+    return await run_in_pool(get_io_pool(), run_parallel_payroll, month, year, current_user.emp_id, workers)
+
+@router.get("/preview/{month}/{year}")
+async def preview_payroll(
+    month: int,
+    year: int,
+    db: Session = Depends(get_db),
+    current_user: Employee = Depends(get_current_user)
+):
+    """Dry-run payroll for all employees for a month (nothing is saved)"""
+    if current_user.role not in ["HR", "SUPER_ADMIN", "CEO"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Get all employees with active salary
-    active_salaries = salary_repo.get_all_active()
-    results = []
-    
-    for salary in active_salaries:
-        try:
-            payroll = payroll_service.process_payroll(
-                emp_id=salary.emp_id,
-                month=month,
-                year=year,
-                processed_by=current_user.emp_id
-            )
-            results.append({"emp_id": salary.emp_id, "status": "success"})
-        except Exception as e:
-            results.append({"emp_id": salary.emp_id, "status": "failed", "error": str(e)})
-    
-    return {"processed": len(results), "results": results}
+    # Computes the whole month: keep the event loop free meanwhile
+    payroll_service = PayrollService(db)
+    return await run_in_pool(get_io_pool(), payroll_service.preview_payroll, month, year)
+
+@router.get("/recompute/pending")
+async def get_pending_recomputes(
+    db: Session = Depends(get_db),
+    current_user: Employee = Depends(get_current_user)
+):
+    """List unpaid payroll records queued for recompute by late attendance, leave or salary changes"""
+    if current_user.role not in ["HR", "SUPER_ADMIN", "CEO"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    payroll_service = PayrollService(db)
+    return payroll_service.get_pending_recomputes()
+
+@router.post("/recompute")
+async def recompute_marked_payroll(
+    db: Session = Depends(get_db),
+    current_user: Employee = Depends(get_current_user)
+):
+    """Recompute only the queued unpaid payroll records"""
+    if current_user.role not in ["HR", "SUPER_ADMIN", "CEO"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # May recompute many records: keep the event loop free meanwhile
+    payroll_service = PayrollService(db)
+    return await run_in_pool(get_io_pool(), payroll_service.recompute_marked_payroll, processed_by=current_user.emp_id)
 
 @router.get("/list/{month}/{year}", response_model=List[PayrollRecordResponse])
 async def get_payroll_list(
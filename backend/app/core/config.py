@@ -130,6 +130,72 @@ class Settings(BaseSettings):
         description="Logging level: DEBUG, INFO, WARNING, ERROR, CRITICAL"
     )
     
+    # ========================================================================
+    # WORKER POOLS
+    # ========================================================================
+    PARSE_POOL_WORKERS: int = Field(
+        default=0,
+        ge=0,
+        description="Worker processes for spreadsheet parsing (0 = one per CPU core)"
+    )
+    
+    IO_POOL_WORKERS: int = Field(
+        default=4,
+        ge=1,
+        description="Worker threads for blocking I/O such as attendance ingestion writes"
+    )
+    
+    PAYROLL_RUN_WORKERS: int = Field(
+        default=0,
+        ge=0,
+        description="Worker processes (one shard each) for parallel payroll runs (0 = one per CPU core)"
+    )
+    
+    # ========================================================================
+    # ATTENDANCE INGESTION WORKER
+    # ========================================================================
+    INGESTION_POLL_SECONDS: int = Field(
+        default=5,
+        ge=1,
+        description="How often the ingestion worker checks for queued upload jobs"
+    )
+    
+    INGESTION_STALE_MINUTES: int = Field(
+        default=10,
+        ge=1,
+        description="Requeue running upload jobs with no progress for this long (worker died)"
+    )
+    
+    INGESTION_MAX_ATTEMPTS: int = Field(
+        default=3,
+        ge=1,
+        description="Mark an upload job FAILED instead of retrying it after this many attempts"
+    )
+    
+    # ========================================================================
+    # ATTENDANCE POLICY
+    # ========================================================================
+    ATTENDANCE_PRESENT_THRESHOLD_MIN: int = Field(
+        default=210,  # 3.5 hours
+        ge=0,
+        le=1440,
+        description="Minutes worked from which a day counts as Present (below it: Absent)"
+    )
+    
+    # ========================================================================
+    # PARSED FILE CACHE
+    # ========================================================================
+    PARSE_CACHE_DIR: str = Field(
+        default=os.path.join("cache", "parsed"),
+        description="Directory for cleaned attendance records keyed by file hash"
+    )
+    
+    PARSE_CACHE_MAX_MB: int = Field(
+        default=256,
+        ge=0,
+        description="Size cap for the parsed file cache; least recently used entries are evicted (0 = disabled)"
+    )
+    
     # ========================================================================
     # OTP SETTINGS
     # ========================================================================
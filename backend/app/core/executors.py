@@ -0,0 +1,61 @@
+"""
+Shared Worker Pools
+
+CPU-bound work (spreadsheet parsing) goes to a process pool so it runs on
+other cores and never blocks the event loop; blocking I/O (database calls
+made from async endpoints) goes to a thread pool. Both are created on first use and
+sized from settings.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_parse_pool = None
+_io_pool = None
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Process pool for CPU-bound parsing"""
+    global _parse_pool
+    with _lock:
+        if _parse_pool is None:
+            workers = get_settings().PARSE_POOL_WORKERS or os.cpu_count() or 1
+            logger.info(f"Starting parse pool with {workers} processes")
+            # spawn: a forked child would inherit the server's threads, locks and
+            # open database connections; spawned workers start clean
+            _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _parse_pool
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """Thread pool for blocking I/O"""
+    global _io_pool
+    with _lock:
+        if _io_pool is None:
+            workers = get_settings().IO_POOL_WORKERS
+            logger.info(f"Starting I/O pool with {workers} threads")
+            _io_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hrms-io")
+        return _io_pool
+
+async def run_in_pool(pool: Executor, func, *args, **kwargs):
+    """Await func(*args, **kwargs) on the given pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, partial(func, *args, **kwargs))
+
+def shutdown_executors() -> None:
+    """Stop both pools (called on application shutdown)"""
+    global _parse_pool, _io_pool
+    with _lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+        if _io_pool is not None:
+            _io_pool.shutdown(wait=True)
+            _io_pool = None
@@ -29,6 +29,11 @@ app.add_middleware(
 # Include Central Router
 app.include_router(api_router)
 
+@app.on_event("shutdown")
+def shutdown_worker_pools():
+    from app.core.executors import shutdown_executors
+    shutdown_executors()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to RBIS HRMS API", "status": "Online"}
@@ -10,9 +10,12 @@ from app.models.employee import Employee, UserRole, UserStatus
 
 # Import Attendance models
 from app.models.attendance import Attendance
+from app.models.attendance_summary import AttendanceMonthlySummary
+from app.models.attendance_calendar import AttendanceYearBitmap
 
 # Import File Upload models
 from app.models.file_upload import FileUploadLog
+from app.models.ingestion_job import IngestionJob, IngestionJobStatus
 
 # Import Leave models
 from app.models.leave import (
@@ -29,7 +32,7 @@ from app.models.salary_structure import SalaryStructure
 from app.models.deduction import DeductionType, EmployeeDeduction, CalculationType
 
 # Import Payroll models
-from app.models.payroll import PayrollRecord, PayrollStatus
+from app.models.payroll import PayrollRecord, PayrollStatus, PayrollRecomputeMark
 
 # Overtime models removed
 
@@ -47,9 +50,13 @@ __all__ = [
     
     # Attendance
     "Attendance",
+    "AttendanceMonthlySummary",
+    "AttendanceYearBitmap",
     
     # File Upload
     "FileUploadLog",
+    "IngestionJob",
+    "IngestionJobStatus",
     
     # Leave
     "LeaveType",
@@ -69,4 +76,5 @@ __all__ = [
     # Payroll
     "PayrollRecord",
     "PayrollStatus",
+    "PayrollRecomputeMark",
 ]
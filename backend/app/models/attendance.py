@@ -2,13 +2,18 @@
 Attendance Model
 Contains Attendance tracking model
 """
-from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, Unicode
+from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, Unicode, Index, LargeBinary
 from sqlalchemy.orm import relationship, backref
 from app.models.base import Base
+from app.utils.punch_utils import MAX_PUNCH_BYTES
 
 class Attendance(Base):
     """Attendance model - tracks employee attendance records"""
     __tablename__ = "attendance"
+    __table_args__ = (
+        # One row per employee per day; also the conflict target for bulk upserts
+        Index("uq_attendance_emp_date", "emp_id", "date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     emp_id = Column(Unicode(50), ForeignKey("employees.emp_id", ondelete="CASCADE"), index=True, nullable=False)
@@ -21,8 +26,19 @@ class Attendance(Base):
     in_duration = Column(String(100), nullable=True)
     out_duration = Column(String(100), nullable=True)
     total_duration = Column(String(100), nullable=True)
+    # Same values in whole minutes (clock times as minutes after midnight) for SQL SUM/AVG
+    first_in_min = Column(Integer, nullable=True)
+    last_out_min = Column(Integer, nullable=True)
+    in_duration_min = Column(Integer, nullable=True)
+    out_duration_min = Column(Integer, nullable=True)
+    total_duration_min = Column(Integer, nullable=True)
     punch_records = Column(String(2000), nullable=True)
+    # punch_records packed as 2 bytes per punch (see app.utils.punch_utils)
+    punch_minutes = Column(LargeBinary(MAX_PUNCH_BYTES), nullable=True)
     attendance_status = Column(String(50))
     source_file = Column(String(255))
+    # Fingerprint of the cleaned values last ingested for this day; cleared by
+    # manual edits so an unchanged re-upload is skipped only for untouched rows
+    content_hash = Column(String(16), nullable=True)
     is_manually_corrected = Column(Boolean, default=False)
     corrected_by = Column(String(100), nullable=True)
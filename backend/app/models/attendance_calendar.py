@@ -0,0 +1,28 @@
+"""
+Attendance Calendar Model
+Contains the per-employee yearly attendance bitmaps
+"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Unicode, Index, LargeBinary
+from app.models.base import Base, get_ist_now
+
+# 366 day bits (leap years included), rounded up to whole bytes
+YEAR_BITMAP_BYTES = 46
+
+class AttendanceYearBitmap(Base):
+    """Yearly attendance bitmaps - one row per employee per year, one bitset per status.
+
+    Bit n (0-based day of the year) lives in byte n // 8 at position n % 8
+    (least significant bit first), so 1 January is bit 0 of byte 0.
+    """
+    __tablename__ = "attendance_year_bitmaps"
+    __table_args__ = (
+        Index("uq_attendance_bitmap_emp_year", "emp_id", "year", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    emp_id = Column(Unicode(50), ForeignKey("employees.emp_id", ondelete="CASCADE"), nullable=False, index=True)
+    year = Column(Integer, nullable=False)
+    present_bits = Column(LargeBinary(YEAR_BITMAP_BYTES), nullable=False)
+    on_leave_bits = Column(LargeBinary(YEAR_BITMAP_BYTES), nullable=False)
+    absent_bits = Column(LargeBinary(YEAR_BITMAP_BYTES), nullable=False)
+    updated_at = Column(DateTime, default=get_ist_now, onupdate=get_ist_now)
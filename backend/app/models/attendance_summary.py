@@ -0,0 +1,24 @@
+"""
+Attendance Summary Model
+Contains the per-employee monthly attendance rollup
+"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Unicode, Index
+from app.models.base import Base, get_ist_now
+
+class AttendanceMonthlySummary(Base):
+    """Monthly attendance rollup - one row per employee per month, rebuilt from attendance whenever a day in it changes"""
+    __tablename__ = "attendance_monthly_summary"
+    __table_args__ = (
+        Index("uq_attendance_summary_emp_month", "emp_id", "year", "month", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    emp_id = Column(Unicode(50), ForeignKey("employees.emp_id", ondelete="CASCADE"), nullable=False, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    present_days = Column(Integer, nullable=False, default=0)
+    on_leave_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
+    recorded_days = Column(Integer, nullable=False, default=0)  # attendance rows of any status
+    total_minutes = Column(Integer, nullable=False, default=0)  # SUM(total_duration_min)
+    updated_at = Column(DateTime, default=get_ist_now, onupdate=get_ist_now)
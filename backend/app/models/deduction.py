@@ -2,11 +2,11 @@
 Deduction Models
 Contains deduction types and employee deductions
 """
-from sqlalchemy import Column, Integer, String, DECIMAL, Boolean, Date, ForeignKey, Unicode
+from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, Boolean, Date, ForeignKey, Unicode
 from sqlalchemy.orm import relationship, backref
 from decimal import Decimal
 import enum
-from app.models.base import Base
+from app.models.base import Base, get_ist_now
 
 class CalculationType(str, enum.Enum):
     """Calculation type enumeration"""
@@ -24,6 +24,7 @@ class DeductionType(Base):
     default_value = Column(DECIMAL(10, 2), nullable=True)
     is_mandatory = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
+    updated_at = Column(DateTime, default=get_ist_now, onupdate=get_ist_now)
 
 class EmployeeDeduction(Base):
     """Employee Deduction model - represents employee-specific deductions"""
@@ -41,3 +42,4 @@ class EmployeeDeduction(Base):
     is_active = Column(Boolean, default=True)
     effective_from = Column(Date, nullable=False)
     effective_to = Column(Date, nullable=True)
+    updated_at = Column(DateTime, default=get_ist_now, onupdate=get_ist_now)
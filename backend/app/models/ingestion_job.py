@@ -0,0 +1,35 @@
+"""
+Ingestion Job Model
+Contains the durable attendance upload job queue
+"""
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+import enum
+from app.models.base import Base, get_ist_now
+
+class IngestionJobStatus(str, enum.Enum):
+    """Ingestion job status enumeration"""
+    QUEUED = "QUEUED"
+    PARSING = "PARSING"
+    WRITING = "WRITING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+class IngestionJob(Base):
+    """Ingestion job model - one uploaded attendance file waiting for / being processed by the worker"""
+    __tablename__ = "attendance_ingestion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=True)
+    file_content = Column(LargeBinary, nullable=True)  # Cleared once the job finishes
+    uploaded_by = Column(String(150), nullable=False)
+    status = Column(String(20), default=IngestionJobStatus.QUEUED.value, index=True)
+    report_type = Column(String(100), nullable=True)
+    rows_processed = Column(Integer, default=0)
+    rows_written = Column(Integer, default=0)
+    attempts = Column(Integer, default=0)
+    error = Column(String(2000), nullable=True)
+    created_at = Column(DateTime, default=get_ist_now)
+    started_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=get_ist_now, onupdate=get_ist_now)  # Worker heartbeat
+    finished_at = Column(DateTime, nullable=True)
@@ -15,9 +15,12 @@ from app.models.employee_document import EmployeeDocument
 
 # Re-export Attendance
 from app.models.attendance import Attendance
+from app.models.attendance_summary import AttendanceMonthlySummary
+from app.models.attendance_calendar import AttendanceYearBitmap
 
 # Re-export File Upload
 from app.models.file_upload import FileUploadLog
+from app.models.ingestion_job import IngestionJob, IngestionJobStatus
 
 # Re-export Leave models
 from app.models.leave import (
@@ -34,5 +37,5 @@ from app.models.communication import Announcement, Notification
 # Re-export Payroll & Salary models
 from app.models.salary_structure import SalaryStructure
 from app.models.deduction import DeductionType, EmployeeDeduction, CalculationType
-from app.models.payroll import PayrollRecord, PayrollStatus
+from app.models.payroll import PayrollRecord, PayrollStatus, PayrollRecomputeMark
 
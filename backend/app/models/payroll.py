@@ -1,8 +1,8 @@
 """
 Payroll Model
-Contains payroll records
+Contains payroll records and the queue of records to recompute
 """
-from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, Date, ForeignKey, Unicode
+from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, Date, ForeignKey, Unicode, Index
 from sqlalchemy.orm import relationship, backref
 from decimal import Decimal
 import enum
@@ -52,3 +52,17 @@ class PayrollRecord(Base):
     utr_number = Column(String(50), nullable=True)  # Unique Transaction Reference from bank
     remarks = Column(String(500), nullable=True)
     created_at = Column(DateTime, default=get_ist_now)
+
+class PayrollRecomputeMark(Base):
+    """Payroll recompute mark - an unpaid payroll month whose inputs changed after processing"""
+    __tablename__ = "payroll_recompute_marks"
+    __table_args__ = (
+        Index("uq_payroll_recompute_emp_month", "emp_id", "year", "month", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    emp_id = Column(Unicode(50), ForeignKey("employees.emp_id", ondelete="CASCADE"), nullable=False, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    reason = Column(String(20), nullable=False)  # ATTENDANCE, LEAVE, SALARY
+    marked_at = Column(DateTime, default=get_ist_now)
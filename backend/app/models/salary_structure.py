@@ -29,4 +29,5 @@ class SalaryStructure(Base):
     effective_to = Column(Date, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=get_ist_now)
+    updated_at = Column(DateTime, default=get_ist_now, onupdate=get_ist_now)
     created_by = Column(String(50), nullable=True)
@@ -0,0 +1,121 @@
+"""
+Attendance Bitmap Repository
+Database access layer for AttendanceYearBitmap model
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, extract, insert
+from app.models.models import Attendance, AttendanceYearBitmap, get_ist_now
+from app.models.attendance_calendar import YEAR_BITMAP_BYTES
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import defaultdict
+from datetime import date
+
+# Employees per refresh statement (keeps IN lists well under driver limits)
+REFRESH_BATCH = 500
+
+# attendance_status -> bitmap column
+STATUS_BITS = {
+    "Present": "present_bits",
+    "On Leave": "on_leave_bits",
+    "Absent": "absent_bits"
+}
+
+def day_index(day: date) -> int:
+    """0-based day of the year, the bit position of a date"""
+    return day.timetuple().tm_yday - 1
+
+def build_bitmaps(days: Iterable[Tuple[date, str]]) -> Dict[str, bytes]:
+    """
+    Pack (date, status) pairs of one employee-year into status bitsets
+
+    Returns:
+        Bitmap column name -> YEAR_BITMAP_BYTES bytes
+    """
+    bits = {column: bytearray(YEAR_BITMAP_BYTES) for column in STATUS_BITS.values()}
+    for day, status in days:
+        column = STATUS_BITS.get(status)
+        if column:
+            index = day_index(day)
+            bits[column][index >> 3] |= 1 << (index & 7)
+    return {column: bytes(value) for column, value in bits.items()}
+
+class AttendanceBitmapRepository:
+    """Handles all database operations for AttendanceYearBitmap model"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_for_year(self, year: int, emp_ids: Optional[List[str]] = None) -> List[AttendanceYearBitmap]:
+        """Get the bitmap rows for a year, optionally for some employees only"""
+        query = self.db.query(AttendanceYearBitmap).filter(AttendanceYearBitmap.year == year)
+        if emp_ids is not None:
+            query = query.filter(AttendanceYearBitmap.emp_id.in_(emp_ids))
+        return query.order_by(AttendanceYearBitmap.emp_id).all()
+
+    def refresh(self, keys: Iterable[Tuple[str, int]]) -> int:
+        """
+        Rebuild the bitmaps for the given (emp_id, year) keys
+
+        Reads only (emp_id, date, status) of the touched employee-years and
+        rewrites their rows with one DELETE and one multi-row INSERT per
+        REFRESH_BATCH employees. Pending ORM changes are flushed first; the
+        caller commits.
+
+        Args:
+            keys: (emp_id, year) tuples, duplicates allowed
+
+        Returns:
+            Number of employee-years refreshed
+        """
+        by_year: Dict[int, Set[str]] = defaultdict(set)
+        for emp_id, year in keys:
+            by_year[year].add(emp_id)
+        if not by_year:
+            return 0
+
+        self.db.flush()
+        refreshed = 0
+        for year, emp_ids in by_year.items():
+            emp_ids = sorted(emp_ids)
+            for start in range(0, len(emp_ids), REFRESH_BATCH):
+                batch = emp_ids[start:start + REFRESH_BATCH]
+                days = defaultdict(list)
+                for emp_id, day, status in self.db.query(
+                    Attendance.emp_id, Attendance.date, Attendance.attendance_status
+                ).filter(
+                    Attendance.emp_id.in_(batch),
+                    Attendance.date >= date(year, 1, 1),
+                    Attendance.date <= date(year, 12, 31)
+                ):
+                    days[emp_id].append((day, status))
+
+                self.db.execute(delete(AttendanceYearBitmap).where(
+                    AttendanceYearBitmap.year == year,
+                    AttendanceYearBitmap.emp_id.in_(batch)
+                ))
+                # Employees with no attendance left in the year keep no row
+                now = get_ist_now()
+                rows = [
+                    {"emp_id": emp_id, "year": year, "updated_at": now, **build_bitmaps(emp_days)}
+                    for emp_id, emp_days in days.items()
+                ]
+                if rows:
+                    self.db.execute(insert(AttendanceYearBitmap), rows)
+                refreshed += len(batch)
+        return refreshed
+
+    def rebuild_all(self) -> int:
+        """
+        Recompute every employee-year from attendance (used by the migration)
+
+        Returns:
+            Number of employee-years refreshed
+        """
+        year_col = extract("year", Attendance.date)
+        keys = self.db.query(Attendance.emp_id, year_col).distinct().all()
+        self.db.execute(delete(AttendanceYearBitmap))
+        return self.refresh((emp_id, int(year)) for emp_id, year in keys)
+
+    def commit(self) -> None:
+        """Commit transaction"""
+        self.db.commit()
@@ -3,13 +3,65 @@ Attendance Repository
 Database access layer for Attendance model
 """
 from sqlalchemy.orm import Session
-from app.models.models import Attendance
-from typing import List, Optional
+from app.models.models import Attendance, Employee
+from typing import Iterable, Iterator, List, Optional, Tuple
 from datetime import date
 from sqlalchemy.orm import joinedload
+from sqlalchemy import and_, case, func, or_, text, update
+from app.utils.date_utils import time_to_minutes
+from app.utils.punch_utils import pack_punches
 import functools
+import hashlib
 import time
 
+# "HH:MM" text columns and the integer minute columns derived from them
+MINUTE_COLUMNS = {
+    "first_in": "first_in_min",
+    "last_out": "last_out_min",
+    "in_duration": "in_duration_min",
+    "out_duration": "out_duration_min",
+    "total_duration": "total_duration_min"
+}
+
+# Cleaned values that make up a day's content fingerprint (derived columns
+# follow from these; source_file does not change the day)
+FINGERPRINT_COLUMNS = (
+    "first_in", "last_out", "in_duration", "out_duration", "total_duration",
+    "punch_records", "attendance_status"
+)
+
+# Columns written by bulk ingestion (besides the emp_id/date key)
+UPSERT_COLUMNS = FINGERPRINT_COLUMNS + (
+    "punch_minutes", "source_file", "content_hash"
+) + tuple(MINUTE_COLUMNS.values())
+
+# Derived columns and the text column they are computed from: written
+# together, so an upload that clears the text (e.g. "--:--") clears them too
+DERIVED_COLUMNS = {minute_col: text_col for text_col, minute_col in MINUTE_COLUMNS.items()}
+DERIVED_COLUMNS["punch_minutes"] = "punch_records"
+
+# SQL Server allows 2100 parameters per statement; each attendance row binds
+# emp_id, date and every upsert column (17 today, so 123 rows per MERGE)
+MSSQL_MAX_PARAMS = 2100
+MSSQL_MERGE_BATCH = MSSQL_MAX_PARAMS // (2 + len(UPSERT_COLUMNS))
+
+# Keys per lookup statement when resolving correction targets
+KEY_LOOKUP_BATCH = 500
+
+def add_minute_columns(data: dict) -> dict:
+    """Fill the *_min columns for every "HH:MM" column present in data, and punch_minutes from punch_records"""
+    for text_col, minute_col in MINUTE_COLUMNS.items():
+        if text_col in data:
+            data[minute_col] = time_to_minutes(data[text_col])
+    if "punch_records" in data:
+        data["punch_minutes"] = pack_punches(data["punch_records"])
+    return data
+
+def content_fingerprint(data: dict) -> str:
+    """64-bit hex digest of the cleaned values of one attendance day"""
+    content = "\x1f".join("" if data.get(col) is None else str(data[col]) for col in FINGERPRINT_COLUMNS)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
 def simple_cache(ttl_seconds: int = 300):
     """Simple in-memory cache decorator"""
     def decorator(func):
@@ -90,6 +142,166 @@ class AttendanceRepository:
         
         return query.order_by(Attendance.date.desc()).all()
     
+    def iter_listing_rows(
+        self,
+        emp_id: str = None,
+        start_date: date = None,
+        end_date: date = None,
+        batch_size: int = 1000,
+        department: str = None,
+        status: str = None,
+        source_file: str = None,
+        after: Optional[Tuple[date, int]] = None,
+        limit: Optional[int] = None
+    ) -> Iterator:
+        """
+        Stream attendance rows for listings without building ORM objects
+        
+        Selects the attendance columns (except the binary punch_minutes,
+        punch_records carries the same data) plus Employee.full_name (as
+        employee_name) and fetches them batch_size rows at a time, ordered
+        by (date, id) descending. Passing the (date, id) of the last row
+        seen as `after` continues from there (keyset pagination), which the
+        date index serves directly because it carries the primary key.
+        
+        Args:
+            emp_id: Employee ID (if None, returns all employees)
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+            batch_size: Rows fetched from the cursor per round-trip
+            department: Only employees of this department
+            status: Only this attendance_status
+            source_file: Only rows written from this file
+            after: (date, id) of the last row of the previous page
+            limit: Maximum number of rows
+            
+        Returns:
+            Iterator of Row objects, newest first
+        """
+        query = self.db.query(
+            *(col for col in Attendance.__table__.columns if col.name != "punch_minutes"),
+            Employee.full_name.label("employee_name")
+        ).outerjoin(Employee, Employee.emp_id == Attendance.emp_id)
+        
+        if emp_id:
+            query = query.filter(Attendance.emp_id == emp_id)
+        
+        if start_date:
+            query = query.filter(Attendance.date >= start_date)
+        
+        if end_date:
+            query = query.filter(Attendance.date <= end_date)
+        
+        if department:
+            query = query.filter(Employee.department == department)
+        
+        if status:
+            query = query.filter(Attendance.attendance_status == status)
+        
+        if source_file:
+            query = query.filter(Attendance.source_file == source_file)
+        
+        if after:
+            after_date, after_id = after
+            query = query.filter(or_(
+                Attendance.date < after_date,
+                and_(Attendance.date == after_date, Attendance.id < after_id)
+            ))
+        
+        query = query.order_by(Attendance.date.desc(), Attendance.id.desc())
+        if limit:
+            query = query.limit(limit)
+        return query.yield_per(batch_size)
+    
+    def recompute_statuses(self, start_date: date, end_date: date, present_threshold: int) -> List[Tuple[str, date]]:
+        """
+        Re-derive Present/Absent from total_duration_min with one set-based UPDATE
+        
+        Manually corrected rows, "On Leave" rows and rows without a stored
+        duration are left alone, as are rows whose status would not change.
+        The caller commits.
+        
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+            present_threshold: Minutes worked from which a day is Present
+            
+        Returns:
+            (emp_id, date) of every row whose status changed
+        """
+        derived = case(
+            (Attendance.total_duration_min >= present_threshold, "Present"),
+            else_="Absent"
+        )
+        changed = and_(
+            Attendance.date >= start_date,
+            Attendance.date <= end_date,
+            Attendance.total_duration_min.isnot(None),
+            or_(Attendance.is_manually_corrected.is_(None), Attendance.is_manually_corrected == False),
+            or_(Attendance.attendance_status.is_(None), Attendance.attendance_status != "On Leave"),
+            or_(Attendance.attendance_status.is_(None), Attendance.attendance_status != derived)
+        )
+        
+        self.db.flush()
+        keys = [tuple(row) for row in self.db.query(Attendance.emp_id, Attendance.date).filter(changed)]
+        if keys:
+            self.db.execute(
+                update(Attendance).where(changed).values(attendance_status=derived, content_hash=None),
+                execution_options={"synchronize_session": False}
+            )
+        return keys
+    
+    def get_status_totals(
+        self,
+        start_date: date,
+        end_date: date,
+        emp_id: str = None,
+        department: str = None,
+        regular_minutes: int = 480
+    ) -> List:
+        """
+        Per-employee, per-status day counts and worked minutes for a date range
+        
+        One GROUP BY emp_id, attendance_status query; nothing is loaded
+        row by row.
+        
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+            emp_id: Only this employee (if None, all employees)
+            department: Only employees of this department
+            regular_minutes: Daily minutes above which time counts as overtime
+            
+        Returns:
+            Rows of (emp_id, employee_name, attendance_status, days,
+            worked_minutes, overtime_minutes)
+        """
+        overtime = case(
+            (Attendance.total_duration_min > regular_minutes, Attendance.total_duration_min - regular_minutes),
+            else_=0
+        )
+        query = self.db.query(
+            Attendance.emp_id,
+            Employee.full_name.label("employee_name"),
+            Attendance.attendance_status,
+            func.count(Attendance.id).label("days"),
+            func.coalesce(func.sum(Attendance.total_duration_min), 0).label("worked_minutes"),
+            func.coalesce(func.sum(overtime), 0).label("overtime_minutes")
+        ).outerjoin(Employee, Employee.emp_id == Attendance.emp_id).filter(
+            Attendance.date >= start_date,
+            Attendance.date <= end_date
+        )
+        
+        if emp_id:
+            query = query.filter(Attendance.emp_id == emp_id)
+        
+        if department:
+            query = query.filter(Employee.department == department)
+        
+        return query.group_by(
+            Attendance.emp_id, Employee.full_name, Attendance.attendance_status
+        ).order_by(Attendance.emp_id).all()
+    
     def get_by_emp_date_range(self, emp_id: str, start_date: date, end_date: date) -> List[Attendance]:
         """Alias for get_by_date_range to match service expectation"""
         return self.get_by_date_range(emp_id=emp_id, start_date=start_date, end_date=end_date)
@@ -109,7 +321,7 @@ class AttendanceRepository:
         Returns:
             Created Attendance object
         """
-        record = Attendance(**attendance_data)
+        record = Attendance(**add_minute_columns(dict(attendance_data)))
         self.db.add(record)
         return record
     
@@ -127,8 +339,201 @@ class AttendanceRepository:
         for key, value in update_data.items():
             if hasattr(record, key) and value is not None:
                 setattr(record, key, value)
+                if key in MINUTE_COLUMNS:
+                    setattr(record, MINUTE_COLUMNS[key], time_to_minutes(value))
+                # No longer the ingested content: the next upload writes the day again
+                record.content_hash = None
         return record
     
+    def find_keys(self, ids: List[int] = (), emp_dates: List[Tuple[str, date]] = ()) -> List:
+        """
+        Look up (id, emp_id, date) for records addressed by id or by (emp_id, date)
+        
+        Args:
+            ids: Attendance record IDs
+            emp_dates: (emp_id, date) pairs
+            
+        Returns:
+            Rows of (id, emp_id, date) for the records that exist
+        """
+        rows = []
+        ids = list(ids)
+        for start in range(0, len(ids), KEY_LOOKUP_BATCH):
+            rows.extend(self.db.query(Attendance.id, Attendance.emp_id, Attendance.date).filter(
+                Attendance.id.in_(ids[start:start + KEY_LOOKUP_BATCH])
+            ).all())
+        
+        rows.extend(self._query_emp_dates((Attendance.id, Attendance.emp_id, Attendance.date), emp_dates))
+        return rows
+    
+    def _query_emp_dates(self, columns: tuple, emp_dates: Iterable[Tuple[str, date]]) -> List:
+        """
+        Select columns (starting with emp_id, date) for the given (emp_id, date) keys
+        
+        SQL Server has no row-value IN, so each batch filters on
+        emp_id IN (...) AND date IN (...) and the few extra combinations
+        are dropped here.
+        """
+        emp_dates = sorted(set(emp_dates))
+        wanted = set(emp_dates)
+        rows = []
+        for start in range(0, len(emp_dates), KEY_LOOKUP_BATCH):
+            batch = emp_dates[start:start + KEY_LOOKUP_BATCH]
+            query = self.db.query(*columns).filter(
+                Attendance.emp_id.in_({emp_id for emp_id, _ in batch}),
+                Attendance.date.in_({day for _, day in batch})
+            )
+            rows.extend(row for row in query if (row.emp_id, row.date) in wanted)
+        return rows
+    
+    def drop_unchanged(self, rows: List[dict]) -> List[dict]:
+        """
+        Keep only the rows whose content differs from what was last ingested
+        
+        Sets content_hash on every row and compares it with the stored
+        fingerprint of the same (emp_id, date), so re-uploading a cumulative
+        report only writes the new or changed days.
+        
+        Args:
+            rows: Attendance field dictionaries with emp_id and date
+            
+        Returns:
+            The rows that need writing
+        """
+        for row in rows:
+            row["content_hash"] = content_fingerprint(row)
+        stored = {
+            (row.emp_id, row.date): row.content_hash
+            for row in self._query_emp_dates(
+                (Attendance.emp_id, Attendance.date, Attendance.content_hash),
+                ((row["emp_id"], row["date"]) for row in rows)
+            )
+        }
+        return [row for row in rows if stored.get((row["emp_id"], row["date"])) != row["content_hash"]]
+    
+    def bulk_correct(self, changes: dict, corrected_by: str) -> int:
+        """
+        Apply manual corrections to many records with executemany UPDATEs by id
+        
+        Same rules as update(): None values are ignored and the minute
+        columns follow their "HH:MM" text columns. Every row is flagged
+        is_manually_corrected. The caller commits.
+        
+        Args:
+            changes: Attendance ID -> fields to update
+            corrected_by: emp_id of the user making the correction
+            
+        Returns:
+            Number of records updated
+        """
+        params = []
+        for attendance_id, fields in changes.items():
+            data = add_minute_columns({key: value for key, value in fields.items() if value is not None})
+            data.update(id=attendance_id, is_manually_corrected=True, corrected_by=corrected_by, content_hash=None)
+            params.append(data)
+        if not params:
+            return 0
+        
+        # Rows with the same set of columns are sent as one batched statement
+        self.db.execute(update(Attendance), params)
+        return len(params)
+    
+    def bulk_upsert(self, rows: List[dict]) -> int:
+        """
+        Insert or update many attendance records keyed on (emp_id, date)
+        
+        Compiles to MERGE on SQL Server and INSERT ... ON CONFLICT DO UPDATE
+        on SQLite/PostgreSQL, so a whole chunk is written idempotently without
+        reading it first. Same rules as the row-by-row path: a None value
+        never overwrites stored data, and an "Absent" never replaces "On Leave".
+        Derived columns follow their text column, so a written "--:--" also
+        clears the stored minutes.
+        
+        Args:
+            rows: Attendance field dictionaries with emp_id and date,
+                  unique per (emp_id, date) within the call
+            
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+        
+        keys = ("emp_id", "date") + UPSERT_COLUMNS
+        rows = [add_minute_columns({key: row.get(key) for key in keys}) for row in rows]
+        for row in rows:
+            if row["content_hash"] is None:
+                row["content_hash"] = content_fingerprint(row)
+        
+        dialect = self.db.get_bind().dialect
+        if dialect.name == "mssql":
+            self._merge_mssql(rows, keys, dialect)
+        else:
+            self._insert_on_conflict(rows, dialect.name)
+        return len(rows)
+    
+    def _insert_on_conflict(self, rows: List[dict], dialect_name: str) -> None:
+        """INSERT ... ON CONFLICT (emp_id, date) DO UPDATE (SQLite / PostgreSQL)"""
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise NotImplementedError(f"bulk_upsert is not supported on {dialect_name}")
+        
+        table = Attendance.__table__
+        stmt = dialect_insert(table)
+        excluded = stmt.excluded
+        set_ = {
+            col: func.coalesce(excluded[col], table.c[col])
+            for col in UPSERT_COLUMNS if col != "attendance_status" and col not in DERIVED_COLUMNS
+        }
+        for col, text_col in DERIVED_COLUMNS.items():
+            set_[col] = case((excluded[text_col].is_(None), table.c[col]), else_=excluded[col])
+        set_["attendance_status"] = case(
+            (and_(table.c.attendance_status == "On Leave", excluded.attendance_status == "Absent"), "On Leave"),
+            else_=func.coalesce(excluded.attendance_status, table.c.attendance_status)
+        )
+        stmt = stmt.on_conflict_do_update(index_elements=["emp_id", "date"], set_=set_)
+        self.db.execute(stmt, rows)
+    
+    def _merge_mssql(self, rows: List[dict], keys: tuple, dialect) -> None:
+        """MERGE ... WITH (HOLDLOCK) in batches that fit SQL Server's parameter cap"""
+        table = Attendance.__table__
+        # Cast every placeholder so NULL-only columns still get the column type
+        casts = {key: table.c[key].type.compile(dialect=dialect) for key in keys}
+        update_sql = ", ".join(
+            [
+                f"{col} = COALESCE(source.{col}, target.{col})"
+                for col in UPSERT_COLUMNS if col != "attendance_status" and col not in DERIVED_COLUMNS
+            ] + [
+                f"{col} = CASE WHEN source.{text_col} IS NULL THEN target.{col} ELSE source.{col} END"
+                for col, text_col in DERIVED_COLUMNS.items()
+            ]
+        )
+        
+        for start in range(0, len(rows), MSSQL_MERGE_BATCH):
+            batch = rows[start:start + MSSQL_MERGE_BATCH]
+            values_sql = ", ".join(
+                "(" + ", ".join(f"CAST(:{key}_{i} AS {casts[key]})" for key in keys) + ")"
+                for i in range(len(batch))
+            )
+            params = {f"{key}_{i}": row[key] for i, row in enumerate(batch) for key in keys}
+            self.db.execute(text(f"""
+                MERGE attendance WITH (HOLDLOCK) AS target
+                USING (VALUES {values_sql}) AS source ({", ".join(keys)})
+                ON target.emp_id = source.emp_id AND target.date = source.date
+                WHEN MATCHED THEN UPDATE SET
+                    {update_sql},
+                    attendance_status = CASE
+                        WHEN target.attendance_status = 'On Leave' AND source.attendance_status = 'Absent' THEN 'On Leave'
+                        ELSE COALESCE(source.attendance_status, target.attendance_status)
+                    END
+                WHEN NOT MATCHED THEN
+                    INSERT ({", ".join(keys)}, is_manually_corrected)
+                    VALUES ({", ".join(f"source.{key}" for key in keys)}, 0);
+            """), params)
+    
     def delete(self, record: Attendance) -> None:
         """Delete attendance record"""
         self.db.delete(record)
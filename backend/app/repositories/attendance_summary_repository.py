@@ -0,0 +1,137 @@
+"""
+Attendance Summary Repository
+Database access layer for AttendanceMonthlySummary model
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, extract, func, insert, literal, select, Integer, DateTime
+from app.models.models import Attendance, AttendanceMonthlySummary, get_ist_now
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import defaultdict
+from datetime import date, timedelta
+
+# Employees per DELETE/INSERT ... SELECT statement (keeps IN lists well under driver limits)
+REFRESH_BATCH = 500
+
+SUMMARY_COLUMNS = (
+    "emp_id", "year", "month", "present_days", "on_leave_days",
+    "absent_days", "recorded_days", "total_minutes", "updated_at"
+)
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """First and last day of a month"""
+    start_date = date(year, month, 1)
+    if month == 12:
+        end_date = date(year + 1, 1, 1) - timedelta(days=1)
+    else:
+        end_date = date(year, month + 1, 1) - timedelta(days=1)
+    return start_date, end_date
+
+def _status_count(status: str):
+    return func.coalesce(func.sum(case((Attendance.attendance_status == status, 1), else_=0)), 0)
+
+class AttendanceSummaryRepository:
+    """Handles all database operations for AttendanceMonthlySummary model"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, emp_id: str, year: int, month: int) -> Optional[AttendanceMonthlySummary]:
+        """Get the rollup row for one employee-month"""
+        return self.db.query(AttendanceMonthlySummary).filter(
+            AttendanceMonthlySummary.emp_id == emp_id,
+            AttendanceMonthlySummary.year == year,
+            AttendanceMonthlySummary.month == month
+        ).first()
+
+    def get_for_month(self, year: int, month: int, emp_id_range: Optional[Tuple[str, str]] = None) -> Dict[str, AttendanceMonthlySummary]:
+        """Get every employee's rollup row for a month (optionally emp_id BETWEEN a range), keyed by emp_id"""
+        query = self.db.query(AttendanceMonthlySummary).filter(
+            AttendanceMonthlySummary.year == year,
+            AttendanceMonthlySummary.month == month
+        )
+        if emp_id_range:
+            query = query.filter(AttendanceMonthlySummary.emp_id.between(*emp_id_range))
+        return {row.emp_id: row for row in query}
+
+    def refresh(self, keys: Iterable[Tuple[str, int, int]]) -> int:
+        """
+        Rebuild the rollup rows for the given (emp_id, year, month) keys
+
+        Each month is recomputed with one grouped INSERT ... SELECT over the
+        attendance table (per REFRESH_BATCH employees), so callers only pay
+        for the employee-months they touched. Pending ORM changes are flushed
+        first; the caller commits.
+
+        Args:
+            keys: (emp_id, year, month) tuples, duplicates allowed
+
+        Returns:
+            Number of employee-months refreshed
+        """
+        by_month: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        for emp_id, year, month in keys:
+            by_month[(year, month)].add(emp_id)
+        if not by_month:
+            return 0
+
+        self.db.flush()
+        refreshed = 0
+        for (year, month), emp_ids in by_month.items():
+            start_date, end_date = month_bounds(year, month)
+            emp_ids = sorted(emp_ids)
+            for start in range(0, len(emp_ids), REFRESH_BATCH):
+                batch = emp_ids[start:start + REFRESH_BATCH]
+                self.db.execute(delete(AttendanceMonthlySummary).where(
+                    AttendanceMonthlySummary.year == year,
+                    AttendanceMonthlySummary.month == month,
+                    AttendanceMonthlySummary.emp_id.in_(batch)
+                ))
+                source = select(
+                    Attendance.emp_id,
+                    literal(year, Integer),
+                    literal(month, Integer),
+                    *self._aggregates()
+                ).where(
+                    Attendance.emp_id.in_(batch),
+                    Attendance.date >= start_date,
+                    Attendance.date <= end_date
+                ).group_by(Attendance.emp_id)
+                self.db.execute(insert(AttendanceMonthlySummary).from_select(SUMMARY_COLUMNS, source))
+                refreshed += len(batch)
+        return refreshed
+
+    def rebuild_all(self) -> int:
+        """
+        Recompute the whole rollup table from attendance (used by the migration)
+
+        Returns:
+            Number of rollup rows written
+        """
+        self.db.flush()
+        self.db.execute(delete(AttendanceMonthlySummary))
+        year_col = extract("year", Attendance.date)
+        month_col = extract("month", Attendance.date)
+        source = select(
+            Attendance.emp_id,
+            year_col,
+            month_col,
+            *self._aggregates()
+        ).group_by(Attendance.emp_id, year_col, month_col)
+        self.db.execute(insert(AttendanceMonthlySummary).from_select(SUMMARY_COLUMNS, source))
+        return self.db.query(func.count(AttendanceMonthlySummary.id)).scalar()
+
+    @staticmethod
+    def _aggregates() -> List:
+        """present, on leave, absent, recorded days, total minutes, updated_at"""
+        return [
+            _status_count("Present"),
+            _status_count("On Leave"),
+            _status_count("Absent"),
+            func.count(Attendance.id),
+            func.coalesce(func.sum(Attendance.total_duration_min), 0),
+            literal(get_ist_now(), DateTime)
+        ]
+
+    def commit(self) -> None:
+        """Commit transaction"""
+        self.db.commit()
@@ -4,7 +4,7 @@ Database access layer for Deduction models
 """
 from sqlalchemy.orm import Session
 from app.models.deduction import DeductionType, EmployeeDeduction
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import date
 
 class DeductionRepository:
@@ -63,6 +63,31 @@ class DeductionRepository:
             EmployeeDeduction.is_active == True
         ).all()
     
+    def get_active_deductions_with_type_names(self, emp_id: str = None, emp_id_range: Optional[Tuple[str, str]] = None) -> List:
+        """
+        Get active employee deductions together with their deduction type name
+        
+        One joined query; deductions whose type no longer exists are left out.
+        
+        Args:
+            emp_id: Employee ID (if None, all employees)
+            emp_id_range: Only employees with emp_id BETWEEN these bounds
+            
+        Returns:
+            List of (EmployeeDeduction, type_name) rows
+        """
+        query = self.db.query(EmployeeDeduction, DeductionType.name).join(
+            DeductionType, DeductionType.id == EmployeeDeduction.deduction_type_id
+        ).filter(EmployeeDeduction.is_active == True)
+        
+        if emp_id:
+            query = query.filter(EmployeeDeduction.emp_id == emp_id)
+        
+        if emp_id_range:
+            query = query.filter(EmployeeDeduction.emp_id.between(*emp_id_range))
+        
+        return query.order_by(EmployeeDeduction.id).all()
+    
     def create_employee_deduction(self, deduction_data: dict) -> EmployeeDeduction:
         """Create new employee deduction"""
         emp_deduction = EmployeeDeduction(**deduction_data)
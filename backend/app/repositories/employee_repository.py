@@ -4,7 +4,7 @@ Database access layer for Employee model
 """
 from sqlalchemy.orm import Session
 from app.models.models import Employee
-from typing import Optional, List
+from typing import Optional, List, Set
 
 class EmployeeRepository:
     """Handles all database operations for Employee model"""
@@ -57,6 +57,15 @@ class EmployeeRepository:
         """
         return self.db.query(Employee).all()
     
+    def get_all_emp_ids(self) -> Set[str]:
+        """
+        Get the set of all employee IDs (single column query)
+        
+        Returns:
+            Set of emp_id strings
+        """
+        return {row[0] for row in self.db.query(Employee.emp_id).filter(Employee.emp_id.isnot(None))}
+    
     def count(self) -> int:
         """
         Get total count of employees
@@ -0,0 +1,123 @@
+"""
+Ingestion Job Repository
+Database access layer for IngestionJob model
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import func, literal
+from app.models.models import IngestionJob, IngestionJobStatus, get_ist_now
+from typing import Optional, List
+from datetime import datetime
+
+class IngestionJobRepository:
+    """Handles all database operations for IngestionJob model"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, job_data: dict) -> IngestionJob:
+        """
+        Queue a new ingestion job
+
+        Args:
+            job_data: Dictionary with job fields
+
+        Returns:
+            Created IngestionJob object
+        """
+        job = IngestionJob(**job_data)
+        self.db.add(job)
+        self.db.flush()  # Generate ID
+        return job
+
+    def get_by_id(self, job_id: int) -> Optional[IngestionJob]:
+        """Get ingestion job by ID"""
+        return self.db.query(IngestionJob).filter(IngestionJob.id == job_id).first()
+
+    def claim_next(self) -> Optional[IngestionJob]:
+        """
+        Claim the oldest queued job for this worker
+
+        The QUEUED -> PARSING transition is a conditional UPDATE, so two
+        workers polling at once can never pick up the same job.
+
+        Returns:
+            The claimed job (status PARSING) or None if the queue is empty
+        """
+        candidates = self.db.query(IngestionJob.id).filter(
+            IngestionJob.status == IngestionJobStatus.QUEUED.value
+        ).order_by(IngestionJob.id).limit(5).all()
+
+        for (job_id,) in candidates:
+            claimed = self.db.query(IngestionJob).filter(
+                IngestionJob.id == job_id,
+                IngestionJob.status == IngestionJobStatus.QUEUED.value
+            ).update({
+                "status": IngestionJobStatus.PARSING.value,
+                "started_at": get_ist_now(),
+                "attempts": IngestionJob.attempts + 1
+            }, synchronize_session=False)
+            self.db.commit()
+            if claimed:
+                return self.get_by_id(job_id)
+        return None
+
+    def requeue_stale(self, stale_before: datetime, max_attempts: int) -> int:
+        """
+        Put jobs abandoned by a dead worker back on the queue
+
+        A running job touches updated_at after every chunk, so a job still
+        in PARSING/WRITING that has not moved since stale_before is orphaned.
+        Orphans that already used max_attempts are marked FAILED instead,
+        keeping the last recorded error.
+
+        Args:
+            stale_before: Heartbeat cut-off
+            max_attempts: Attempts after which a job is given up
+
+        Returns:
+            Number of jobs requeued
+        """
+        stale = self.db.query(IngestionJob).filter(
+            IngestionJob.status.in_([IngestionJobStatus.PARSING.value, IngestionJobStatus.WRITING.value]),
+            IngestionJob.updated_at < stale_before
+        )
+        stale.filter(IngestionJob.attempts >= max_attempts).update({
+            "status": IngestionJobStatus.FAILED.value,
+            "finished_at": get_ist_now(),
+            "error": func.coalesce(IngestionJob.error, literal(f"Abandoned after {max_attempts} attempts"))
+        }, synchronize_session=False)
+        count = stale.filter(IngestionJob.attempts < max_attempts).update(
+            {"status": IngestionJobStatus.QUEUED.value}, synchronize_session=False
+        )
+        self.db.commit()
+        return count
+
+    def release_failed(self, job_id: int, error: str, max_attempts: int) -> None:
+        """
+        Hand back a job whose run raised unexpectedly
+
+        The job is queued again with the error recorded, or marked FAILED
+        once it has used max_attempts.
+        """
+        job = self.get_by_id(job_id)
+        if not job:
+            return
+        job.error = error[:2000]
+        if (job.attempts or 0) >= max_attempts:
+            job.status = IngestionJobStatus.FAILED.value
+            job.finished_at = get_ist_now()
+        else:
+            job.status = IngestionJobStatus.QUEUED.value
+        self.db.commit()
+
+    def get_recent(self, limit: int = 50) -> List[IngestionJob]:
+        """Get the most recent ingestion jobs (newest first)"""
+        return self.db.query(IngestionJob).order_by(IngestionJob.id.desc()).limit(limit).all()
+
+    def commit(self) -> None:
+        """Commit transaction"""
+        self.db.commit()
+
+    def rollback(self) -> None:
+        """Rollback transaction"""
+        self.db.rollback()
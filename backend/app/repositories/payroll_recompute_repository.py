@@ -0,0 +1,145 @@
+"""
+Payroll Recompute Repository
+Database access layer for PayrollRecomputeMark model
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, delete, insert, update, or_, and_
+from sqlalchemy.exc import IntegrityError
+from app.models.payroll import PayrollRecord, PayrollRecomputeMark
+from app.models.base import get_ist_now
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import defaultdict
+from datetime import datetime
+
+# Employees per lookup statement (keeps IN lists well under driver limits)
+MARK_BATCH = 500
+
+class PayrollRecomputeRepository:
+    """Handles all database operations for PayrollRecomputeMark model"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def mark(self, keys: Iterable[Tuple[str, int, int]], reason: str) -> int:
+        """
+        Queue the unpaid payroll records of (emp_id, year, month) keys for recompute
+
+        Only months that already have a payroll record which is not PAID are
+        marked. Keys that are already queued get a fresh marked_at, so a
+        recompute that loaded them earlier keeps them for its next run (see
+        delete_handled). The caller commits.
+
+        Args:
+            keys: (emp_id, year, month) tuples, duplicates allowed
+            reason: What changed (ATTENDANCE, LEAVE, SALARY)
+
+        Returns:
+            Number of keys marked
+        """
+        by_month: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        for emp_id, year, month in keys:
+            by_month[(year, month)].add(emp_id)
+
+        marked = 0
+        for (year, month), emp_ids in by_month.items():
+            emp_ids = sorted(emp_ids)
+            for start in range(0, len(emp_ids), MARK_BATCH):
+                batch = emp_ids[start:start + MARK_BATCH]
+                unpaid = self.db.query(PayrollRecord.emp_id).filter(
+                    PayrollRecord.emp_id.in_(batch),
+                    PayrollRecord.year == year,
+                    PayrollRecord.month == month,
+                    PayrollRecord.status != "PAID"
+                )
+                marked += self._queue([(emp_id, year, month) for (emp_id,) in unpaid], reason)
+        return marked
+
+    def mark_from(self, emp_id: str, year: int, month: int, reason: str) -> int:
+        """
+        Queue every unpaid payroll record of an employee from a month onwards
+
+        Used when the salary structure that payroll reads changes. The caller
+        commits.
+
+        Returns:
+            Number of keys marked
+        """
+        unpaid = self.db.query(PayrollRecord.emp_id, PayrollRecord.year, PayrollRecord.month).filter(
+            PayrollRecord.emp_id == emp_id,
+            PayrollRecord.status != "PAID",
+            or_(
+                PayrollRecord.year > year,
+                and_(PayrollRecord.year == year, PayrollRecord.month >= month)
+            )
+        )
+        return self._queue([tuple(row) for row in unpaid], reason)
+
+    def _queue(self, keys: List[Tuple[str, int, int]], reason: str) -> int:
+        """Insert marks for new keys and refresh marked_at/reason of queued ones"""
+        keys = set(keys)
+        if not keys:
+            return 0
+        self.db.flush()
+        queued = {
+            (emp_id, year, month): mark_id
+            for mark_id, emp_id, year, month in self.db.query(
+                PayrollRecomputeMark.id, PayrollRecomputeMark.emp_id, PayrollRecomputeMark.year, PayrollRecomputeMark.month
+            ).filter(PayrollRecomputeMark.emp_id.in_({emp_id for emp_id, _, _ in keys}))
+            if (emp_id, year, month) in keys
+        }
+        now = get_ist_now()
+        requeued = list(queued.values())
+        for start in range(0, len(requeued), MARK_BATCH):
+            self.db.execute(update(PayrollRecomputeMark).where(
+                PayrollRecomputeMark.id.in_(requeued[start:start + MARK_BATCH])
+            ).values(marked_at=now, reason=reason))
+
+        rows = [
+            {"emp_id": emp_id, "year": year, "month": month, "reason": reason, "marked_at": now}
+            for emp_id, year, month in keys - queued.keys()
+        ]
+        if not rows:
+            return len(requeued)
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(PayrollRecomputeMark), rows)
+        except IntegrityError:
+            # Queued concurrently by another writer (whose mark is just as
+            # recent): fall back to one row at a time
+            for row in rows:
+                try:
+                    with self.db.begin_nested():
+                        self.db.execute(insert(PayrollRecomputeMark), [row])
+                except IntegrityError:
+                    pass
+        return len(keys)
+
+    def get_pending(self, limit: Optional[int] = None) -> List[PayrollRecomputeMark]:
+        """Get queued marks, oldest month first"""
+        query = self.db.query(PayrollRecomputeMark).order_by(
+            PayrollRecomputeMark.year, PayrollRecomputeMark.month, PayrollRecomputeMark.emp_id
+        )
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def delete_handled(self, marks: List[Tuple[int, datetime]]) -> None:
+        """
+        Remove handled marks that were not marked again in the meantime
+
+        A mark whose marked_at moved past the value the recompute loaded was
+        refreshed by a later write, so it stays queued. The caller commits.
+
+        Args:
+            marks: (mark id, marked_at as loaded) pairs
+        """
+        if not marks:
+            return
+        table = PayrollRecomputeMark.__table__
+        self.db.execute(
+            delete(table).where(
+                table.c.id == bindparam("mark_id"),
+                table.c.marked_at <= bindparam("loaded_at")
+            ),
+            [{"mark_id": mark_id, "loaded_at": loaded_at} for mark_id, loaded_at in marks]
+        )
@@ -3,8 +3,13 @@ Payroll Repository
 Database access layer for Payroll Record model
 """
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, insert
 from app.models.payroll import PayrollRecord
-from typing import Optional, List
+from app.models.salary_structure import SalaryStructure
+from app.models.deduction import DeductionType, EmployeeDeduction
+from app.models.attendance_summary import AttendanceMonthlySummary
+from typing import Dict, Optional, List, Set, Tuple
+import hashlib
 
 class PayrollRepository:
     """Handles all database operations for Payroll Record model"""
@@ -99,6 +104,84 @@ class PayrollRepository:
         self.db.refresh(payroll)
         return payroll
     
+    def bulk_create(self, rows: List[dict]) -> int:
+        """
+        Insert many payroll records with one executemany INSERT
+        
+        The caller commits.
+        
+        Args:
+            rows: Payroll field dictionaries (same keys in every row)
+            
+        Returns:
+            Number of records inserted
+        """
+        if rows:
+            self.db.execute(insert(PayrollRecord), rows)
+        return len(rows)
+    
+    def get_emp_ids_for_month(self, month: int, year: int, emp_id_range: Optional[Tuple[str, str]] = None) -> Set[str]:
+        """Get the emp_ids that already have a payroll record for a month (optionally emp_id BETWEEN a range)"""
+        query = self.db.query(PayrollRecord.emp_id).filter(
+            PayrollRecord.month == month,
+            PayrollRecord.year == year
+        )
+        if emp_id_range:
+            query = query.filter(PayrollRecord.emp_id.between(*emp_id_range))
+        return {emp_id for (emp_id,) in query}
+    
+    def get_unpaid_for_month(self, month: int, year: int, emp_ids: List[str]) -> Dict[str, PayrollRecord]:
+        """Get the payroll records of some employees for a month that are not PAID, by emp_id"""
+        records = {}
+        for start in range(0, len(emp_ids), 500):
+            for record in self.db.query(PayrollRecord).filter(
+                PayrollRecord.emp_id.in_(emp_ids[start:start + 500]),
+                PayrollRecord.month == month,
+                PayrollRecord.year == year,
+                PayrollRecord.status != "PAID"
+            ):
+                records[record.emp_id] = record
+        return records
+    
+    def get_input_version(self, month: int, year: int) -> str:
+        """
+        Version stamp of everything a month's payroll is computed from
+        
+        (COUNT, MAX(updated_at)) of every input table: salary structures,
+        employee deductions, deduction types (their names go into the
+        deduction details), the month's attendance rollups and the month's
+        processed payroll records (MAX(created_at)). Each of these rows
+        stamps itself on insert and update, so any insert or update moves
+        the MAX and a delete without an insert lowers the COUNT; the stamp
+        therefore changes whenever a recomputed preview could differ.
+        
+        Args:
+            month: Month (1-12)
+            year: Year
+            
+        Returns:
+            Hex digest of the aggregates
+        """
+        def stamp(query):
+            return tuple(query.one())
+        
+        inputs = (
+            stamp(self.db.query(func.count(SalaryStructure.id), func.max(SalaryStructure.updated_at))),
+            stamp(self.db.query(func.count(EmployeeDeduction.id), func.max(EmployeeDeduction.updated_at))),
+            stamp(self.db.query(func.count(DeductionType.id), func.max(DeductionType.updated_at))),
+            stamp(self.db.query(
+                func.count(AttendanceMonthlySummary.id), func.max(AttendanceMonthlySummary.updated_at)
+            ).filter(
+                AttendanceMonthlySummary.year == year,
+                AttendanceMonthlySummary.month == month
+            )),
+            stamp(self.db.query(func.count(PayrollRecord.id), func.max(PayrollRecord.created_at)).filter(
+                PayrollRecord.month == month,
+                PayrollRecord.year == year
+            ))
+        )
+        return hashlib.blake2b(repr(inputs).encode("utf-8"), digest_size=16).hexdigest()
+    
     def update(self, payroll: PayrollRecord) -> PayrollRecord:
         """Update existing payroll record"""
         self.db.commit()
@@ -4,7 +4,7 @@ Database access layer for Salary Structure model
 """
 from sqlalchemy.orm import Session
 from app.models.salary_structure import SalaryStructure
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import date
 
 class SalaryRepository:
@@ -85,8 +85,19 @@ class SalaryRepository:
         })
         self.db.commit()
     
-    def get_all_active(self) -> List[SalaryStructure]:
-        """Get all active salary structures"""
-        return self.db.query(SalaryStructure).filter(
+    def get_all_active(self, emp_id_range: Optional[Tuple[str, str]] = None) -> List[SalaryStructure]:
+        """Get all active salary structures (optionally only emp_id BETWEEN a range)"""
+        query = self.db.query(SalaryStructure).filter(
             SalaryStructure.is_active == True
-        ).all()
+        )
+        if emp_id_range:
+            query = query.filter(SalaryStructure.emp_id.between(*emp_id_range))
+        return query.all()
+    
+    def get_active_emp_ids(self) -> List[str]:
+        """Get the emp_ids with an active salary structure, in database order"""
+        return [
+            emp_id for (emp_id,) in self.db.query(SalaryStructure.emp_id).filter(
+                SalaryStructure.is_active == True
+            ).distinct().order_by(SalaryStructure.emp_id)
+        ]
@@ -4,27 +4,42 @@ Business logic for attendance management and file processing
 """
 from sqlalchemy.orm import Session
 from fastapi import UploadFile, HTTPException
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional, Callable
+import base64
+import json
 import logging
 from datetime import date, datetime, timedelta
 
 from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.attendance_summary_repository import AttendanceSummaryRepository
+from app.repositories.attendance_bitmap_repository import AttendanceBitmapRepository
+from app.repositories.payroll_recompute_repository import PayrollRecomputeRepository
 from app.repositories.file_repository import FileRepository
-from app.models.models import Employee, UserRole
-from app.utils.file_utils import calculate_file_hash, generate_safe_filename, normalize_emp_id
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.models.models import Employee, UserRole, IngestionJob, IngestionJobStatus, get_ist_now
+from app.utils.file_utils import calculate_file_hash, generate_safe_filename, normalize_emp_id, validate_emp_ids
 from app.utils.date_utils import parse_date, format_time
-from app.services.cleaner import detect_and_clean_memory
+from app.services.cleaner import CleanerError, present_threshold_min
+from app.services.parse_cache import cached_clean_chunks
 from app.services.azure_storage_service import upload_bytes_to_azure_sync
 
 logger = logging.getLogger(__name__)
 
+# Attendance listing: rows per JSON fragment sent to the client
+LISTING_CHUNK_ROWS = 500
+LISTING_MAX_PAGE_SIZE = 1000
+
 class AttendanceService:
     """Handles attendance business logic"""
     
     def __init__(self, db: Session):
         self.db = db
         self.attendance_repo = AttendanceRepository(db)
+        self.summary_repo = AttendanceSummaryRepository(db)
+        self.bitmap_repo = AttendanceBitmapRepository(db)
+        self.recompute_repo = PayrollRecomputeRepository(db)
         self.file_repo = FileRepository(db)
+        self.job_repo = IngestionJobRepository(db)
         from app.repositories.employee_repository import EmployeeRepository
         self.employee_repo = EmployeeRepository(db)
     
@@ -75,42 +90,70 @@ class AttendanceService:
         # Read file content
         content = file.file.read()
         
-        # Calculate hash for duplicate detection
-        file_hash = calculate_file_hash(content)
-        existing_file = self.file_repo.get_by_hash(file_hash)
-        
-        # Try to use pre-cleaned data if available
+        # Try to use pre-cleaned data if available, otherwise the parse cache or a fresh stream
         if hasattr(file, 'cleaned_data') and file.cleaned_data:
-            cleaned_data = file.cleaned_data
+            chunks = [file.cleaned_data]
             detected_type = getattr(file, 'detected_type', "In/Out Duration Report")
         else:
-            cleaned_data, detected_type = detect_and_clean_memory(content)
+            chunks, detected_type = cached_clean_chunks(content)
         
-        if not cleaned_data:
+        return self.ingest_file_content(
+            file.filename,
+            content,
+            getattr(file, 'content_type', "application/octet-stream"),
+            admin.email,
+            chunks,
+            detected_type
+        )
+    
+    def ingest_file_content(
+        self,
+        filename: str,
+        content: bytes,
+        content_type: str,
+        uploaded_by: str,
+        chunks: Optional[Iterable[List[Dict]]],
+        detected_type: str,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+        refresh_all_days: bool = False
+    ) -> Dict:
+        """
+        Log, back up and write one parsed attendance file
+        
+        Args:
+            filename: Original file name
+            content: Raw file bytes
+            content_type: MIME type for the blob backup
+            uploaded_by: Email of the uploading admin
+            chunks: Cleaned record chunks, or None if the file was rejected
+            detected_type: Report type, or the rejection reason
+            on_chunk: Optional progress callback, see _process_attendance_records
+            refresh_all_days: See _process_attendance_records
+            
+        Returns:
+            Result dictionary for this file
+            
+        Raises:
+            Exception: Database errors, after rolling back what was not
+            committed
+        """
+        if not chunks:
             return {
-                "filename": file.filename,
+                "filename": filename,
                 "status": "error",
                 "reason": detected_type
             }
 
-        # 1. PRE-VALIDATION: Check pattern
-        import re
-        for i, rec in enumerate(cleaned_data):
-            raw_id = rec.get('EmpID', '')
-            emp_id = normalize_emp_id(raw_id)
-            if not re.match(r'^RBIS\d{4}$', emp_id):
-                return {
-                    "filename": file.filename,
-                    "status": "error",
-                    "reason": f"Data Validation Error: Row {i+1} has invalid ID format '{raw_id}'"
-                }
-
-        # 2. FILE LOGGING (Commit this first)
+        # Calculate hash for duplicate detection
+        file_hash = calculate_file_hash(content)
+        existing_file = self.file_repo.get_by_hash(file_hash)
+        
+        # 1. FILE LOGGING (Commit this first)
         if not existing_file:
-            safe_filename = generate_safe_filename(file.filename)
+            safe_filename = generate_safe_filename(filename)
             log_data = {
-                "filename": file.filename,
-                "uploaded_by": admin.email,
+                "filename": filename,
+                "uploaded_by": uploaded_by,
                 "report_type": detected_type,
                 "file_hash": file_hash,
                 "file_path": safe_filename
@@ -120,92 +163,361 @@ class AttendanceService:
             
             # AZURE UPLOAD
             try:
-                upload_bytes_to_azure_sync(content, safe_filename, getattr(file, 'content_type', "application/octet-stream"))
+                upload_bytes_to_azure_sync(content, safe_filename, content_type or "application/octet-stream")
             except Exception as e:
                 logger.warning(f"Azure backup failed: {e}")
         else:
-            logger.info(f"Using existing upload record for {file.filename}")
+            logger.info(f"Using existing upload record for {filename}")
         
-        # 3. DATABASE PROCESSING (Attendance Records)
+        # 2. DATABASE PROCESSING (Attendance Records)
         try:
-            saved_count, updated_count = self._process_attendance_records(
-                cleaned_data,
-                file.filename
+            total_count, written_count = self._process_attendance_records(
+                chunks,
+                filename,
+                on_chunk,
+                refresh_all_days
             )
             
             self.db.commit()
             return {
-                "filename": file.filename,
+                "filename": filename,
                 "status": "success",
                 "type": detected_type,
-                "details": f"Processed {len(cleaned_data)} records (Saved: {saved_count}, Updated: {updated_count})"
+                "details": f"Processed {total_count} records (Saved/Updated: {written_count})"
             }
-        except Exception as e:
-            logger.error(f"Database error processing records for {file.filename}: {e}")
+        except (CleanerError, ValueError) as e:
+            # Rejected mid-stream: nothing uncommitted from this file is kept
+            logger.error(f"Validation error processing records for {filename}: {e}")
             self.db.rollback()
             return {
-                "filename": file.filename,
+                "filename": filename,
                 "status": "error",
-                "reason": f"Database processing error: {str(e)}"
+                "reason": str(e)
             }
+        except Exception:
+            # Database errors are not the file's fault: the caller decides
+            # (process_uploaded_files reports them, the ingestion worker retries)
+            self.db.rollback()
+            raise
+    
+    def enqueue_upload_jobs(self, file_data_list: List[Dict], admin: Employee) -> List[Dict]:
+        """
+        Queue validated files for the ingestion worker
+        
+        Args:
+            file_data_list: Dicts with filename, content, content_type, detected_type
+            admin: Admin user uploading files
+            
+        Returns:
+            List of {"job_id", "filename"} for progress polling
+        """
+        jobs = [
+            self.job_repo.create({
+                "filename": f["filename"],
+                "content_type": f.get("content_type"),
+                "file_content": f["content"],
+                "uploaded_by": admin.email,
+                "report_type": f.get("detected_type")
+            })
+            for f in file_data_list
+        ]
+        self.job_repo.commit()
+        return [{"job_id": job.id, "filename": job.filename} for job in jobs]
+    
+    def get_upload_job(self, job_id: int) -> Dict:
+        """
+        Get ingestion job progress
+        
+        Raises:
+            HTTPException: If job not found
+        """
+        job = self.job_repo.get_by_id(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Upload job not found")
+        
+        return {
+            "id": job.id,
+            "filename": job.filename,
+            "status": job.status,
+            "report_type": job.report_type,
+            "rows_processed": job.rows_processed,
+            "rows_written": job.rows_written,
+            "attempts": job.attempts,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at
+        }
+    
+    def run_upload_job(self, job: IngestionJob) -> Dict:
+        """
+        Process one claimed ingestion job (called by the ingestion worker)
+        
+        Progress is committed after every chunk together with that chunk's
+        attendance rows. The upserts are idempotent, so a job requeued after
+        a crash simply rewrites the chunks it had already committed; as the
+        rollups are refreshed only at the end of the file, a retry refreshes
+        them for every day in the file, including the days an earlier attempt
+        already wrote.
+        
+        A file the cleaner or validation rejects marks the job FAILED here.
+        Database errors propagate to the ingestion worker, which requeues the
+        job (IngestionJobRepository.release_failed).
+        
+        Args:
+            job: Job in PARSING state, claimed via IngestionJobRepository.claim_next
+            
+        Returns:
+            Result dictionary for the file
+        """
+        content = job.file_content
+        chunks, detected_type = cached_clean_chunks(content)
+        
+        job.status = IngestionJobStatus.WRITING.value
+        job.rows_processed = 0
+        job.rows_written = 0
+        if chunks:
+            job.report_type = detected_type
+        self.job_repo.commit()
+        
+        def record_progress(total: int, written: int):
+            job.rows_processed = total
+            job.rows_written = written
+            self.db.commit()
+        
+        result = self.ingest_file_content(
+            job.filename,
+            content,
+            job.content_type,
+            job.uploaded_by,
+            chunks,
+            detected_type,
+            on_chunk=record_progress,
+            refresh_all_days=(job.attempts or 0) > 1
+        )
+        
+        job.finished_at = get_ist_now()
+        if result["status"] == "success":
+            job.status = IngestionJobStatus.DONE.value
+            job.error = None
+            job.file_content = None
+        else:
+            job.status = IngestionJobStatus.FAILED.value
+            job.error = str(result.get("reason"))[:2000]
+        self.job_repo.commit()
+        
+        return result
     
+    def _validate_chunk(self, chunk: List[Dict], offset: int) -> None:
+        """
+        Check the employee ID pattern for a chunk of cleaned records
+        
+        Raises:
+            ValueError: With the row number (1-based, across the whole file)
+        """
+        validate_emp_ids(chunk, offset)
+
     def _process_attendance_records(
         self,
-        cleaned_data: List[Dict],
-        source_filename: str
+        chunks: Iterable[List[Dict]],
+        source_filename: str,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+        refresh_all_days: bool = False
     ) -> tuple:
-        """Process attendance records with employee existence check"""
-        saved_count = 0
-        updated_count = 0
-        
-        for rec in cleaned_data:
-            raw_id = str(rec.get('EmpID', '')).strip()
-            emp_id = normalize_emp_id(raw_id)
-            if not emp_id: continue
-            
-            # Check if employee exists in system (Foreign Key requirement)
-            if not self.employee_repo.get_by_emp_id(emp_id):
-                continue
-
-            date_val = rec.get('Date')
-            date_obj = parse_date(date_val)
-            if not date_obj: continue
-            
-            existing = self.attendance_repo.get_by_emp_and_date(emp_id, date_obj)
+        """
+        Process attendance records with employee existence check
+        
+        Set-based: the valid emp_id set is loaded once and each chunk is
+        written with a single idempotent upsert on (emp_id, date). Days whose
+        content fingerprint matches the stored one are skipped, so re-uploads
+        of cumulative reports only write new or changed days. The monthly
+        summaries and yearly bitmaps of the written days are refreshed once,
+        after the last chunk.
+        
+        Args:
+            chunks: Iterable of cleaned record lists (a generator when streaming)
+            source_filename: Name of the uploaded file
+            on_chunk: Optional callback(total, written) run after each chunk is
+                      written; it may commit, making progress durable per chunk
+            refresh_all_days: Refresh the rollups for every day in the file,
+                              not just the written ones (a retried job whose
+                              earlier attempt committed chunks without them)
             
-            record_data = {
-                "first_in": format_time(rec.get('First_In')),
-                "last_out": format_time(rec.get('Last_Out')),
-                "in_duration": format_time(rec.get('In_Duration')),
-                "out_duration": format_time(rec.get('Out_Duration')),
-                "total_duration": format_time(rec.get('Total_Duration')),
-                "punch_records": rec.get('Punch_Records'),
-                "attendance_status": rec.get('Attendance'),
-                "source_file": source_filename
-            }
+        Returns:
+            Tuple of (total, written) counts
             
-            if existing:
-                if existing.attendance_status == "On Leave" and record_data["attendance_status"] == "Absent":
-                    record_data["attendance_status"] = "On Leave"
-                self.attendance_repo.update(existing, record_data)
-                updated_count += 1
-            else:
-                record_data.update({"emp_id": emp_id, "date": date_obj})
-                self.attendance_repo.create(record_data)
-                saved_count += 1
+        Raises:
+            CleanerError / ValueError: If a chunk fails parsing or validation
+            Exception: Database errors
+            Nothing is committed here unless on_chunk commits, so the caller
+            can roll back the file; chunks on_chunk did commit get their
+            rollups refreshed and committed before the error is raised.
+        """
+        total_count = 0
+        written_count = 0
+        
+        # Foreign Key requirement: only employees known to the system
+        valid_emp_ids = self.employee_repo.get_all_emp_ids()
+        date_cache = {}
+        touched = set()
+        # Set once on_chunk has run: it may have committed the chunks so far
+        chunks_committed = False
         
-        return saved_count, updated_count
+        try:
+            for chunk in chunks:
+                self._validate_chunk(chunk, total_count)
+                total_count += len(chunk)
+                
+                # Build the target rows for this chunk (last record wins per key)
+                pending = {}
+                for rec in chunk:
+                    raw_id = str(rec.get('EmpID', '')).strip()
+                    emp_id = normalize_emp_id(raw_id)
+                    if not emp_id or emp_id not in valid_emp_ids:
+                        continue
+
+                    date_val = rec.get('Date')
+                    if date_val not in date_cache:
+                        date_cache[date_val] = parse_date(date_val)
+                    date_obj = date_cache[date_val]
+                    if not date_obj: continue
+                
+                    pending[(emp_id, date_obj)] = {
+                        "emp_id": emp_id,
+                        "date": date_obj,
+                        "first_in": format_time(rec.get('First_In')),
+                        "last_out": format_time(rec.get('Last_Out')),
+                        "in_duration": format_time(rec.get('In_Duration')),
+                        "out_duration": format_time(rec.get('Out_Duration')),
+                        "total_duration": format_time(rec.get('Total_Duration')),
+                        "punch_records": rec.get('Punch_Records'),
+                        "attendance_status": rec.get('Attendance'),
+                        "source_file": source_filename
+                    }
+                
+                # Days whose content matches the last upload are not written again
+                changed = self.attendance_repo.drop_unchanged(list(pending.values()))
+                written_count += self.attendance_repo.bulk_upsert(changed)
+                touched.update(pending if refresh_all_days else ((row["emp_id"], row["date"]) for row in changed))
+                if on_chunk:
+                    on_chunk(total_count, written_count)
+                    chunks_committed = True
+        except Exception:
+            # Committed chunks stay written: bring their rollups up to date
+            # before the error reaches the caller
+            self.db.rollback()
+            if chunks_committed:
+                self._refresh_rollups(touched)
+                self.db.commit()
+            raise
+        
+        self._refresh_rollups(touched)
+        return total_count, written_count
+    
+    def _refresh_rollups(self, days: Iterable[tuple]) -> None:
+        """
+        Refresh the monthly summaries and yearly bitmaps covering (emp_id, date)
+        pairs and queue already processed, unpaid payroll of those months for
+        recompute
+        """
+        days = set(days)
+        months = {(emp_id, d.year, d.month) for emp_id, d in days}
+        self.summary_repo.refresh(months)
+        self.bitmap_repo.refresh((emp_id, d.year) for emp_id, d in days)
+        self.recompute_repo.mark(months, reason="ATTENDANCE")
     
     def get_attendance_records(
         self, 
         user: Employee, 
         start_date_str: Optional[str] = None, 
-        end_date_str: Optional[str] = None
+        end_date_str: Optional[str] = None,
+        filters: Optional[Dict] = None
     ) -> List:
         """
         Get attendance records with optional date range
         Defaults to last 180 days if no range provided
         """
+        return list(self._iter_attendance_dicts(user, start_date_str, end_date_str, filters))
+    
+    def get_attendance_page(
+        self,
+        user: Employee,
+        start_date_str: Optional[str] = None,
+        end_date_str: Optional[str] = None,
+        filters: Optional[Dict] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Dict:
+        """
+        Get one page of attendance records (keyset pagination on date, id)
+        
+        Args:
+            user: Current user (employees only see their own records)
+            start_date_str: Optional range start, defaults to 180 days ago
+            end_date_str: Optional range end, defaults to today
+            filters: Optional emp_id, department, status, source_file
+            cursor: next_cursor from the previous page, None for the first page
+            limit: Page size (1 to LISTING_MAX_PAGE_SIZE)
+            
+        Returns:
+            {"items": [...], "next_cursor": str or None}
+            
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        limit = max(1, min(limit, LISTING_MAX_PAGE_SIZE))
+        after = self._decode_cursor(cursor) if cursor else None
+        
+        # Fetch one extra row to know whether another page exists
+        items = list(self._iter_attendance_dicts(
+            user, start_date_str, end_date_str, filters, after=after, limit=limit + 1
+        ))
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = self._encode_cursor(items[-1]['date'], items[-1]['id'])
+        
+        return {"items": items, "next_cursor": next_cursor}
+    
+    def stream_attendance_records(
+        self,
+        user: Employee,
+        start_date_str: Optional[str] = None,
+        end_date_str: Optional[str] = None,
+        filters: Optional[Dict] = None
+    ) -> Iterator[str]:
+        """
+        Same listing as get_attendance_records, encoded as a JSON array
+        
+        Yields the opening bracket straight away, then LISTING_CHUNK_ROWS
+        rows per fragment as they come off the cursor, so memory stays flat
+        however large the date range is.
+        """
+        yield "["
+        batch = []
+        first = True
+        for data in self._iter_attendance_dicts(user, start_date_str, end_date_str, filters):
+            batch.append(json.dumps(data, default=str))
+            if len(batch) >= LISTING_CHUNK_ROWS:
+                yield ("" if first else ",") + ",".join(batch)
+                first = False
+                batch = []
+        if batch:
+            yield ("" if first else ",") + ",".join(batch)
+        yield "]"
+    
+    def _iter_attendance_dicts(
+        self,
+        user: Employee,
+        start_date_str: Optional[str],
+        end_date_str: Optional[str],
+        filters: Optional[Dict] = None,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """Attendance rows flattened for the frontend (employees only see their own)"""
+        filters = {key: value for key, value in (filters or {}).items() if value}
+        
         # Parse or calculate dates
         today = date.today()
         
@@ -220,35 +532,174 @@ class AttendanceService:
             end_date = today
         
         if user.role == UserRole.EMPLOYEE:
-            records = self.attendance_repo.get_by_date_range(
-                emp_id=user.emp_id,
-                start_date=start_date,
-                end_date=end_date
-            )
-        else:
-            records = self.attendance_repo.get_by_date_range(
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-        # Enrich and flatten for frontend
-        result = []
-        for r in records:
-            data = {c.name: getattr(r, c.name) for c in r.__table__.columns}
+            filters["emp_id"] = user.emp_id
+        
+        rows = self.attendance_repo.iter_listing_rows(
+            emp_id=filters.get("emp_id"),
+            start_date=start_date,
+            end_date=end_date,
+            department=filters.get("department"),
+            status=filters.get("status"),
+            source_file=filters.get("source_file"),
+            after=after,
+            limit=limit
+        )
+        
+        for row in rows:
+            data = row._asdict()
             # Support both date objects and ISO strings
             if isinstance(data['date'], (date, datetime)):
                 data['date'] = data['date'].isoformat()
+            data['employee_name'] = data['employee_name'] or "Unknown"
+            yield data
+    
+    @staticmethod
+    def _encode_cursor(date_str: str, record_id: int) -> str:
+        """Opaque page cursor for the (date, id) of the last row on a page"""
+        return base64.urlsafe_b64encode(f"{date_str}|{record_id}".encode()).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        """
+        Decode a page cursor into (date, id)
+        
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        try:
+            date_str, record_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return date.fromisoformat(date_str), int(record_id)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    
+    def get_status_summary(
+        self,
+        user: Employee,
+        start_date_str: Optional[str] = None,
+        end_date_str: Optional[str] = None,
+        emp_id: Optional[str] = None,
+        department: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Per-employee attendance status counts and worked time for a date range
+        
+        Defaults to the current month. Employees only get their own row.
+        
+        Returns:
+            One dict per employee with status_counts, total_days,
+            worked_minutes, average_minutes and overtime_minutes
+        """
+        today = date.today()
+        start_date = parse_date(start_date_str) if start_date_str else today.replace(day=1)
+        end_date = parse_date(end_date_str) if end_date_str else today
+        if not start_date or not end_date or start_date > end_date:
+            raise HTTPException(status_code=400, detail="Invalid date range")
+        
+        if user.role == UserRole.EMPLOYEE:
+            emp_id = user.emp_id
+        
+        rows = self.attendance_repo.get_status_totals(start_date, end_date, emp_id=emp_id, department=department)
+        
+        summary: Dict[str, Dict] = {}
+        for row in rows:
+            entry = summary.setdefault(row.emp_id, {
+                "emp_id": row.emp_id,
+                "employee_name": row.employee_name or "Unknown",
+                "status_counts": {},
+                "total_days": 0,
+                "worked_minutes": 0,
+                "overtime_minutes": 0
+            })
+            entry["status_counts"][row.attendance_status or "Unknown"] = row.days
+            entry["total_days"] += row.days
+            entry["worked_minutes"] += int(row.worked_minutes)
+            entry["overtime_minutes"] += int(row.overtime_minutes)
+        
+        for entry in summary.values():
+            entry["average_minutes"] = round(entry["worked_minutes"] / entry["total_days"]) if entry["total_days"] else 0
+        
+        return list(summary.values())
+    
+    def recompute_attendance_status(self, start_date_str: str, end_date_str: str) -> Dict:
+        """
+        Re-derive Present/Absent for stored days after a threshold change
+        
+        Uses the current ATTENDANCE_PRESENT_THRESHOLD_MIN setting; manual
+        corrections and "On Leave" days keep their status.
+        
+        Args:
+            start_date_str: Range start
+            end_date_str: Range end
             
-            # Resolve name (owner relationship takes priority)
-            data['employee_name'] = r.owner.full_name if r.owner else "Unknown"
-            result.append(data)
+        Returns:
+            Number of records whose status changed
             
-        return result
+        Raises:
+            HTTPException: If the date range is invalid
+        """
+        start_date = parse_date(start_date_str)
+        end_date = parse_date(end_date_str)
+        if not start_date or not end_date or start_date > end_date:
+            raise HTTPException(status_code=400, detail="Invalid date range")
+        
+        threshold = present_threshold_min()
+        try:
+            changed = self.attendance_repo.recompute_statuses(start_date, end_date, threshold)
+            self._refresh_rollups(changed)
+            self.attendance_repo.commit()
+        except Exception:
+            self.attendance_repo.rollback()
+            raise
+        
+        logger.info(f"Recomputed attendance status {start_date}..{end_date} at {threshold} min: {len(changed)} changed")
+        return {
+            "message": f"{len(changed)} attendance records updated",
+            "updated": len(changed),
+            "present_threshold_min": threshold
+        }
+    
+    def get_year_calendar(self, user: Employee, year: int, emp_id: Optional[str] = None) -> Dict:
+        """
+        Get yearly attendance bitmaps for calendar/heatmap views
+        
+        Each status is a base64 encoded 46-byte bitset; bit n (byte n // 8,
+        least significant bit first) is day n of the year, 1 January = 0.
+        
+        Args:
+            user: Current user (employees only get their own bitmaps)
+            year: Calendar year
+            emp_id: Optional single employee (admins), all employees if None
+            
+        Returns:
+            {"year", "employees": [{"emp_id", "present", "on_leave", "absent"}]}
+        """
+        if user.role == UserRole.EMPLOYEE:
+            emp_id = user.emp_id
+        
+        emp_ids = [normalize_emp_id(emp_id)] if emp_id else None
+        rows = self.bitmap_repo.get_for_year(year, emp_ids)
+        
+        def encode(bits: bytes) -> str:
+            return base64.b64encode(bits).decode("ascii")
+        
+        return {
+            "year": year,
+            "employees": [
+                {
+                    "emp_id": row.emp_id,
+                    "present": encode(row.present_bits),
+                    "on_leave": encode(row.on_leave_bits),
+                    "absent": encode(row.absent_bits)
+                }
+                for row in rows
+            ]
+        }
     
     def update_attendance_record(
         self,
         attendance_id: int,
-        update_data: Dict
+        update_data: Dict,
+        corrected_by: Optional[str] = None
     ) -> Dict:
         """
         Update attendance record
@@ -256,6 +707,9 @@ class AttendanceService:
         Args:
             attendance_id: Attendance record ID
             update_data: Fields to update
+            corrected_by: emp_id of the user making a manual correction; the
+                          record is then flagged like bulk corrections, so
+                          recompute_attendance_status leaves it alone
             
         Returns:
             Updated record data
@@ -270,10 +724,76 @@ class AttendanceService:
         
         # Update record
         self.attendance_repo.update(record, update_data)
+        if corrected_by:
+            record.is_manually_corrected = True
+            record.corrected_by = corrected_by
+        self._refresh_rollups([(record.emp_id, record.date)])
         self.attendance_repo.commit()
         
         return {"message": "Attendance record updated successfully"}
 
+    def bulk_correct_attendance(self, corrections: List[Dict], corrected_by: str) -> Dict:
+        """
+        Apply many manual corrections in one transaction
+        
+        Args:
+            corrections: Dicts with either "id" or "emp_id" + "date", plus the
+                         fields to update (first_in, last_out, in_duration,
+                         out_duration, attendance_status)
+            corrected_by: emp_id of the admin making the corrections
+            
+        Returns:
+            Count of corrected records
+            
+        Raises:
+            HTTPException: If any entry does not match an attendance record
+        """
+        ids = set()
+        emp_dates = set()
+        for entry in corrections:
+            if entry.get("id"):
+                ids.add(entry["id"])
+            else:
+                emp_dates.add((normalize_emp_id(entry["emp_id"]), entry["date"]))
+        
+        keys = self.attendance_repo.find_keys(list(ids), list(emp_dates))
+        id_by_emp_date = {(row.emp_id, row.date): row.id for row in keys}
+        found_ids = {row.id for row in keys}
+        
+        # Later entries for the same record win, field by field
+        changes: Dict[int, Dict] = {}
+        missing = []
+        for entry in corrections:
+            fields = {k: v for k, v in entry.items() if k not in ("id", "emp_id", "date")}
+            if entry.get("id"):
+                attendance_id = entry["id"] if entry["id"] in found_ids else None
+                label = str(entry["id"])
+            else:
+                emp_id = normalize_emp_id(entry["emp_id"])
+                attendance_id = id_by_emp_date.get((emp_id, entry["date"]))
+                label = f"{emp_id} {entry['date']}"
+            if attendance_id is None:
+                missing.append(label)
+                continue
+            changes.setdefault(attendance_id, {}).update(fields)
+        
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Attendance record not found: {', '.join(missing[:20])}"
+                       + (f" (+{len(missing) - 20} more)" if len(missing) > 20 else "")
+            )
+        
+        try:
+            updated = self.attendance_repo.bulk_correct(changes, corrected_by)
+            self._refresh_rollups((row.emp_id, row.date) for row in keys if row.id in changes)
+            self.attendance_repo.commit()
+        except Exception:
+            self.attendance_repo.rollback()
+            raise
+        
+        return {"message": f"{updated} attendance records corrected", "updated": updated}
+    
     def delete_attendance_record(self, attendance_id: int) -> Dict:
         """
         Delete attendance record
@@ -291,7 +811,9 @@ class AttendanceService:
         if not record:
             raise HTTPException(status_code=404, detail="Attendance record not found")
         
+        day_key = (record.emp_id, record.date)
         self.attendance_repo.delete(record)
+        self._refresh_rollups([day_key])
         self.attendance_repo.commit()
         
         return {"message": "Attendance record deleted successfully"}
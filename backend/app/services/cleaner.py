@@ -1,182 +1,782 @@
 import pandas as pd
+import numpy as np
 import io
 import re
+import csv
 import logging
-from datetime import datetime
+from itertools import chain, islice
+from datetime import datetime, timedelta
+
+from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
-def detect_and_clean_memory(file_content):
+# Cleaner engines: "vectorized" parses whole columns at once, "legacy" walks the
+# sheet row by row. Both produce identical cleaned_data records.
+ENGINE_VECTORIZED = "vectorized"
+ENGINE_LEGACY = "legacy"
+DEFAULT_ENGINE = ENGINE_VECTORIZED
+
+# Keywords for dynamic column detection
+REQUIRED_COLS = {
+    "sno": ["s.no", "sno", "serial"],
+    "emp_id": ["employee code", "emp id", "employee id", "emp code", "id"],
+    "emp_name": ["employee name", "name", "emp name"],
+    "in_dur": ["in duration", "in_duration", "in(hrs)"],
+    "out_dur": ["out_duration", "out duration", "out(hrs)"],
+    "punches": ["punch records", "punches", "punch_records", "log"]
+}
+
+TITLE_TEXT = 'in out duration report'
+DATE_MARKER = 'attendance date-'
+DATE_PATTERNS = (r'(\d{1,2}[-/][a-z]{3}[-/]\d{4})', r'(\d{1,2}[-/]\d{1,2}[-/]\d{4})')
+REPORT_TYPE = "In/Out Duration Report"
+
+# Monthly Detailed Report: one block of per-day rows per employee covering a whole period
+MONTHLY_TITLE_TEXT = 'monthly detailed attendance report'
+MONTHLY_REPORT_TYPE = "Monthly Detailed Report"
+MONTHLY_PERIOD_PATTERN = r'(\d{1,2}-[a-z]{3}-\d{4})\s+to\s+(\d{1,2}-[a-z]{3}-\d{4})'
+
+# Report signatures are looked for in the first SIGNATURE_ROWS rows of a sheet
+SIGNATURE_ROWS = 10
+
+def present_threshold_min():
+    """Minutes worked from which a day counts as Present (attendance policy setting)"""
+    return get_settings().ATTENDANCE_PRESENT_THRESHOLD_MIN
+
+# Streaming mode hands records out in lists of this size
+DEFAULT_CHUNK_SIZE = 1000
+
+# File formats, told apart by their leading bytes rather than by trial parsing
+FORMAT_XLS = "xls"    # OLE2 compound document (Excel 97-2003)
+FORMAT_XLSX = "xlsx"  # ZIP container (Office Open XML)
+FORMAT_CSV = "csv"    # anything else is treated as delimited text
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_MAGIC = b"PK\x03\x04"
+CSV_SNIFF_BYTES = 8192
+CSV_DELIMITERS = ",;\t|"
+
+# pandas' default na_values: cells holding exactly one of these are read as
+# NaN (a blank) by read_csv/read_excel, so the streaming readers blank them too
+NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null"
+})
+
+class CleanerError(ValueError):
+    """Raised by the streaming cleaner with a user-facing rejection reason"""
+
+def detect_and_clean_memory(file_content, engine: str = DEFAULT_ENGINE):
     """
-    Simplified cleaner: Only supports the 'In Out Duration Report' format.
+    Clean a whole file in memory with the parser registered for its report type.
     Returns (cleaned_data, detected_type)
+
+    engine selects the parsing path ("vectorized" or "legacy") so the two
+    can be compared on the same file.
     """
     try:
-        # Try reading as Excel first
+        file_format = detect_file_format(file_content)
         try:
-            df_raw = pd.read_excel(io.BytesIO(file_content), header=None)
+            if file_format == FORMAT_CSV:
+                df_raw = pd.read_csv(io.BytesIO(file_content), header=None,
+                                     sep=_sniff_delimiter(file_content), engine='c')
+            else:
+                df_raw = pd.read_excel(io.BytesIO(file_content), header=None,
+                                       engine='xlrd' if file_format == FORMAT_XLS else 'openpyxl')
         except:
-            # Fallback to CSV with tab/comma/semicolon detection
-            try:
-                df_raw = pd.read_csv(io.BytesIO(file_content), header=None, sep=None, engine='python')
-            except:
-                return None, "Invalid Format"
-
-        logger.info(f"Cleaner: Processing file with shape {df_raw.shape}")
-        
-        cleaned_data = []
-        current_attendance_date = None
-        header_found = False
-        title_found = False
-        col_map = {}
-
-        # Keywords for dynamic column detection
-        REQUIRED_COLS = {
-            "sno": ["s.no", "sno", "serial"],
-            "emp_id": ["employee code", "emp id", "employee id", "emp code", "id"],
-            "emp_name": ["employee name", "name", "emp name"],
-            "in_dur": ["in duration", "in_duration", "in(hrs)"],
-            "out_dur": ["out_duration", "out duration", "out(hrs)"],
-            "punches": ["punch records", "punches", "punch_records", "log"]
-        }
-
-        for index, row in df_raw.iterrows():
-            row_list = [str(val).strip() if pd.notna(val) else "" for val in row.values]
-            row_str = " ".join(row_list).lower()
-
-            # 0. Strict Title Check: Must find "In Out Duration Report" in the first 10 rows
-            if not title_found and index < 10:
-                if 'in out duration report' in row_str:
-                    logger.info("Cleaner: 'In Out Duration Report' title found.")
-                    title_found = True
-            
-            # 1. Capture Date from header
-            if 'attendance date-' in row_str:
-                date_match = re.search(r'(\d{1,2}[-/][a-z]{3}[-/]\d{4})', row_str)
-                if not date_match:
-                    date_match = re.search(r'(\d{1,2}[-/]\d{1,2}[-/]\d{4})', row_str)
-                
-                if date_match:
-                    current_attendance_date = date_match.group(1)
-                    try:
-                        current_attendance_date = pd.to_datetime(current_attendance_date).strftime('%Y-%m-%d')
-                    except: pass
-                continue
+            return None, "Invalid Format"
 
-            # 2. Detect Header Row (only after title or if title is on same row)
-            if not header_found and title_found:
-                temp_map = {}
-                # Look for a row that has at least 4 of our required column labels
-                for i, val in enumerate(row_list):
-                    val_clean = val.lower()
-                    for col_key, labels in REQUIRED_COLS.items():
-                        # Use stricter matching for labels (exact or with spaces)
-                        if any(label == val_clean or f" {label} " in f" {val_clean} " or val_clean.startswith(f"{label}(") for label in labels):
-                            temp_map[col_key] = i
-                
-                if len(temp_map) >= 4:
-                    col_map = temp_map
-                    logger.info(f"Cleaner: Column map detected: {col_map}")
-                    header_found = True
-                    continue
+        logger.info(f"Cleaner: Processing file with shape {df_raw.shape} ({engine} engine)")
+
+        report_type, row_engine = _match_report_parser(
+            " ".join(str(v) for v in row if pd.notna(v)).lower()
+            for row in df_raw.head(SIGNATURE_ROWS).itertuples(index=False)
+        )
+        if report_type != REPORT_TYPE:
+            # Only the In/Out report has a DataFrame engine; others run on the row stream
+            try:
+                return list(row_engine(_frame_rows(df_raw))), report_type
+            except CleanerError as e:
+                return None, str(e)
 
-            # 3. Process Data Rows
-            if header_found and 'emp_id' in col_map:
-                sno_idx = col_map.get('sno')
-                if sno_idx is not None:
-                    sno_val = row_list[sno_idx]
-                    if sno_val and sno_val.replace('.','',1).isdigit() and float(sno_val) > 0:
-                        try:
-                            emp_id_raw = row_list[col_map['emp_id']]
-                            emp_name = row_list[col_map['emp_name']] if 'emp_name' in col_map else "Unknown"
-                            in_dur = row_list[col_map['in_dur']] if 'in_dur' in col_map else "00:00"
-                            out_dur = row_list[col_map['out_dur']] if 'out_dur' in col_map else "00:00"
-                            punch_log = row_list[col_map['punches']] if 'punches' in col_map else ""
-
-                            # STRICT VALIDATION: If EmpID looks like a time string, it's a structural mismatch
-                            if re.match(r'^\d{1,2}:\d{2}$', emp_id_raw):
-                                logger.error(f"Cleaner: Structural Mismatch at row {index+1}. Detected EmpID '{emp_id_raw}' looks like a timestamp.")
-                                return None, f"Structural Error: Column mismatch. Column detected as 'Employee ID' contains timestamps ('{emp_id_raw}'). Please check file format."
-
-                            if not emp_id_raw or emp_id_raw.lower() == 'nan':
-                                return None, f"Invalid Record at row {index+1}: Missing Employee ID"
-
-                            # Parse First In / Last Out from Punches
-                            first_in, last_out = "--:--", "--:--"
-                            punch_count = 0
-                            if punch_log and punch_log.lower() != 'nan':
-                                clean_punches = re.sub(r'\(in\)|\(out\)', '', punch_log, flags=re.IGNORECASE)
-                                times = [t.strip() for t in clean_punches.split(',') if ':' in t]
-                                if times:
-                                    first_in = times[0]
-                                    last_out = times[-1]
-                                    punch_count = len(times)
-
-                            # Fallback
-                            if first_in == "--:--" and ":" in in_dur: first_in = in_dur
-                            if last_out == "--:--" and ":" in out_dur: last_out = out_dur
-
-                            # Total Duration
-                            total_duration = "00:00"
-                            def to_min(ts):
-                                if ':' not in str(ts): return 0
-                                try:
-                                    clean_ts = re.sub(r'\(.*?\)', '', str(ts)).strip()
-                                    h, m = map(int, clean_ts.split(':')[:2])
-                                    return h * 60 + m
-                                except: return 0
-                                
-                            if first_in != "--:--" and last_out != "--:--":
-                                span_min = to_min(last_out) - to_min(first_in)
-                                if span_min < 0: span_min = 0
-                                total_duration = f"{span_min // 60:02d}:{span_min % 60:02d}"
-                            else:
-                                total_min = to_min(in_dur) + to_min(out_dur)
-                                total_duration = f"{total_min // 60:02d}:{total_min % 60:02d}"
-
-                            if not current_attendance_date:
-                                return None, f"Invalid State: Record found before Date header at row {index+1}"
-
-                            # Attendance Status logic: No half-days as per user request
-                            # Present: >= 3.5 hours
-                            # Absent: < 3.5 hours
-                            
-                            def parse_to_min(ts_str):
-                                return to_min(ts_str)
-                                
-                            total_min = parse_to_min(total_duration)
-                            
-                            if total_min >= 210: # 3.5 hours
-                                status = "Present"
-                            else:
-                                status = "Absent"
-
-                            cleaned_data.append({
-                                'Date': current_attendance_date,
-                                'EmpID': emp_id_raw,
-                                'Employee_Name': emp_name,
-                                'In_Duration': in_dur,
-                                'Out_Duration': out_dur,
-                                'Total_Duration': total_duration,
-                                'First_In': first_in,
-                                'Last_Out': last_out,
-                                'Punch_Records': punch_log,
-                                'Attendance': status
-                            })
-                        except Exception as e:
-                            logger.error(f"Cleaner: Error at row {index+1}: {e}")
-                            return None, f"Data Error at row {index+1}: {str(e)}"
-
-        if not title_found:
-            return None, "Invalid Format: Title 'In Out Duration Report' not found. Only this specific format is supported."
-
-        if not header_found:
-            return None, "Invalid Structure: Could not find required headers (S.No, Employee Code, etc.)"
-
-        if not cleaned_data:
-            return None, "Invalid Content: No attendance records identified"
-
-        return cleaned_data, "In/Out Duration Report"
+        if engine == ENGINE_LEGACY:
+            return _clean_rows_legacy(df_raw)
+        return _clean_frame_vectorized(df_raw)
     except Exception as e:
         logger.error(f"Cleaner Error: {e}")
         return None, "Processing Error"
+
+def stream_clean_chunks(file_content, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Streaming cleaner for large workbooks.
+    Returns (chunks, detected_type) where chunks is a generator of record lists
+    of at most chunk_size items, or (None, reason) if the file is rejected up front.
+
+    Rows are pulled straight from the sheet (openpyxl read-only, xlrd on-demand
+    or a CSV line reader), so memory stays bounded regardless of file size.
+    Problems found further down the file raise CleanerError while iterating.
+    """
+    rows = _iter_file_rows(file_content)
+    if rows is None:
+        return None, "Invalid Format"
+
+    try:
+        # Identify the report from its leading rows, then replay them into its engine
+        head = list(islice(rows, SIGNATURE_ROWS))
+        report_type, row_engine = _match_report_parser(" ".join(row_list).lower() for _, row_list in head)
+        records = row_engine(chain(head, rows))
+        first = list(islice(records, chunk_size))
+    except CleanerError as e:
+        rows.close()
+        return None, str(e)
+
+    def chunks():
+        try:
+            chunk = first
+            while chunk:
+                yield chunk
+                chunk = list(islice(records, chunk_size))
+        finally:
+            rows.close()
+
+    return chunks(), report_type
+
+def validate_attendance_file(file_content):
+    """
+    Parse the whole file without keeping records.
+    Returns (record_count, detected_type) or (None, reason).
+
+    Top-level and picklable so it can run in the parse process pool.
+    """
+    chunks, detected_type = stream_clean_chunks(file_content)
+    if chunks is None:
+        return None, detected_type
+    try:
+        record_count = sum(len(chunk) for chunk in chunks)
+    except CleanerError as e:
+        return None, str(e)
+    return record_count, detected_type
+
+def _cell_text(val):
+    """Stringify a raw cell the way the DataFrame path does"""
+    if val is None or val == "":
+        return ""
+    if isinstance(val, str) and val in NA_VALUES:
+        return ""
+    if isinstance(val, float):
+        if val != val:
+            return ""
+        if val.is_integer():
+            val = int(val)
+    return str(val).strip()
+
+def detect_file_format(file_content):
+    """
+    Identify the upload format from its magic bytes.
+    Returns FORMAT_XLS, FORMAT_XLSX or FORMAT_CSV.
+    """
+    head = bytes(file_content[:8])
+    if head.startswith(OLE2_MAGIC):
+        return FORMAT_XLS
+    if head.startswith(ZIP_MAGIC):
+        return FORMAT_XLSX
+    return FORMAT_CSV
+
+def _sniff_delimiter(file_content):
+    """Guess the CSV delimiter from the first few KB, defaulting to a comma"""
+    sample = file_content[:CSV_SNIFF_BYTES].decode('utf-8', errors='ignore')
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        return ","
+
+def _iter_file_rows(file_content):
+    """
+    Open file_content with the reader matching its format and return a
+    generator of (index, row_list) pairs, or None if it cannot be opened.
+    """
+    opener = {
+        FORMAT_XLS: _open_xls_rows,
+        FORMAT_XLSX: _open_xlsx_rows,
+        FORMAT_CSV: _open_csv_rows
+    }[detect_file_format(file_content)]
+    try:
+        return opener(file_content)
+    except Exception:
+        return None
+
+def _open_xlsx_rows(file_content):
+    import openpyxl
+    workbook = openpyxl.load_workbook(io.BytesIO(file_content), read_only=True, data_only=True)
+
+    def rows():
+        try:
+            sheet = workbook.worksheets[0]
+            for index, values in enumerate(sheet.iter_rows(values_only=True)):
+                yield index, [_cell_text(v) for v in values]
+        finally:
+            workbook.close()
+
+    return rows()
+
+def _open_xls_rows(file_content):
+    import xlrd
+    book = xlrd.open_workbook(file_contents=file_content, on_demand=True)
+
+    def rows():
+        try:
+            sheet = book.sheet_by_index(0)
+            for index in range(sheet.nrows):
+                row_list = []
+                for cell in sheet.row(index):
+                    if cell.ctype == xlrd.XL_CELL_DATE:
+                        row_list.append(_cell_text(xlrd.xldate_as_datetime(cell.value, book.datemode)))
+                    elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                        row_list.append(str(bool(cell.value)))
+                    elif cell.ctype == xlrd.XL_CELL_ERROR:
+                        row_list.append("")
+                    else:
+                        row_list.append(_cell_text(cell.value))
+                yield index, row_list
+        finally:
+            book.release_resources()
+
+    return rows()
+
+def _open_csv_rows(file_content):
+    delimiter = _sniff_delimiter(file_content)
+    text = io.TextIOWrapper(io.BytesIO(file_content), encoding='utf-8', newline='')
+
+    def rows():
+        index = 0
+        try:
+            for values in csv.reader(text, delimiter=delimiter):
+                # Blank lines are skipped, as pandas does
+                if not values:
+                    continue
+                yield index, ["" if v in NA_VALUES else v.strip() for v in values]
+                index += 1
+        except (UnicodeDecodeError, csv.Error):
+            raise CleanerError("Invalid Format")
+
+    return rows()
+
+def _match_header(row_list):
+    """Map REQUIRED_COLS keys to column positions for a candidate header row"""
+    temp_map = {}
+    for i, val in enumerate(row_list):
+        val_clean = val.lower()
+        for col_key, labels in REQUIRED_COLS.items():
+            # Use stricter matching for labels (exact or with spaces)
+            if any(label == val_clean or f" {label} " in f" {val_clean} " or val_clean.startswith(f"{label}(") for label in labels):
+                temp_map[col_key] = i
+    return temp_map
+
+def _parse_header_date(row_str):
+    """Extract the attendance date from an 'Attendance Date-' row, or None"""
+    date_match = re.search(DATE_PATTERNS[0], row_str)
+    if not date_match:
+        date_match = re.search(DATE_PATTERNS[1], row_str)
+
+    if not date_match:
+        return None
+
+    attendance_date = date_match.group(1)
+    try:
+        attendance_date = pd.to_datetime(attendance_date).strftime('%Y-%m-%d')
+    except: pass
+    return attendance_date
+
+def _frame_rows(df_raw):
+    """(index, row_list) pairs of stripped cell strings for a raw DataFrame"""
+    return (
+        (index, [str(val).strip() if pd.notna(val) else "" for val in row.values])
+        for index, row in df_raw.iterrows()
+    )
+
+def _clean_rows_legacy(df_raw):
+    """Row-by-row cleaner (original implementation)"""
+    rows = _frame_rows(df_raw)
+    try:
+        return list(_clean_row_stream(rows)), REPORT_TYPE
+    except CleanerError as e:
+        return None, str(e)
+
+def _clean_row_stream(rows):
+    """
+    Row state machine shared by the legacy and streaming paths
+
+    Consumes (index, row_list) pairs of stripped cell strings and yields
+    cleaned records one by one. Raises CleanerError with the user-facing
+    message on the first structural or data problem.
+    """
+    cleaned_count = 0
+    present_threshold = present_threshold_min()
+    current_attendance_date = None
+    header_found = False
+    title_found = False
+    col_map = {}
+    width = 0
+
+    for index, row_list in rows:
+        row_str = " ".join(row_list).lower()
+
+        # 0. Strict Title Check: Must find "In Out Duration Report" in the first 10 rows
+        if not title_found and index < 10:
+            if TITLE_TEXT in row_str:
+                logger.info("Cleaner: 'In Out Duration Report' title found.")
+                title_found = True
+        elif not title_found:
+            # Nothing past row 10 can qualify the file any more
+            break
+
+        # 1. Capture Date from header
+        if DATE_MARKER in row_str:
+            parsed_date = _parse_header_date(row_str)
+            if parsed_date:
+                current_attendance_date = parsed_date
+            continue
+
+        # 2. Detect Header Row (only after title or if title is on same row)
+        if not header_found and title_found:
+            # Look for a row that has at least 4 of our required column labels
+            temp_map = _match_header(row_list)
+            if len(temp_map) >= 4:
+                col_map = temp_map
+                width = max(col_map.values()) + 1
+                logger.info(f"Cleaner: Column map detected: {col_map}")
+                header_found = True
+                continue
+
+        # 3. Process Data Rows
+        if header_found and 'emp_id' in col_map:
+            sno_idx = col_map.get('sno')
+            if sno_idx is not None:
+                if len(row_list) < width:
+                    # Streamed sheets drop trailing empty cells
+                    row_list = row_list + [""] * (width - len(row_list))
+                sno_val = row_list[sno_idx]
+                if sno_val and sno_val.replace('.','',1).isdigit() and float(sno_val) > 0:
+                    try:
+                        emp_id_raw = row_list[col_map['emp_id']]
+                        emp_name = row_list[col_map['emp_name']] if 'emp_name' in col_map else "Unknown"
+                        in_dur = row_list[col_map['in_dur']] if 'in_dur' in col_map else "00:00"
+                        out_dur = row_list[col_map['out_dur']] if 'out_dur' in col_map else "00:00"
+                        punch_log = row_list[col_map['punches']] if 'punches' in col_map else ""
+
+                        # STRICT VALIDATION: If EmpID looks like a time string, it's a structural mismatch
+                        if re.match(r'^\d{1,2}:\d{2}$', emp_id_raw):
+                            logger.error(f"Cleaner: Structural Mismatch at row {index+1}. Detected EmpID '{emp_id_raw}' looks like a timestamp.")
+                            raise CleanerError(_structural_error(emp_id_raw))
+
+                        if not emp_id_raw or emp_id_raw.lower() == 'nan':
+                            raise CleanerError(f"Invalid Record at row {index+1}: Missing Employee ID")
+
+                        # Parse First In / Last Out from Punches
+                        first_in, last_out = "--:--", "--:--"
+                        punch_count = 0
+                        if punch_log and punch_log.lower() != 'nan':
+                            clean_punches = re.sub(r'\(in\)|\(out\)', '', punch_log, flags=re.IGNORECASE)
+                            times = [t.strip() for t in clean_punches.split(',') if ':' in t]
+                            if times:
+                                first_in = times[0]
+                                last_out = times[-1]
+                                punch_count = len(times)
+
+                        # Fallback
+                        if first_in == "--:--" and ":" in in_dur: first_in = in_dur
+                        if last_out == "--:--" and ":" in out_dur: last_out = out_dur
+
+                        # Total Duration
+                        total_duration = "00:00"
+                        def to_min(ts):
+                            if ':' not in str(ts): return 0
+                            try:
+                                clean_ts = re.sub(r'\(.*?\)', '', str(ts)).strip()
+                                h, m = map(int, clean_ts.split(':')[:2])
+                                return h * 60 + m
+                            except: return 0
+
+                        if first_in != "--:--" and last_out != "--:--":
+                            span_min = to_min(last_out) - to_min(first_in)
+                            if span_min < 0: span_min = 0
+                            total_duration = f"{span_min // 60:02d}:{span_min % 60:02d}"
+                        else:
+                            total_min = to_min(in_dur) + to_min(out_dur)
+                            total_duration = f"{total_min // 60:02d}:{total_min % 60:02d}"
+
+                        if not current_attendance_date:
+                            raise CleanerError(f"Invalid State: Record found before Date header at row {index+1}")
+
+                        # Attendance Status logic: No half-days as per user request
+                        # Present: >= present threshold (3.5 hours by default)
+                        # Absent: below it
+
+                        def parse_to_min(ts_str):
+                            return to_min(ts_str)
+
+                        total_min = parse_to_min(total_duration)
+
+                        if total_min >= present_threshold:
+                            status = "Present"
+                        else:
+                            status = "Absent"
+
+                        record = {
+                            'Date': current_attendance_date,
+                            'EmpID': emp_id_raw,
+                            'Employee_Name': emp_name,
+                            'In_Duration': in_dur,
+                            'Out_Duration': out_dur,
+                            'Total_Duration': total_duration,
+                            'First_In': first_in,
+                            'Last_Out': last_out,
+                            'Punch_Records': punch_log,
+                            'Attendance': status
+                        }
+                    except CleanerError:
+                        raise
+                    except Exception as e:
+                        logger.error(f"Cleaner: Error at row {index+1}: {e}")
+                        raise CleanerError(f"Data Error at row {index+1}: {str(e)}")
+
+                    cleaned_count += 1
+                    yield record
+
+    cleaned, detected_type = _finalize(cleaned_count, title_found, header_found)
+    if cleaned is None:
+        raise CleanerError(detected_type)
+
+def _structural_error(emp_id_raw):
+    return f"Structural Error: Column mismatch. Column detected as 'Employee ID' contains timestamps ('{emp_id_raw}'). Please check file format."
+
+def _finalize(cleaned_data, title_found, header_found):
+    """Shared end-of-file validation for both engines"""
+    if not title_found:
+        return None, "Invalid Format: Title 'In Out Duration Report' not found. Supported reports: In Out Duration Report, Monthly Detailed Attendance Report."
+
+    if not header_found:
+        return None, "Invalid Structure: Could not find required headers (S.No, Employee Code, etc.)"
+
+    if not cleaned_data:
+        return None, "Invalid Content: No attendance records identified"
+
+    return cleaned_data, REPORT_TYPE
+
+def _stringify_frame(df_raw):
+    """Render every cell the way the row loop does: str(val).strip(), NaN -> ''"""
+    text = df_raw.astype(object).where(df_raw.notna(), "")
+    return text.astype(str).apply(lambda col: col.str.strip())
+
+def _to_number(values, convert):
+    """
+    pd.to_numeric over strings already known to be numbers, falling back to
+    convert (int/float, as the row loop uses) for the non-ASCII digits
+    ('٠٩', '０９') that to_numeric does not read. Missing values stay NaN.
+    """
+    numbers = pd.to_numeric(values, errors='coerce')
+    unread = numbers.isna() & values.notna()
+    if unread.any():
+        numbers = numbers.astype(float)
+        numbers[unread] = values[unread].map(convert)
+    return numbers
+
+def _to_minutes(values):
+    """
+    Vectorized 'HH:MM' -> integer minutes
+
+    Mirrors the row loop: bracketed annotations are dropped, the first two
+    ':'-separated fields must be integers (any Unicode digits, as int()
+    reads them), anything else counts as 0.
+    """
+    cleaned = values.str.replace(r'\(.*?\)', '', regex=True).str.strip()
+    parts = cleaned.str.extract(r'^([+-]?\d+)\s*:\s*([+-]?\d+)\s*(?::|$)')
+    hours = _to_number(parts[0], int).fillna(0).to_numpy(dtype=np.int64)
+    minutes = _to_number(parts[1], int).fillna(0).to_numpy(dtype=np.int64)
+    return hours * 60 + minutes
+
+def _format_minutes(total_min):
+    """Vectorized f"{m // 60:02d}:{m % 60:02d}" over an int64 array"""
+    hours = pd.Series(total_min // 60).astype(str).str.zfill(2)
+    minutes = pd.Series(total_min % 60).astype(str).str.zfill(2)
+    return (hours + ":" + minutes).to_numpy(dtype=object)
+
+def _clean_frame_vectorized(df_raw):
+    """
+    Column-wise cleaner
+
+    Title, date and header rows are located once; data rows are then parsed
+    with pandas string ops and NumPy minute arithmetic instead of per-row
+    Python. Records and error messages match _clean_rows_legacy.
+    """
+    if df_raw.empty:
+        return _finalize([], False, False)
+
+    text = _stringify_frame(df_raw)
+    columns = [text.iloc[:, i] for i in range(text.shape[1])]
+    row_str = columns[0].str.cat(columns[1:], sep=" ") if len(columns) > 1 else columns[0]
+    row_str = row_str.str.lower()
+    row_no = df_raw.index.to_numpy()
+
+    # 0. Title must appear in the first 10 rows
+    title_hits = np.flatnonzero(row_str.iloc[:10].str.contains(TITLE_TEXT, regex=False).to_numpy())
+    title_found = len(title_hits) > 0
+    if title_found:
+        logger.info("Cleaner: 'In Out Duration Report' title found.")
+
+    # 1. Date rows carry the attendance date for every row below them
+    is_date_row = row_str.str.contains(DATE_MARKER, regex=False).to_numpy()
+    date_rows = row_str[is_date_row]
+    parsed = {val: _parse_header_date(val) for val in date_rows.unique()}
+    row_dates = date_rows.map(parsed).astype(object).reindex(row_str.index).ffill()
+
+    # 2. Header row: first non-date row at or after the title with >= 4 labels
+    header_pos = None
+    col_map = {}
+    if title_found:
+        for pos in range(title_hits[0], len(text)):
+            if is_date_row[pos]:
+                continue
+            temp_map = _match_header(text.iloc[pos].tolist())
+            if len(temp_map) >= 4:
+                col_map = temp_map
+                header_pos = pos
+                logger.info(f"Cleaner: Column map detected: {col_map}")
+                break
+    header_found = header_pos is not None
+
+    if not header_found or 'emp_id' not in col_map or col_map.get('sno') is None:
+        return _finalize([], title_found, header_found)
+
+    # 3. Data rows: below the header, not a date row, positive numeric S.No
+    # (the row loop's test: digits with at most one '.', then float() > 0)
+    sno = columns[col_map['sno']]
+    sno_ok = sno.str.replace('.', '', n=1, regex=False).str.isdigit().to_numpy(dtype=bool)
+    sno_num = _to_number(sno.where(sno_ok), float).fillna(0).to_numpy()
+    is_data = sno_ok & (sno_num > 0) & ~is_date_row
+    is_data[:header_pos + 1] = False
+    data_pos = np.flatnonzero(is_data)
+    if len(data_pos) == 0:
+        return _finalize([], title_found, header_found)
+
+    def col(key, default):
+        if key in col_map:
+            return columns[col_map[key]].iloc[data_pos].reset_index(drop=True)
+        return pd.Series(default, index=range(len(data_pos)), dtype=object)
+
+    emp_id = col('emp_id', "")
+    emp_name = col('emp_name', "Unknown")
+    in_dur = col('in_dur', "00:00")
+    out_dur = col('out_dur', "00:00")
+    punch_log = col('punches', "")
+    dates = row_dates.iloc[data_pos].reset_index(drop=True)
+
+    # Row-level validation; the first failing row wins, as in the row loop
+    bad_ts = emp_id.str.match(r'^\d{1,2}:\d{2}$').to_numpy(dtype=bool)
+    bad_id = ((emp_id == "") | (emp_id.str.lower() == 'nan')).to_numpy(dtype=bool)
+    bad_date = dates.isna().to_numpy() | (dates == "").to_numpy(dtype=bool)
+    failing = np.flatnonzero(bad_ts | bad_id | bad_date)
+    if len(failing):
+        i = failing[0]
+        index = row_no[data_pos[i]]
+        if bad_ts[i]:
+            logger.error(f"Cleaner: Structural Mismatch at row {index+1}. Detected EmpID '{emp_id.iloc[i]}' looks like a timestamp.")
+            return None, _structural_error(emp_id.iloc[i])
+        if bad_id[i]:
+            return None, f"Invalid Record at row {index+1}: Missing Employee ID"
+        return None, f"Invalid State: Record found before Date header at row {index+1}"
+
+    # First In / Last Out: first and last comma-separated punch containing ':'
+    has_log = ((punch_log != "") & (punch_log.str.lower() != 'nan')).to_numpy(dtype=bool)
+    punches = punch_log.str.replace(r'\(in\)|\(out\)', '', case=False, regex=True)
+    first_punch = punches.str.extract(r'^(?:[^,:]*,)*?([^,]*:[^,]*)', expand=False).str.strip()
+    last_punch = punches.str.extract(r'(?:^|,)([^,]*:[^,]*)(?:,[^,:]*)*$', expand=False).str.strip()
+    first_in = np.where(has_log & first_punch.notna().to_numpy(), first_punch.fillna(""), "--:--").astype(object)
+    last_out = np.where(has_log & last_punch.notna().to_numpy(), last_punch.fillna(""), "--:--").astype(object)
+
+    # Fallback to the duration columns when there are no punches
+    in_has_colon = in_dur.str.contains(':', regex=False).to_numpy(dtype=bool)
+    out_has_colon = out_dur.str.contains(':', regex=False).to_numpy(dtype=bool)
+    first_in = np.where((first_in == "--:--") & in_has_colon, in_dur.to_numpy(dtype=object), first_in)
+    last_out = np.where((last_out == "--:--") & out_has_colon, out_dur.to_numpy(dtype=object), last_out)
+
+    # Total duration in integer minutes
+    has_span = (first_in != "--:--") & (last_out != "--:--")
+    span_min = np.maximum(
+        _to_minutes(pd.Series(last_out, dtype=object)) - _to_minutes(pd.Series(first_in, dtype=object)), 0
+    )
+    sum_min = _to_minutes(in_dur) + _to_minutes(out_dur)
+    total_min = np.where(has_span, span_min, sum_min)
+    total_duration = _format_minutes(total_min)
+
+    # Attendance Status logic: Present >= present threshold, otherwise Absent
+    status = np.where(total_min >= present_threshold_min(), "Present", "Absent").astype(object)
+
+    fields = {
+        'Date': dates.to_numpy(dtype=object),
+        'EmpID': emp_id.to_numpy(dtype=object),
+        'Employee_Name': emp_name.to_numpy(dtype=object),
+        'In_Duration': in_dur.to_numpy(dtype=object),
+        'Out_Duration': out_dur.to_numpy(dtype=object),
+        'Total_Duration': total_duration,
+        'First_In': first_in,
+        'Last_Out': last_out,
+        'Punch_Records': punch_log.to_numpy(dtype=object),
+        'Attendance': status
+    }
+    keys = list(fields)
+    cleaned_data = [dict(zip(keys, values)) for values in zip(*(fields[k].tolist() for k in keys))]
+
+    return _finalize(cleaned_data, title_found, header_found)
+
+def _hhmm(value):
+    """'14:11:49' / '9:05' -> '14:11' / '09:05'; anything else -> None"""
+    match = re.search(r'(\d{1,2}):(\d{2})', value or "")
+    if not match:
+        return None
+    return f"{int(match.group(1)):02d}:{match.group(2)}"
+
+def _hhmm_minutes(value):
+    return int(value[:-3]) * 60 + int(value[-2:])
+
+def _clean_monthly_row_stream(rows):
+    """
+    Row engine for the Monthly Detailed Attendance Report
+
+    The report states its period once ("22-Dec-2025 To 31-Dec-2025") and then
+    has one block per employee: an "Employee Code:-" row, a "Day" row mapping
+    columns to Day1..DayN of the period, and labelled rows (In Time, Out Time,
+    Duration, ...) holding one value per day. Each block yields one record
+    per day in the same shape as the In/Out Duration Report.
+    """
+    cleaned_count = 0
+    present_threshold = present_threshold_min()
+    period_start = None
+    period_days = 0
+    day_columns = {}
+    employee = None
+    values = {}
+
+    def flush():
+        nonlocal cleaned_count
+        if employee is None or not day_columns:
+            return
+        emp_id_raw, emp_name, row_number = employee
+        in_times = values.get('in time', {})
+        for col, day in sorted(day_columns.items(), key=lambda item: item[1]):
+            if day > period_days or col not in in_times:
+                continue
+
+            first_in = _hhmm(in_times.get(col))
+            last_out = _hhmm(values.get('out time', {}).get(col))
+            worked = _hhmm(values.get('duration', {}).get(col)) or "00:00"
+            worked_min = _hhmm_minutes(worked)
+
+            # Same rules as the In/Out report: span between first in and last
+            # out when both punches exist, otherwise the worked duration
+            if first_in and last_out and first_in != "00:00" and last_out != "00:00":
+                span_min = max(_hhmm_minutes(last_out) - _hhmm_minutes(first_in), 0)
+                punch_log = f"{first_in}(in),{last_out}(out),"
+            else:
+                span_min = worked_min
+                punch_log = f"{first_in}(in)," if first_in and first_in != "00:00" else ""
+            break_min = max(span_min - worked_min, 0)
+
+            cleaned_count += 1
+            yield {
+                'Date': (period_start + timedelta(days=day - 1)).strftime('%Y-%m-%d'),
+                'EmpID': emp_id_raw,
+                'Employee_Name': emp_name,
+                'In_Duration': worked,
+                'Out_Duration': f"{break_min // 60:02d}:{break_min % 60:02d}",
+                'Total_Duration': f"{span_min // 60:02d}:{span_min % 60:02d}",
+                'First_In': first_in or "--:--",
+                'Last_Out': last_out or "--:--",
+                'Punch_Records': punch_log,
+                'Attendance': "Present" if span_min >= present_threshold else "Absent"
+            }
+
+    for index, row_list in rows:
+        cells = [(i, v) for i, v in enumerate(row_list) if v]
+        if not cells:
+            continue
+        label = cells[0][1].lower().rstrip(':- ')
+
+        if period_start is None:
+            match = re.search(MONTHLY_PERIOD_PATTERN, " ".join(row_list).lower())
+            if match:
+                try:
+                    period_start = datetime.strptime(match.group(1), '%d-%b-%Y').date()
+                    period_end = datetime.strptime(match.group(2), '%d-%b-%Y').date()
+                except ValueError:
+                    raise CleanerError(f"Invalid Format: Unreadable report period at row {index+1}")
+                period_days = (period_end - period_start).days + 1
+                if period_days < 1 or period_days > 31:
+                    raise CleanerError(f"Invalid Format: Report period at row {index+1} must span 1 to 31 days")
+                continue
+
+        if label == 'employee code':
+            yield from flush()
+            if period_start is None:
+                raise CleanerError(f"Invalid State: Employee block found before report period at row {index+1}")
+            labelled = {v.lower().rstrip(':- '): cells[pos + 1][1] if pos + 1 < len(cells) else "" for pos, (_, v) in enumerate(cells)}
+            emp_id_raw = labelled.get('employee code', "")
+            if not emp_id_raw or emp_id_raw.lower() in ('nan', 'employee name'):
+                raise CleanerError(f"Invalid Record at row {index+1}: Missing Employee ID")
+            if re.match(r'^\d{1,2}:\d{2}$', emp_id_raw):
+                raise CleanerError(_structural_error(emp_id_raw))
+            employee = (emp_id_raw, labelled.get('employee name', "Unknown") or "Unknown", index + 1)
+            values = {}
+            continue
+
+        if employee is None:
+            continue
+
+        if label == 'day':
+            day_columns = {}
+            for i, v in cells[1:]:
+                day_match = re.fullmatch(r'day\s*(\d{1,2})', v.lower())
+                if day_match:
+                    day_columns[i] = int(day_match.group(1))
+            continue
+
+        if label in ('in time', 'out time', 'duration'):
+            values[label] = {i: v for i, v in cells[1:] if i in day_columns}
+        elif label == 'status':
+            # Last row of an employee block
+            yield from flush()
+            employee = None
+
+    yield from flush()
+
+    if period_start is None:
+        raise CleanerError("Invalid Format: Report period ('DD-Mon-YYYY To DD-Mon-YYYY') not found")
+    if not cleaned_count:
+        raise CleanerError("Invalid Content: No attendance records identified")
+
+# ---------------------------------------------------------------------------
+# Report parser registry
+# ---------------------------------------------------------------------------
+# signature (lower-case text found in the first SIGNATURE_ROWS rows)
+#   -> (report type, row engine consuming (index, row_list) pairs)
+REPORT_PARSERS = {}
+
+def register_report_parser(signature, report_type, row_engine):
+    """Register a row engine for files whose leading rows contain signature"""
+    REPORT_PARSERS[signature] = (report_type, row_engine)
+
+def _match_report_parser(head_rows):
+    """
+    Pick the parser for a file from its leading rows (joined, lower-cased).
+    Unrecognised files go to the In/Out engine, which rejects them with its
+    usual title error.
+    """
+    head = " | ".join(head_rows)
+    for signature, parser in REPORT_PARSERS.items():
+        if signature in head:
+            return parser
+    return REPORT_PARSERS[TITLE_TEXT]
+
+register_report_parser(TITLE_TEXT, REPORT_TYPE, _clean_row_stream)
+register_report_parser(MONTHLY_TITLE_TEXT, MONTHLY_REPORT_TYPE, _clean_monthly_row_stream)
@@ -9,6 +9,9 @@ from typing import List, Dict
 
 from app.repositories.leave_repository import LeaveRepository
 from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.attendance_summary_repository import AttendanceSummaryRepository
+from app.repositories.attendance_bitmap_repository import AttendanceBitmapRepository
+from app.repositories.payroll_recompute_repository import PayrollRecomputeRepository
 from app.repositories.employee_repository import EmployeeRepository
 from app.services.communication_service import CommunicationService
 from app.models.models import Employee, UserRole
@@ -20,6 +23,9 @@ class LeaveService:
         self.db = db
         self.leave_repo = LeaveRepository(db)
         self.attendance_repo = AttendanceRepository(db)
+        self.summary_repo = AttendanceSummaryRepository(db)
+        self.bitmap_repo = AttendanceBitmapRepository(db)
+        self.recompute_repo = PayrollRecomputeRepository(db)
         self.employee_repo = EmployeeRepository(db)
         self.comm_service = CommunicationService(db)
     
@@ -384,9 +390,11 @@ class LeaveService:
     
     def _sync_attendance_on_approval(self, request) -> None:
         """Mark attendance as 'On Leave' for approved dates"""
+        touched = set()
         curr = request.start_date
         while curr <= request.end_date:
             if curr.weekday() < 6:
+                touched.add((request.emp_id, curr.year, curr.month))
                 existing = self.attendance_repo.get_by_emp_and_date(request.emp_id, curr)
                 
                 if existing:
@@ -401,6 +409,10 @@ class LeaveService:
                     self.attendance_repo.create(attendance_data)
             
             curr += timedelta(days=1)
+        
+        self.summary_repo.refresh(touched)
+        self.bitmap_repo.refresh((emp_id, year) for emp_id, year, _ in touched)
+        self.recompute_repo.mark(touched, reason="LEAVE")
 
     def get_employee_summary(self, emp_id: str = None) -> Dict:
         """
@@ -51,7 +51,10 @@ class OvertimeService:
         
         for attendance in attendance_records:
             # Parse total duration to get actual hours
-            actual_hours = self._parse_duration_to_hours(attendance.total_duration)
+            if attendance.total_duration_min is not None:
+                actual_hours = Decimal(attendance.total_duration_min) / Decimal('60')
+            else:
+                actual_hours = self._parse_duration_to_hours(attendance.total_duration)
             
             if actual_hours > regular_hours:
                 overtime_hours = actual_hours - regular_hours
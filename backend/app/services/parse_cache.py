@@ -0,0 +1,197 @@
+"""
+Parsed File Cache
+Keeps the cleaned records of recently uploaded attendance files on disk,
+keyed by the SHA-256 file hash, so a re-uploaded export (or the worker
+picking up a file that was already validated) never parses it again.
+
+Entries are stored column-wise (one list per record field) as zlib
+compressed JSON and evicted least-recently-used once the directory grows
+past PARSE_CACHE_MAX_MB.
+"""
+import json
+import logging
+import os
+import tempfile
+import zlib
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.services.cleaner import stream_clean_chunks, present_threshold_min, CleanerError, DEFAULT_CHUNK_SIZE
+from app.utils.file_utils import calculate_file_hash, validate_emp_ids
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cleaner output changes so stale entries are ignored
+CACHE_FORMAT_VERSION = 2
+CACHE_SUFFIX = ".json.z"
+
+def _cache_dir() -> Optional[str]:
+    """Cache directory, or None when caching is disabled"""
+    settings = get_settings()
+    if settings.PARSE_CACHE_MAX_MB <= 0:
+        return None
+    os.makedirs(settings.PARSE_CACHE_DIR, exist_ok=True)
+    return settings.PARSE_CACHE_DIR
+
+def _entry_path(cache_dir: str, file_hash: str) -> str:
+    return os.path.join(cache_dir, f"{file_hash}{CACHE_SUFFIX}")
+
+def get_cached_records(file_hash: str) -> Optional[Tuple[List[Dict], str]]:
+    """
+    Look up the cleaned records for a file hash
+
+    Args:
+        file_hash: SHA-256 of the raw file content
+
+    Returns:
+        (records, report_type) or None on a miss
+    """
+    cache_dir = _cache_dir()
+    if not cache_dir:
+        return None
+
+    path = _entry_path(cache_dir, file_hash)
+    try:
+        with open(path, "rb") as f:
+            payload = json.loads(zlib.decompress(f.read()))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Discarding unreadable parse cache entry {file_hash}: {e}")
+        _remove(path)
+        return None
+
+    # Statuses in the entry were derived with the threshold in force at the time
+    if payload.get("version") != CACHE_FORMAT_VERSION or payload.get("present_threshold") != present_threshold_min():
+        _remove(path)
+        return None
+
+    # Touch the entry so eviction sees it as recently used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    columns = payload["columns"]
+    records = [dict(zip(columns, values)) for values in zip(*(payload["data"][c] for c in columns))]
+    return records, payload["report_type"]
+
+def put_cached_records(file_hash: str, columns: Dict[str, List], report_type: str) -> None:
+    """
+    Store cleaned records (already in columnar form) for a file hash
+
+    Args:
+        file_hash: SHA-256 of the raw file content
+        columns: Field name -> list of values, all lists the same length
+        report_type: Detected report type
+    """
+    cache_dir = _cache_dir()
+    if not cache_dir or not columns:
+        return
+
+    payload = {
+        "version": CACHE_FORMAT_VERSION,
+        "report_type": report_type,
+        "present_threshold": present_threshold_min(),
+        "columns": list(columns),
+        "data": columns
+    }
+    blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 6)
+
+    # Write to a temp file and rename so readers never see a partial entry
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, _entry_path(cache_dir, file_hash))
+    except OSError as e:
+        logger.warning(f"Could not write parse cache entry {file_hash}: {e}")
+        return
+
+    _evict(cache_dir, get_settings().PARSE_CACHE_MAX_MB * 1024 * 1024)
+
+def _evict(cache_dir: str, max_bytes: int) -> None:
+    """Delete least recently used entries until the cache fits in max_bytes"""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(CACHE_SUFFIX):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def cached_clean_chunks(file_content: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Cache-aware drop-in for cleaner.stream_clean_chunks
+
+    On a hit the records come straight from the cache. On a miss the file is
+    streamed as usual and, once every chunk has been consumed without a
+    CleanerError, the collected records are written to the cache.
+
+    Returns:
+        (chunks, detected_type) or (None, reason)
+    """
+    file_hash = calculate_file_hash(file_content)
+    cached = get_cached_records(file_hash)
+    if cached:
+        records, report_type = cached
+        logger.info(f"Parse cache hit for {file_hash[:12]} ({len(records)} records)")
+        return _split(records, chunk_size), report_type
+
+    chunks, detected_type = stream_clean_chunks(file_content, chunk_size)
+    if chunks is None:
+        return None, detected_type
+
+    def collecting():
+        columns: Dict[str, List] = {}
+        for chunk in chunks:
+            for rec in chunk:
+                for key, value in rec.items():
+                    columns.setdefault(key, []).append(value)
+            yield chunk
+        put_cached_records(file_hash, columns, detected_type)
+
+    return collecting(), detected_type
+
+def _split(records: List[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    it = iter(records)
+    chunk = list(islice(it, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(it, chunk_size))
+
+def validate_and_cache_file(file_content: bytes):
+    """
+    Validate a file like cleaner.validate_attendance_file, check every
+    employee ID and leave its cleaned records in the cache for the
+    ingestion worker, so a file the worker would reject is never queued.
+    Returns (record_count, detected_type) or (None, reason).
+
+    Top-level and picklable so it can run in the parse process pool.
+    """
+    chunks, detected_type = cached_clean_chunks(file_content)
+    if chunks is None:
+        return None, detected_type
+    record_count = 0
+    try:
+        for chunk in chunks:
+            validate_emp_ids(chunk, record_count)
+            record_count += len(chunk)
+    except (CleanerError, ValueError) as e:
+        return None, str(e)
+    return record_count, detected_type
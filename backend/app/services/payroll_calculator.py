@@ -0,0 +1,68 @@
+"""
+Payroll Calculator
+Vectorized net pay for many employees at once in integer paise (NumPy int64)
+
+Rounding rules (shared with the Decimal path in PayrollService):
+- Money is converted to paise with ROUND_HALF_UP, and every deduction line
+  is rounded to the paisa before it is added to the total.
+- Paid days are counted in tenths of a day (present_days is DECIMAL(5,1)).
+- Net pay is gross * paid_days / working_days - deductions, clamped at zero,
+  then rounded once to the paisa with ROUND_HALF_UP. Nothing is rounded
+  before that single step, so the result equals the Decimal path exactly.
+- working_days of zero gives zero pay before deductions.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable
+
+import numpy as np
+
+PAISE = Decimal("0.01")
+
+def round_paise(amount: Decimal) -> Decimal:
+    """Round a rupee amount to the paisa (ROUND_HALF_UP)"""
+    return Decimal(amount).quantize(PAISE, rounding=ROUND_HALF_UP)
+
+def to_paise(amount: Decimal) -> int:
+    """Rupees (Decimal, int or str) to integer paise, ROUND_HALF_UP"""
+    return int(round_paise(Decimal(str(amount))) * 100)
+
+def from_paise(paise: int) -> Decimal:
+    """Integer paise to a 2-decimal rupee amount"""
+    return Decimal(int(paise)).scaleb(-2)
+
+def paise_array(amounts: Iterable) -> np.ndarray:
+    """Rupee amounts to an int64 array of paise"""
+    return np.fromiter((to_paise(amount) for amount in amounts), dtype=np.int64)
+
+def calculate_net_paise(
+    gross_paise: np.ndarray,
+    paid_days: np.ndarray,
+    working_days: np.ndarray,
+    deduction_paise: np.ndarray
+) -> np.ndarray:
+    """
+    Net pay for every employee: gross / working_days * paid_days - deductions
+
+    Args:
+        gross_paise: Monthly gross salary in paise (int64)
+        paid_days: Present + on-leave days (multiples of 0.1)
+        working_days: Working days in the month (int)
+        deduction_paise: Total deductions in paise (int64), lines already
+                         rounded to the paisa
+
+    Returns:
+        int64 array of net pay in paise, never negative
+    """
+    gross = np.asarray(gross_paise, dtype=np.int64)
+    paid_tenths = np.rint(np.asarray(paid_days, dtype=np.float64) * 10).astype(np.int64)
+    days = np.asarray(working_days, dtype=np.int64)
+    deductions = np.asarray(deduction_paise, dtype=np.int64)
+
+    # net = numerator / denominator exactly; gross is below 10^10 paise
+    # (DECIMAL(10,2)) and paid_tenths below 400, so nothing overflows int64
+    denominator = np.maximum(days * 10, 1)
+    prorated = np.where(days > 0, gross * paid_tenths, 0)
+    numerator = np.maximum(prorated - deductions * denominator, 0)
+
+    # Half-up to the paisa: floor((2n + d) / 2d) for n >= 0
+    return (2 * numerator + denominator) // (2 * denominator)
@@ -0,0 +1,123 @@
+"""
+Parallel Payroll Run
+Splits the employees with an active salary into contiguous emp_id ranges
+and runs the batch payroll engine for each range in its own worker process
+and database session, then merges the shard outcomes into one run report.
+
+Each shard commits on its own, so a failing shard never rolls back the
+others; re-running the month only processes the employees still missing.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.repositories.salary_repository import SalaryRepository
+
+logger = logging.getLogger(__name__)
+
+def partition_emp_ids(emp_ids: List[str], shards: int) -> List[List[str]]:
+    """
+    Split emp_ids (already in database order) into up to `shards` contiguous,
+    near-equal slices; each slice is processed as the range slice[0]..slice[-1]
+    """
+    if not emp_ids:
+        return []
+    shards = max(1, min(shards, len(emp_ids)))
+    size, extra = divmod(len(emp_ids), shards)
+    slices = []
+    start = 0
+    for index in range(shards):
+        end = start + size + (1 if index < extra else 0)
+        slices.append(emp_ids[start:end])
+        start = end
+    return slices
+
+def process_payroll_shard(month: int, year: int, processed_by: str, emp_id_range: Tuple[str, str]) -> Dict:
+    """
+    Run the batch payroll engine for one emp_id range with its own session
+
+    Top-level and picklable so it can run in a worker process.
+
+    Returns:
+        The PayrollService.process_all_payroll result plus the shard range
+    """
+    from app.services.payroll_service import PayrollService
+
+    db = SessionLocal()
+    try:
+        result = PayrollService(db).process_all_payroll(month, year, processed_by, emp_id_range=emp_id_range)
+        return {"emp_id_range": list(emp_id_range), "status": "success", **result}
+    finally:
+        db.close()
+
+def run_parallel_payroll(month: int, year: int, processed_by: str, workers: Optional[int] = None) -> Dict:
+    """
+    Process a month's payroll for all employees across worker processes
+
+    Args:
+        month: Month (1-12)
+        year: Year
+        processed_by: User (or "SYSTEM") processing the payroll
+        workers: Worker processes, defaults to PAYROLL_RUN_WORKERS
+                 (0 = one per CPU core)
+
+    Returns:
+        Run report: processed/succeeded/failed counts, per-shard outcome
+        and the merged per-employee results
+    """
+    if not 1 <= month <= 12:
+        raise ValueError("Invalid month")
+
+    workers = workers or get_settings().PAYROLL_RUN_WORKERS or os.cpu_count() or 1
+
+    db = SessionLocal()
+    try:
+        emp_ids = SalaryRepository(db).get_active_emp_ids()
+    finally:
+        db.close()
+
+    slices = partition_emp_ids(emp_ids, workers)
+    shards = []
+    if slices:
+        logger.info(f"Payroll run {month}/{year}: {len(emp_ids)} employees in {len(slices)} shard(s)")
+        # spawn: workers open their own engine instead of inheriting the parent's connections
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(slices), mp_context=context) as pool:
+            futures = {
+                pool.submit(process_payroll_shard, month, year, processed_by, (shard[0], shard[-1])): shard
+                for shard in slices
+            }
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    shards.append(future.result())
+                except Exception as e:
+                    # The shard's transaction never committed: none of its employees were processed
+                    logger.error(f"Payroll shard {shard[0]}..{shard[-1]} failed: {e}")
+                    error = (str(e).splitlines() or [repr(e)])[0]
+                    shards.append({
+                        "emp_id_range": [shard[0], shard[-1]],
+                        "status": "failed",
+                        "error": error,
+                        "processed": len(shard),
+                        "results": [{"emp_id": emp_id, "status": "failed", "error": error} for emp_id in shard]
+                    })
+
+    shards.sort(key=lambda shard: shard["emp_id_range"][0])
+    results = [result for shard in shards for result in shard["results"]]
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    return {
+        "processed": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "failed_shards": sum(1 for shard in shards if shard["status"] == "failed"),
+        "shards": [
+            {key: value for key, value in shard.items() if key != "results"}
+            for shard in shards
+        ],
+        "results": results
+    }
@@ -8,10 +8,30 @@ from app.repositories.payroll_repository import PayrollRepository
 from app.repositories.salary_repository import SalaryRepository
 from app.repositories.deduction_repository import DeductionRepository
 from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.attendance_summary_repository import AttendanceSummaryRepository
+from app.repositories.payroll_recompute_repository import PayrollRecomputeRepository
+from app.services.payroll_calculator import calculate_net_paise, from_paise, paise_array, round_paise, to_paise
+from app.models.models import get_ist_now
 from decimal import Decimal
 from datetime import date, timedelta
 import json
 import calendar
+import threading
+from typing import List, Optional, Tuple
+from collections import OrderedDict, defaultdict
+
+# Month previews per process: (month, year) -> (input version, preview).
+# An entry is only served while its version still matches the database.
+PREVIEW_CACHE_SIZE = 24
+_preview_cache: "OrderedDict[Tuple[int, int], Tuple[str, dict]]" = OrderedDict()
+_preview_lock = threading.Lock()
+
+# Record fields rewritten by a recompute (status and payment details are kept)
+RECOMPUTED_FIELDS = (
+    "basic_salary", "hra", "transport_allowance", "dearness_allowance", "medical_allowance",
+    "special_allowance", "other_allowances", "gross_salary", "total_deductions", "net_salary",
+    "deduction_details", "working_days", "present_days", "absent_days", "on_leave_days", "processed_by"
+)
 
 class PayrollService:
     """Handles payroll processing business logic"""
@@ -22,6 +42,8 @@ class PayrollService:
         self.salary_repo = SalaryRepository(db)
         self.deduction_repo = DeductionRepository(db)
         self.attendance_repo = AttendanceRepository(db)
+        self.summary_repo = AttendanceSummaryRepository(db)
+        self.recompute_repo = PayrollRecomputeRepository(db)
     
     def process_payroll(self, emp_id: str, month: int, year: int, processed_by: str) -> dict:
         """
@@ -49,58 +71,225 @@ class PayrollService:
         if not salary:
             raise HTTPException(status_code=404, detail="No active salary structure found")
         
-        # Calculate working days and attendance
+        # Calculate working days, attendance and deductions
         working_days = self._get_working_days(month, year)
         attendance_data = self._get_attendance_summary(emp_id, month, year)
+        deductions = self._calculate_deductions(emp_id, salary)
         
-        # Overtime calculation removed
+        payroll_data = self._build_payroll_data(
+            salary, deductions, attendance_data, working_days, month, year, processed_by
+        )
         
-        # Calculate deductions
-        deductions = self._calculate_deductions(emp_id, salary)
-        total_deductions = sum(d['amount'] for d in deductions)
+        return self.payroll_repo.create(payroll_data)
+    
+    def process_all_payroll(self, month: int, year: int, processed_by: str, emp_id_range: Optional[Tuple[str, str]] = None) -> dict:
+        """
+        Process monthly payroll for every employee with an active salary
         
-        # Calculate net salary with LOP (Loss of Pay)
-        gross_salary = salary.gross_salary
+        Set-based: salaries, deductions (with their type names), the monthly
+        attendance rollups and the existing payroll keys are loaded in a
+        handful of queries, every record is computed in memory with the same
+        rules as process_payroll (net pay for all employees in one pass of
+        the vectorized paise calculator), and all new records are inserted
+        in one transaction.
         
-        # PAID DAYS = present_days (which includes 0.5 for half days) + on_leave_days
-        paid_days = Decimal(str(attendance_data['present_days'])) + Decimal(str(attendance_data['on_leave_days']))
+        Args:
+            month: Month (1-12)
+            year: Year
+            processed_by: User processing the payroll
+            emp_id_range: Only employees with emp_id BETWEEN these bounds
+                          (one shard of a parallel run)
+            
+        Returns:
+            {"processed": n, "results": [{"emp_id", "status", "error"?}]}
+        """
+        if not 1 <= month <= 12:
+            raise HTTPException(status_code=400, detail="Invalid month")
         
-        # Net before deductions (proportionate to attendance)
-        if working_days > 0:
-            prorated_salary = (gross_salary / Decimal(str(working_days))) * paid_days
-        else:
-            prorated_salary = Decimal('0.00')
+        rows, results = self._compute_month(month, year, processed_by, emp_id_range)
+        
+        try:
+            self.payroll_repo.bulk_create(rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return {"processed": len(results), "results": results}
+    
+    def recompute_marked_payroll(self, processed_by: str, limit: Optional[int] = None) -> dict:
+        """
+        Recompute the unpaid payroll records queued by late changes
+        
+        Attendance writes, leave approvals and salary structure changes mark
+        the (emp_id, month) pairs whose PROCESSED/DRAFT record is now stale
+        (see PayrollRecomputeRepository). Only those records are recalculated,
+        month by month with the batch loaders of process_all_payroll, using
+        the same rules as process_payroll; every other record is left alone.
+        Records that became PAID in the meantime are skipped. Marks of
+        recomputed and skipped records are removed in the same transaction,
+        unless a write marked them again after they were loaded; marks that
+        failed (e.g. no active salary) stay queued for the next run.
+        
+        Args:
+            processed_by: User (or "SYSTEM") recorded on the recomputed records
+            limit: Handle at most this many marks (oldest month first)
             
-        net_salary = prorated_salary - Decimal(str(total_deductions))
+        Returns:
+            {"recomputed": n, "skipped": n, "failed": n, "results": [...]}
+        """
+        marks = self.recompute_repo.get_pending(limit)
+        by_month = defaultdict(set)
+        loaded = {}
+        for mark in marks:
+            by_month[(mark.year, mark.month)].add(mark.emp_id)
+            loaded[(mark.emp_id, mark.year, mark.month)] = (mark.id, mark.marked_at)
         
-        # Ensure net salary is not negative
-        net_salary = max(Decimal('0.00'), net_salary)
+        results = []
+        try:
+            for (year, month), marked in by_month.items():
+                emp_ids = sorted(marked)
+                emp_id_range = (emp_ids[0], emp_ids[-1])
+                records = self.payroll_repo.get_unpaid_for_month(month, year, emp_ids)
+                
+                # Same pick as get_active_by_emp_id if an employee has several
+                salaries = {}
+                for salary in self.salary_repo.get_all_active(emp_id_range):
+                    if salary.emp_id in records:
+                        salaries.setdefault(salary.emp_id, salary)
+                
+                deductions_by_emp = defaultdict(list)
+                for emp_ded, type_name in self.deduction_repo.get_active_deductions_with_type_names(emp_id_range=emp_id_range):
+                    if emp_ded.emp_id in records:
+                        deductions_by_emp[emp_ded.emp_id].append((emp_ded, type_name))
+                
+                summaries = self.summary_repo.get_for_month(year, month, emp_id_range)
+                missing = [emp_id for emp_id in records if emp_id not in summaries]
+                if missing:
+                    self.summary_repo.refresh((emp_id, year, month) for emp_id in missing)
+                    summaries = self.summary_repo.get_for_month(year, month, emp_id_range)
+                
+                working_days = self._get_working_days(month, year)
+                for emp_id in emp_ids:
+                    outcome = {"emp_id": emp_id, "month": month, "year": year}
+                    record = records.get(emp_id)
+                    salary = salaries.get(emp_id)
+                    if record is None:
+                        results.append({**outcome, "status": "skipped", "error": "Payroll record is PAID or no longer exists"})
+                        continue
+                    if salary is None:
+                        results.append({**outcome, "status": "failed", "error": "No active salary structure found"})
+                        continue
+                    
+                    attendance_data = self._attendance_from_summary(summaries.get(emp_id), working_days)
+                    deductions = self._deduction_lines(salary, deductions_by_emp.get(emp_id, []))
+                    payroll_data = self._build_payroll_data(
+                        salary, deductions, attendance_data, working_days, month, year, processed_by
+                    )
+                    for field in RECOMPUTED_FIELDS:
+                        setattr(record, field, payroll_data[field])
+                    results.append({**outcome, "status": "success"})
+            
+            self.recompute_repo.delete_handled([
+                loaded[(result["emp_id"], result["year"], result["month"])]
+                for result in results if result["status"] != "failed"
+            ])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         
-        # Create payroll record
-        payroll_data = {
-            "emp_id": emp_id,
+        return {
+            "recomputed": sum(1 for result in results if result["status"] == "success"),
+            "skipped": sum(1 for result in results if result["status"] == "skipped"),
+            "failed": sum(1 for result in results if result["status"] == "failed"),
+            "results": results
+        }
+    
+    def get_pending_recomputes(self) -> list:
+        """List the queued (emp_id, month) payroll recomputes"""
+        return [
+            {
+                "emp_id": mark.emp_id,
+                "month": mark.month,
+                "year": mark.year,
+                "reason": mark.reason,
+                "marked_at": mark.marked_at
+            }
+            for mark in self.recompute_repo.get_pending()
+        ]
+    
+    def preview_payroll(self, month: int, year: int) -> dict:
+        """
+        Dry run of process_all_payroll: compute the whole month, write nothing
+        
+        The preview is cached per (month, year) together with the input
+        version stamp (salaries, deductions, attendance rollups and already
+        processed records, see PayrollRepository.get_input_version); repeated
+        previews are served from the cache until one of those inputs changes.
+        
+        Args:
+            month: Month (1-12)
+            year: Year
+            
+        Returns:
+            Per-employee records that would be created, month totals, the
+            employees that would be skipped and whether it came from cache
+        """
+        if not 1 <= month <= 12:
+            raise HTTPException(status_code=400, detail="Invalid month")
+        
+        key = (month, year)
+        version = self.payroll_repo.get_input_version(month, year)
+        with _preview_lock:
+            cached = _preview_cache.get(key)
+            if cached and cached[0] == version:
+                _preview_cache.move_to_end(key)
+                return {**cached[1], "cached": True}
+        
+        try:
+            rows, results = self._compute_month(month, year, processed_by="PREVIEW")
+        finally:
+            # Drops the rollups filled in for months not rolled up yet
+            self.db.rollback()
+        
+        preview = self._build_preview(month, year, version, rows, results)
+        with _preview_lock:
+            _preview_cache[key] = (version, preview)
+            _preview_cache.move_to_end(key)
+            while len(_preview_cache) > PREVIEW_CACHE_SIZE:
+                _preview_cache.popitem(last=False)
+        return {**preview, "cached": False}
+    
+    @staticmethod
+    def _build_preview(month: int, year: int, version: str, rows: List[dict], results: List[dict]) -> dict:
+        """Shape computed payroll rows into the preview response"""
+        records = [
+            {
+                "emp_id": row["emp_id"],
+                "gross_salary": float(row["gross_salary"]),
+                "total_deductions": float(row["total_deductions"]),
+                "net_salary": float(row["net_salary"]),
+                "working_days": row["working_days"],
+                "present_days": float(row["present_days"]),
+                "absent_days": float(row["absent_days"]),
+                "on_leave_days": float(row["on_leave_days"]),
+                "deductions": json.loads(row["deduction_details"])
+            }
+            for row in rows
+        ]
+        return {
             "month": month,
             "year": year,
-            "basic_salary": salary.basic_salary,
-            "hra": salary.hra,
-            "transport_allowance": salary.transport_allowance,
-            "dearness_allowance": salary.dearness_allowance,
-            "medical_allowance": salary.medical_allowance,
-            "special_allowance": salary.special_allowance,
-            "other_allowances": salary.other_allowances,
-            "gross_salary": gross_salary,
-            "total_deductions": Decimal(str(total_deductions)),
-            "net_salary": net_salary,
-            "deduction_details": json.dumps(deductions),
-            "working_days": working_days,
-            "present_days": Decimal(str(attendance_data['present_days'])),
-            "absent_days": Decimal(str(attendance_data['absent_days'])),
-            "on_leave_days": attendance_data['on_leave_days'],
-            "status": "PROCESSED",
-            "processed_by": processed_by
+            "input_version": version,
+            "generated_at": get_ist_now().isoformat(),
+            "employees": len(records),
+            "total_gross": float(sum((row["gross_salary"] for row in rows), Decimal("0.00"))),
+            "total_deductions": float(sum((row["total_deductions"] for row in rows), Decimal("0.00"))),
+            "total_net": float(sum((row["net_salary"] for row in rows), Decimal("0.00"))),
+            "records": records,
+            "skipped": [result for result in results if result["status"] != "success"]
         }
-        
-        return self.payroll_repo.create(payroll_data)
     
     def get_payroll_record(self, emp_id: str, month: int, year: int):
         """Get payroll record for employee"""
@@ -191,24 +380,86 @@ class PayrollService:
         """Get list of all payroll records"""
         return self.payroll_repo.get_all()
     
+    def _compute_month(self, month: int, year: int, processed_by: str, emp_id_range: Optional[Tuple[str, str]] = None) -> Tuple[List[dict], List[dict]]:
+        """
+        Compute the payroll records of a month without inserting them
+        
+        Months that are not rolled up yet are refreshed in the session; the
+        caller commits (process_all_payroll) or rolls back (preview_payroll).
+        
+        Returns:
+            (payroll field dictionaries to insert, per-employee results)
+        """
+        # Same pick as get_active_by_emp_id if an employee has several
+        salaries = {}
+        for salary in self.salary_repo.get_all_active(emp_id_range):
+            salaries.setdefault(salary.emp_id, salary)
+        
+        already_processed = self.payroll_repo.get_emp_ids_for_month(month, year, emp_id_range)
+        
+        deductions_by_emp = defaultdict(list)
+        for emp_ded, type_name in self.deduction_repo.get_active_deductions_with_type_names(emp_id_range=emp_id_range):
+            deductions_by_emp[emp_ded.emp_id].append((emp_ded, type_name))
+        
+        summaries = self.summary_repo.get_for_month(year, month, emp_id_range)
+        missing = [emp_id for emp_id in salaries if emp_id not in summaries and emp_id not in already_processed]
+        if missing:
+            # Months not rolled up yet (e.g. data older than the rollup table)
+            self.summary_repo.refresh((emp_id, year, month) for emp_id in missing)
+            summaries = self.summary_repo.get_for_month(year, month, emp_id_range)
+        
+        working_days = self._get_working_days(month, year)
+        pending = []
+        results = []
+        for emp_id, salary in salaries.items():
+            if emp_id in already_processed:
+                results.append({"emp_id": emp_id, "status": "failed", "error": "Payroll already processed for this month"})
+                continue
+            try:
+                attendance_data = self._attendance_from_summary(summaries.get(emp_id), working_days)
+                deductions = self._deduction_lines(salary, deductions_by_emp.get(emp_id, []))
+                pending.append((salary, deductions, attendance_data))
+                results.append({"emp_id": emp_id, "status": "success"})
+            except Exception as e:
+                results.append({"emp_id": emp_id, "status": "failed", "error": str(e)})
+        
+        # Net pay for the whole month in one vectorized pass over integer paise
+        net_paise = calculate_net_paise(
+            paise_array(salary.gross_salary for salary, _, _ in pending),
+            [att['present_days'] + att['on_leave_days'] for _, _, att in pending],
+            [working_days] * len(pending),
+            [sum(to_paise(d['amount']) for d in deductions) for _, deductions, _ in pending]
+        )
+        rows = [
+            self._build_payroll_data(
+                salary, deductions, attendance_data, working_days, month, year, processed_by,
+                net_salary=from_paise(net)
+            )
+            for (salary, deductions, attendance_data), net in zip(pending, net_paise)
+        ]
+        
+        return rows, results
+    
     def _calculate_deductions(self, emp_id: str, salary) -> list:
         """Calculate all deductions for employee"""
+        employee_deductions = self.deduction_repo.get_active_deductions_with_type_names(emp_id)
+        return self._deduction_lines(salary, employee_deductions)
+    
+    @staticmethod
+    def _deduction_lines(salary, employee_deductions) -> list:
+        """Deduction detail lines from (EmployeeDeduction, type_name) pairs"""
         deductions = []
-        employee_deductions = self.deduction_repo.get_active_deductions_by_emp_id(emp_id)
-        
-        for emp_ded in employee_deductions:
-            deduction_type = self.deduction_repo.get_deduction_type_by_id(emp_ded.deduction_type_id)
-            if not deduction_type:
-                continue
-            
+        for emp_ded, type_name in employee_deductions:
             if emp_ded.calculation_type == "PERCENTAGE":
                 # Calculate percentage of basic salary
                 amount = (salary.basic_salary * emp_ded.value) / Decimal('100')
             else:  # FIXED
                 amount = emp_ded.value
+            # Each line is rounded to the paisa before it is totalled
+            amount = round_paise(amount)
             
             deductions.append({
-                "name": deduction_type.name,
+                "name": type_name,
                 "type": emp_ded.calculation_type,
                 "value": float(emp_ded.value),
                 "amount": float(amount)
@@ -216,6 +467,55 @@ class PayrollService:
         
         return deductions
     
+    @staticmethod
+    def _build_payroll_data(salary, deductions: list, attendance_data: dict, working_days: int, month: int, year: int, processed_by: str, net_salary: Decimal = None) -> dict:
+        """
+        Compute one payroll record (LOP proration and deductions) as a field dictionary
+        
+        Rounding follows app/services/payroll_calculator.py: the net is rounded
+        once to the paisa (ROUND_HALF_UP). Pass net_salary when it was already
+        computed by the vectorized calculator.
+        """
+        total_deductions = sum((Decimal(str(d['amount'])) for d in deductions), Decimal('0.00'))
+        gross_salary = salary.gross_salary
+        
+        if net_salary is None:
+            # PAID DAYS = present_days (which includes 0.5 for half days) + on_leave_days
+            paid_days = Decimal(str(attendance_data['present_days'])) + Decimal(str(attendance_data['on_leave_days']))
+            
+            # Net before deductions (proportionate to attendance); multiplying
+            # first keeps the division the only inexact step
+            if working_days > 0:
+                prorated_salary = gross_salary * paid_days / Decimal(working_days)
+            else:
+                prorated_salary = Decimal('0.00')
+                
+            # Ensure net salary is not negative
+            net_salary = round_paise(max(Decimal('0.00'), prorated_salary - total_deductions))
+        
+        return {
+            "emp_id": salary.emp_id,
+            "month": month,
+            "year": year,
+            "basic_salary": salary.basic_salary,
+            "hra": salary.hra,
+            "transport_allowance": salary.transport_allowance,
+            "dearness_allowance": salary.dearness_allowance,
+            "medical_allowance": salary.medical_allowance,
+            "special_allowance": salary.special_allowance,
+            "other_allowances": salary.other_allowances,
+            "gross_salary": gross_salary,
+            "total_deductions": total_deductions,
+            "net_salary": net_salary,
+            "deduction_details": json.dumps(deductions),
+            "working_days": working_days,
+            "present_days": Decimal(str(attendance_data['present_days'])),
+            "absent_days": Decimal(str(attendance_data['absent_days'])),
+            "on_leave_days": attendance_data['on_leave_days'],
+            "status": "PROCESSED",
+            "processed_by": processed_by
+        }
+    
     def _get_working_days(self, month: int, year: int) -> int:
         """Calculate working days in a month (excluding Sundays)"""
         _, num_days = calendar.monthrange(year, month)
@@ -229,18 +529,20 @@ class PayrollService:
         return working_days
     
     def _get_attendance_summary(self, emp_id: str, month: int, year: int) -> dict:
-        """Get attendance summary for the month"""
-        start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = date(year, month + 1, 1) - timedelta(days=1)
+        """Get attendance summary for the month (from the monthly rollup table)"""
+        summary = self.summary_repo.get(emp_id, year, month)
+        if not summary:
+            # Month not rolled up yet (e.g. data older than the rollup table)
+            self.summary_repo.refresh([(emp_id, year, month)])
+            summary = self.summary_repo.get(emp_id, year, month)
         
-        attendance_records = self.attendance_repo.get_by_emp_date_range(emp_id, start_date, end_date)
-        
-        present_days = len([a for a in attendance_records if a.attendance_status == "Present"])
-        on_leave_days = len([a for a in attendance_records if a.attendance_status == "On Leave"])
-        working_days = self._get_working_days(month, year)
+        return self._attendance_from_summary(summary, self._get_working_days(month, year))
+    
+    @staticmethod
+    def _attendance_from_summary(summary, working_days: int) -> dict:
+        """Present / on leave / absent days from a monthly rollup row (None = no attendance)"""
+        present_days = summary.present_days if summary else 0
+        on_leave_days = summary.on_leave_days if summary else 0
         
         # Effective present days
         effective_present = float(present_days)
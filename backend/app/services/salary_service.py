@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.repositories.employee_repository import EmployeeRepository
 from app.repositories.salary_repository import SalaryRepository
+from app.repositories.payroll_recompute_repository import PayrollRecomputeRepository
 from decimal import Decimal
 from datetime import date
 import logging
@@ -19,6 +20,7 @@ class SalaryService:
         self.db = db
         self.salary_repo = SalaryRepository(db)
         self.employee_repo = EmployeeRepository(db)
+        self.recompute_repo = PayrollRecomputeRepository(db)
     
     def create_salary_structure(self, emp_id: str, salary_data: dict, created_by: str) -> dict:
         """
@@ -44,6 +46,9 @@ class SalaryService:
             effective_from = salary_data.get('effective_from') or date.today()
             self.salary_repo.deactivate_previous(emp_id, effective_from)
             
+            # Unpaid payroll from the effective month on used the old structure
+            self.recompute_repo.mark_from(emp_id, effective_from.year, effective_from.month, reason="SALARY")
+            
             # Create new structure
             new_salary = {
                 "emp_id": emp_id,
@@ -105,6 +110,10 @@ class SalaryService:
             salary.special_allowance + salary.other_allowances
         )
         
+        if salary.is_active:
+            # Unpaid payroll from the effective month on was computed from this structure
+            self.recompute_repo.mark_from(salary.emp_id, salary.effective_from.year, salary.effective_from.month, reason="SALARY")
+        
         return self.salary_repo.update(salary)
     
     def _calculate_gross_salary(self, salary_data: dict) -> Decimal:
@@ -42,3 +42,20 @@ def format_time(time_val: any) -> Optional[str]:
     if not time_val or str(time_val).strip().lower() in ['', 'nan', 'none']:
         return None
     return str(time_val).strip()
+
+def time_to_minutes(time_val: any) -> Optional[int]:
+    """
+    Convert an "HH:MM" or "HH:MM:SS" string to whole minutes
+    
+    Args:
+        time_val: Time of day or duration string (e.g. "09:30", "75:18")
+        
+    Returns:
+        Minutes (seconds are dropped) or None if the value is not a time
+    """
+    if time_val is None:
+        return None
+    parts = str(time_val).strip().split(':')
+    if len(parts) < 2 or not parts[0].isdigit() or not parts[1][:2].isdigit():
+        return None
+    return int(parts[0]) * 60 + int(parts[1][:2])
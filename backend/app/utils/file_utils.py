@@ -3,9 +3,12 @@ File Utilities
 Helper functions for file operations
 """
 import hashlib
-from typing import Tuple
+import re
+from typing import Dict, Iterable, Tuple
 from fastapi import UploadFile
 
+EMP_ID_PATTERN = re.compile(r'^RBIS\d{4}$')
+
 def calculate_file_hash(content: bytes) -> str:
     """
     Calculate SHA-256 hash of file content
@@ -58,18 +61,35 @@ def normalize_emp_id(raw_id: str) -> str:
         return ''
     
     # Check if it's the standard format: RBIS followed optionally by non-digits, then digits
-    # Goal: 'RBIS1' -> 'RBIS0001', '1' -> 'RBIS0001'
+    # Goal: 'RBIS1' -> 'RBIS0001', '1' -> 'RBIS0001', '00100' -> 'RBIS0100'
+    # (the Monthly Detailed Report pads some codes to five digits)
     # But leave 'RBIS-CEO1' or 'ADMIN001' alone (just uppercase)
     
     # Check for pure digits first
     if raw_id.isdigit():
-        return f"RBIS{raw_id.zfill(4)}"
+        return f"RBIS{raw_id.lstrip('0').zfill(4)}"
         
     # Check for RBIS + digits ONLY (maybe with space or hyphen in between)
     match = re.search(r'^RBIS\s*[-_]?\s*(\d+)$', raw_id, re.IGNORECASE)
     if match:
         num_part = match.group(1)
-        return f"RBIS{num_part.zfill(4)}"
+        return f"RBIS{num_part.lstrip('0').zfill(4)}"
     
     # Otherwise, just return uppercase to keep it consistent
     return raw_id.upper()
+
+def validate_emp_ids(records: Iterable[Dict], offset: int = 0) -> None:
+    """
+    Check that every cleaned record's EmpID normalizes to the RBIS0000 format
+    
+    Args:
+        records: Cleaned attendance records
+        offset: Records before these ones in the file (for the row number)
+    
+    Raises:
+        ValueError: With the row number (1-based, across the whole file)
+    """
+    for i, rec in enumerate(records):
+        raw_id = rec.get('EmpID', '')
+        if not EMP_ID_PATTERN.match(normalize_emp_id(raw_id)):
+            raise ValueError(f"Data Validation Error: Row {offset+i+1} has invalid ID format '{raw_id}'")
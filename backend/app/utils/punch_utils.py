@@ -0,0 +1,79 @@
+"""
+Punch Utilities
+Packing of biometric punch logs ("09:01(in),13:02(out),...") into a compact
+binary array stored next to the original text
+"""
+import re
+import struct
+from typing import List, Optional, Tuple
+
+# Each punch is one big-endian uint16: minute of the day in the low 11 bits,
+# direction in the top two bits
+PUNCH_IN = 0
+PUNCH_OUT = 1
+PUNCH_UNKNOWN = 2
+DIRECTION_SHIFT = 14
+MINUTE_MASK = 0x07FF
+
+# Bytes reserved for the packed column (256 punches a day)
+MAX_PUNCH_BYTES = 512
+
+_PUNCH_PATTERN = re.compile(r'(\d{1,2}):(\d{2})(?::\d{2})?\s*(?:\((in|out)\))?', re.IGNORECASE)
+
+def pack_punches(punch_log: Optional[str]) -> Optional[bytes]:
+    """
+    Pack a punch log string into 2 bytes per punch
+
+    Args:
+        punch_log: Punch records as exported, e.g. "09:01(in),13:02(out),"
+
+    Returns:
+        Packed punches in log order, or None if the log has no punch times
+    """
+    if not punch_log:
+        return None
+
+    values = []
+    for hours, minutes, direction in _PUNCH_PATTERN.findall(str(punch_log)):
+        minute = int(hours) * 60 + int(minutes)
+        if minute > MINUTE_MASK:
+            continue
+        if direction:
+            flag = PUNCH_OUT if direction.lower() == "out" else PUNCH_IN
+        else:
+            flag = PUNCH_UNKNOWN
+        values.append(minute | (flag << DIRECTION_SHIFT))
+
+    values = values[:MAX_PUNCH_BYTES // 2]
+    if not values:
+        return None
+    return struct.pack(f">{len(values)}H", *values)
+
+def unpack_punches(packed: Optional[bytes]) -> List[Tuple[int, int]]:
+    """
+    Unpack stored punches
+
+    Returns:
+        List of (minute of the day, direction) with direction PUNCH_IN,
+        PUNCH_OUT or PUNCH_UNKNOWN
+    """
+    if not packed:
+        return []
+    values = struct.unpack(f">{len(packed) // 2}H", packed)
+    return [(value & MINUTE_MASK, value >> DIRECTION_SHIFT) for value in values]
+
+def break_minutes(packed: Optional[bytes]) -> int:
+    """
+    Total minutes spent out between an out punch and the next in punch
+
+    Punches without a direction are ignored.
+    """
+    total = 0
+    out_at = None
+    for minute, direction in unpack_punches(packed):
+        if direction == PUNCH_OUT:
+            out_at = minute
+        elif direction == PUNCH_IN and out_at is not None:
+            total += max(minute - out_at, 0)
+            out_at = None
+    return total
@@ -0,0 +1,228 @@
+"""
+Attendance Upload Check
+Uploads attendance into a throw-away SQLite database through the ingestion
+paths and fails if what is stored does not match what was uploaded:
+
+    cleared punch   first_in/last_out re-uploaded as "--:--" also clear the
+                    derived *_min columns
+    cleared punches punch_records re-uploaded empty also clears punch_minutes
+    retried job     an ingestion job whose database write fails mid-file is
+                    requeued by the worker with the rollups of its committed
+                    chunks up to date, and its retry writes the whole file
+    monthly sample  the Monthly Detailed Report sample in files/ is accepted
+                    by POST /attendance/upload/files (its five-digit code
+                    '00100' included) and written by the ingestion worker
+
+The first two write through AttendanceService._process_attendance_records,
+the path the ingestion worker uses.
+
+Usage (from the backend folder):
+    python benchmarks/attendance_upload_check.py
+"""
+import sys
+import os
+import tempfile
+from datetime import date
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FILES_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "files")
+INOUT_SAMPLE = os.path.join(FILES_DIR, "EmployeeInOutDurationDailyAttendance RBIS.xls")
+MONTHLY_SAMPLE = os.path.join(FILES_DIR, "Monthly_DetailedReport-December 2025.xls")
+
+# Always its own SQLite file, never the configured database
+_db_dir = tempfile.mkdtemp(prefix="hrms_check_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'check.db')}"
+os.environ["AZURE_STORAGE_CONNECTION_STRING"] = "DefaultEndpointsProtocol=https;AccountName=yourstorageaccount;AccountKey=check;EndpointSuffix=core.windows.net"
+os.environ["PARSE_CACHE_MAX_MB"] = "0"
+
+sys.path.append(BACKEND_DIR)
+
+import logging
+# The retried job logs its simulated failure
+logging.disable(logging.CRITICAL)
+
+from app.core.database import SessionLocal, engine, Base
+from app.models import models
+from app.models.models import Attendance, AttendanceMonthlySummary, AttendanceYearBitmap, Employee, IngestionJob
+from app.repositories.attendance_repository import AttendanceRepository
+from app.services import attendance_service
+from app.services.attendance_service import AttendanceService
+import ingestion_worker
+
+EMP_ID = "RBIS0001"
+DAY = date(2026, 1, 5)
+
+def _record(**fields):
+    """One cleaned In/Out record as the cleaner yields it"""
+    record = {
+        "EmpID": EMP_ID, "Date": DAY.isoformat(),
+        "First_In": "09:00", "Last_Out": "18:00",
+        "In_Duration": "08:30", "Out_Duration": "00:30", "Total_Duration": "09:00",
+        "Punch_Records": "09:00:in(Main),13:00:out(Main),13:30:in(Main),18:00:out(Main)",
+        "Attendance": "Present"
+    }
+    record.update(fields)
+    return record
+
+def reset_database(employees=1):
+    """Fresh schema with RBIS0001..RBISnnnn"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(Employee, [
+            {"emp_id": f"RBIS{n:04d}", "email": f"check{n}@example.com", "full_name": f"Employee {n}"}
+            for n in range(1, employees + 1)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+def upload(*records):
+    db = SessionLocal()
+    try:
+        AttendanceService(db)._process_attendance_records([list(records)], "check.xls")
+        db.commit()
+    finally:
+        db.close()
+
+def stored(*columns):
+    db = SessionLocal()
+    try:
+        row = db.query(*(getattr(Attendance, col) for col in columns)).filter(
+            Attendance.emp_id == EMP_ID, Attendance.date == DAY
+        ).one()
+        return dict(zip(columns, row))
+    finally:
+        db.close()
+
+def check_cleared_punch():
+    reset_database()
+    upload(_record())
+    upload(_record(First_In="--:--", Last_Out="--:--"))
+    return stored("first_in", "first_in_min", "last_out", "last_out_min") == {
+        "first_in": "--:--", "first_in_min": None, "last_out": "--:--", "last_out_min": None
+    }
+
+def check_cleared_punches():
+    reset_database()
+    upload(_record())
+    upload(_record(Punch_Records=""))
+    return stored("punch_records", "punch_minutes") == {"punch_records": "", "punch_minutes": None}
+
+def rollups_in_step():
+    """True if the stored summaries and bitmaps match a refresh from the attendance rows"""
+    db = SessionLocal()
+    try:
+        def snapshot():
+            return (
+                sorted(tuple(row) for row in db.query(
+                    AttendanceMonthlySummary.emp_id, AttendanceMonthlySummary.year, AttendanceMonthlySummary.month,
+                    AttendanceMonthlySummary.present_days, AttendanceMonthlySummary.on_leave_days,
+                    AttendanceMonthlySummary.absent_days, AttendanceMonthlySummary.total_minutes
+                )),
+                sorted(tuple(row) for row in db.query(
+                    AttendanceYearBitmap.emp_id, AttendanceYearBitmap.year, AttendanceYearBitmap.present_bits,
+                    AttendanceYearBitmap.on_leave_bits, AttendanceYearBitmap.absent_bits
+                ))
+            )
+        before = snapshot()
+        AttendanceService(db)._refresh_rollups(db.query(Attendance.emp_id, Attendance.date).all())
+        db.commit()
+        return before == snapshot() and bool(before[0])
+    finally:
+        db.close()
+
+def job_state():
+    db = SessionLocal()
+    try:
+        job = db.query(IngestionJob).one()
+        return job.status, job.attempts, db.query(Attendance).count()
+    finally:
+        db.close()
+
+def check_retried_job():
+    reset_database(60)
+    db = SessionLocal()
+    try:
+        db.add(IngestionJob(filename="inout.xls", file_content=open(INOUT_SAMPLE, "rb").read(), uploaded_by="check@example.com"))
+        db.commit()
+    finally:
+        db.close()
+
+    # Small chunks so the file spans several commits; the third write fails once
+    stream = attendance_service.cached_clean_chunks
+    upsert = AttendanceRepository.bulk_upsert
+    calls = []
+    def failing_upsert(self, rows):
+        calls.append(len(rows))
+        if len(calls) == 3:
+            raise RuntimeError("simulated database error")
+        return upsert(self, rows)
+    attendance_service.cached_clean_chunks = lambda content: stream(content, 50)
+    AttendanceRepository.bulk_upsert = failing_upsert
+    try:
+        ingestion_worker.run_pending_jobs()
+        status, attempts, partial = job_state()
+        ok = (status, attempts) == ("QUEUED", 1) and 0 < partial and rollups_in_step()
+        ingestion_worker.run_pending_jobs()
+        status, attempts, written = job_state()
+        return ok and (status, attempts) == ("DONE", 2) and written > partial and rollups_in_step()
+    finally:
+        attendance_service.cached_clean_chunks = stream
+        AttendanceRepository.bulk_upsert = upsert
+
+def check_monthly_sample():
+    # Imported here: the app is only needed for this case
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.api.dependencies import check_admin
+
+    reset_database(100)
+    db = SessionLocal()
+    try:
+        admin = Employee(emp_id="CHECK_ADMIN", email="admin@example.com", full_name="Check Admin", role="SUPER_ADMIN")
+        db.add(admin)
+        db.commit()
+        app.dependency_overrides[check_admin] = lambda: admin
+        response = TestClient(app).post("/api/v1/attendance/upload/files", files=[
+            ("files", (os.path.basename(MONTHLY_SAMPLE), open(MONTHLY_SAMPLE, "rb").read(), "application/vnd.ms-excel"))
+        ])
+    finally:
+        app.dependency_overrides.pop(check_admin, None)
+        db.close()
+    if response.status_code != 200:
+        print(f"     upload: {response.status_code} {response.json()}")
+        return False
+
+    ingestion_worker.run_pending_jobs()
+    status, _, written = job_state()
+    db = SessionLocal()
+    try:
+        padded_code_rows = db.query(Attendance).filter(Attendance.emp_id == "RBIS0100").count()
+    finally:
+        db.close()
+    return status == "DONE" and written > 0 and padded_code_rows > 0 and rollups_in_step()
+
+CHECKS = {
+    "cleared punch": check_cleared_punch,
+    "cleared punches": check_cleared_punches,
+    "retried job": check_retried_job,
+    "monthly sample": check_monthly_sample,
+}
+
+def main():
+    failed = []
+    try:
+        for name, check in CHECKS.items():
+            ok = check()
+            print(f"{'ok  ' if ok else 'FAIL'} {name}")
+            if not ok:
+                failed.append(name)
+    finally:
+        engine.dispose()
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Cleaner Parity Check
+Cleans random variants of the In/Out sample in files/ on all three cleaner
+paths and fails if their records or rejection reasons ever differ:
+
+    legacy      cleaner.detect_and_clean_memory(engine="legacy")
+    vectorized  cleaner.detect_and_clean_memory(engine="vectorized")
+    stream      cleaner.stream_clean_chunks (what the ingestion worker uses)
+
+Each variant is written as CSV and XLSX. Data cells are mutated at random
+with pandas' default NA strings ("NA", "null", "N/A", ...), which the
+in-memory readers turn into blanks, and with non-ASCII digits (Arabic-Indic,
+fullwidth) in the S.No, duration and punch columns. No database is needed.
+
+Usage (from the backend folder):
+    python benchmarks/cleaner_parity.py
+    python benchmarks/cleaner_parity.py --variants 200 --seed 42
+"""
+import sys
+import os
+import io
+import csv
+import random
+import argparse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INOUT_SAMPLE = os.path.join(os.path.dirname(BACKEND_DIR), "files", "EmployeeInOutDurationDailyAttendance RBIS.xls")
+sys.path.append(BACKEND_DIR)
+
+import logging
+logging.disable(logging.ERROR)
+
+from app.services import cleaner
+
+NA_STRINGS = sorted(cleaner.NA_VALUES - {""})
+DIGIT_SETS = (
+    str.maketrans("0123456789", "٠١٢٣٤٥٦٧٨٩"),  # Arabic-Indic
+    str.maketrans("0123456789", "０１２３４５６７８９")   # fullwidth
+)
+
+def _sample_rows():
+    rows = cleaner._iter_file_rows(open(INOUT_SAMPLE, "rb").read())
+    return [row for _, row in rows]
+
+def _data_columns(rows):
+    """(first data row, {label: column}) of the sample's header"""
+    for index, row in enumerate(rows):
+        col_map = cleaner._match_header(row)
+        if len(col_map) >= 4:
+            return index + 1, col_map
+    raise RuntimeError("sample header not found")
+
+def random_variant(rows, rng):
+    """A copy of the sample rows with random NA strings and non-ASCII digits"""
+    first_data, col_map = _data_columns(rows)
+    digit_cols = [col_map[key] for key in ("sno", "in_dur", "out_dur", "punches") if key in col_map]
+    # A blank employee code rejects the file: keep that to about one variant in five
+    na_rates = {col_map["emp_id"]: 0.001}
+    rows = [list(row) for row in rows]
+    for row in rows[first_data:]:
+        for col in range(len(row)):
+            if rng.random() < na_rates.get(col, 0.02):
+                row[col] = rng.choice(NA_STRINGS)
+            elif col in digit_cols and rng.random() < 0.05:
+                row[col] = row[col].translate(rng.choice(DIGIT_SETS))
+    return rows
+
+def to_csv(rows):
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+def to_xlsx(rows):
+    import xlsxwriter
+    buf = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buf, {"in_memory": True})
+    sheet = workbook.add_worksheet()
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            if value:
+                sheet.write_string(r, c, value)
+    workbook.close()
+    return buf.getvalue()
+
+WRITERS = {"csv": to_csv, "xlsx": to_xlsx}
+
+def streamed(content):
+    """stream_clean_chunks drained into (records, detected_type) or (None, reason)"""
+    chunks, detected_type = cleaner.stream_clean_chunks(content)
+    if chunks is None:
+        return None, detected_type
+    try:
+        return [record for chunk in chunks for record in chunk], detected_type
+    except ValueError as e:
+        return None, str(e)
+
+def check(variants, seed):
+    """Returns the list of (variant, format, path, outcome, legacy outcome) that differ"""
+    rng = random.Random(seed)
+    sample = _sample_rows()
+    cases = [("sample", sample)] + [(f"variant {n}", random_variant(sample, rng)) for n in range(variants)]
+
+    mismatches = []
+    for name, rows in cases:
+        for file_format, writer in WRITERS.items():
+            content = writer(rows)
+            expected = cleaner.detect_and_clean_memory(content, engine=cleaner.ENGINE_LEGACY)
+            outcomes = {
+                "vectorized": cleaner.detect_and_clean_memory(content, engine=cleaner.ENGINE_VECTORIZED),
+                "stream": streamed(content)
+            }
+            for path, outcome in outcomes.items():
+                if outcome != expected:
+                    mismatches.append((name, file_format, path, outcome, expected))
+    return len(cases), mismatches
+
+def _describe(outcome):
+    records, detected = outcome
+    return detected if records is None else f"{len(records)} records"
+
+def _first_difference(outcome, expected):
+    if outcome[0] is None or expected[0] is None:
+        return ""
+    for actual, wanted in zip(outcome[0], expected[0]):
+        if actual != wanted:
+            return f"\n    {actual}\n    legacy {wanted}"
+    return ""
+
+def main():
+    parser = argparse.ArgumentParser(description="Cleaner engine parity check")
+    parser.add_argument("--variants", type=int, default=50, help="Random variants of the sample to compare")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    cases, mismatches = check(args.variants, args.seed)
+    for name, file_format, path, outcome, expected in mismatches[:20]:
+        print(f"MISMATCH {name} {file_format}: {path} {_describe(outcome)}, legacy {_describe(expected)}"
+              f"{_first_difference(outcome, expected)}")
+    if mismatches:
+        print(f"{len(mismatches)} mismatches over {cases} files x {len(WRITERS)} formats")
+        sys.exit(1)
+    print(f"{cases} files x {len(WRITERS)} formats: legacy, vectorized and stream cleaners agree")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Attendance Ingestion Benchmark
+Synthesizes scaled copies of the sample exports in files/ and times each
+ingestion phase against a throw-away SQLite database:
+
+    parse      cleaner.detect_and_clean_memory (whole file in memory)
+    stream     cleaner.stream_clean_chunks (what the ingestion worker uses)
+    validate   AttendanceService._validate_chunk over every record
+    write      AttendanceService._process_attendance_records into an empty table,
+               in DEFAULT_CHUNK_SIZE chunks like the ingestion worker
+    upload     AttendanceService.process_uploaded_files end to end (re-upload;
+               stored content hashes are cleared first so every day is written
+               again instead of being skipped as unchanged)
+
+Each phase reports rows/sec and the peak Python memory seen by tracemalloc.
+Employee codes are RBIS + 4 digits, so the largest scale is 9,999 employees.
+
+Usage (from the backend folder):
+    python benchmarks/ingestion_benchmark.py
+    python benchmarks/ingestion_benchmark.py --employees 100,1000,9999 --days 1,31 --report inout,monthly
+    python benchmarks/ingestion_benchmark.py --json bench.json
+    python benchmarks/ingestion_benchmark.py --baseline bench.json --tolerance 0.25
+"""
+import sys
+import os
+import io
+import re
+import csv
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FILES_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "files")
+INOUT_SAMPLE = os.path.join(FILES_DIR, "EmployeeInOutDurationDailyAttendance RBIS.xls")
+MONTHLY_SAMPLE = os.path.join(FILES_DIR, "Monthly_DetailedReport-December 2025.xls")
+
+MAX_EMPLOYEES = 9999
+MAX_DAYS = 31
+START_DATE = date(2026, 1, 1)
+
+# The benchmark always runs against its own SQLite file, never the configured
+# database, and must not touch blob storage or the parse cache
+_db_dir = tempfile.mkdtemp(prefix="hrms_bench_")
+DB_PATH = os.path.join(_db_dir, "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["AZURE_STORAGE_CONNECTION_STRING"] = "DefaultEndpointsProtocol=https;AccountName=yourstorageaccount;AccountKey=bench;EndpointSuffix=core.windows.net"
+os.environ["PARSE_CACHE_MAX_MB"] = "0"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+sys.path.append(BACKEND_DIR)
+
+import logging
+logging.disable(logging.WARNING)
+
+from starlette.datastructures import UploadFile
+from app.core.database import SessionLocal, engine, Base
+from app.models import models
+from app.models.models import Attendance, Employee, UserRole
+from app.services import cleaner
+from app.services.attendance_service import AttendanceService
+
+# ---------------------------------------------------------------------------
+# Synthetic files
+# ---------------------------------------------------------------------------
+
+def _sample_rows(path):
+    rows = cleaner._iter_file_rows(open(path, "rb").read())
+    return [row for _, row in rows]
+
+def _random_day(rng):
+    """(first_in, last_out, in_minutes, out_minutes, punches) for one employee-day"""
+    if rng.random() < 0.2:
+        return None
+    first_in = rng.randint(9 * 60, 11 * 60)
+    punches = [first_in]
+    in_min = out_min = 0
+    t = first_in
+    for _ in range(rng.randint(1, 4)):
+        stint = rng.randint(60, 180)
+        t += stint
+        in_min += stint
+        punches.append(t)
+        gap = rng.randint(5, 45)
+        t += gap
+        out_min += gap
+        punches.append(t)
+    punches.pop()
+    out_min -= gap
+    last_out = min(punches[-1], 23 * 60 + 59)
+    return first_in, last_out, in_min, out_min, punches
+
+def _hhmm(minutes):
+    minutes = min(minutes, 23 * 60 + 59)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def synthesize_inout(employees, days, seed=0):
+    """Rows of an In/Out Duration Report covering `days` days for `employees` people"""
+    template = _sample_rows(INOUT_SAMPLE)
+    date_row_idx = next(i for i, r in enumerate(template) if cleaner.DATE_MARKER in " ".join(r).lower())
+    header_idx = next(i for i, r in enumerate(template) if len(cleaner._match_header(r)) >= 4)
+    col_map = cleaner._match_header(template[header_idx])
+    width = len(template[header_idx])
+    date_col = next(i for i, v in enumerate(template[date_row_idx]) if re.search(cleaner.DATE_PATTERNS[0], v.lower()))
+
+    rng = random.Random(seed)
+    preamble = template[:date_row_idx]
+    yield from preamble
+    for d in range(days):
+        day = START_DATE + timedelta(days=d)
+        date_row = list(template[date_row_idx])
+        date_row[date_col] = day.strftime("%d-%b-%Y")
+        yield date_row
+        yield from template[date_row_idx + 1:header_idx + 1]
+        for n in range(1, employees + 1):
+            row = [""] * width
+            row[col_map["sno"]] = str(n)
+            row[col_map["emp_id"]] = f"{n:04d}"
+            row[col_map["emp_name"]] = f"Employee {n}"
+            punched = _random_day(rng)
+            if punched:
+                _, _, in_min, out_min, punches = punched
+                row[col_map["in_dur"]] = _hhmm(in_min)
+                row[col_map["out_dur"]] = _hhmm(out_min)
+                row[col_map["punches"]] = "".join(
+                    f"{_hhmm(p)}({'in' if k % 2 == 0 else 'out'})," for k, p in enumerate(punches)
+                )
+            else:
+                row[col_map["in_dur"]] = row[col_map["out_dur"]] = "00:00"
+            yield row
+        yield [""] * width
+
+def synthesize_monthly(employees, days, seed=0):
+    """Rows of a Monthly Detailed Attendance Report covering `days` days for `employees` people"""
+    template = _sample_rows(MONTHLY_SAMPLE)
+    labels = [next((v.lower().rstrip(":- ") for v in r if v), "") for r in template]
+    block_start = labels.index("employee code")
+    block_end = labels.index("status", block_start)
+    block = template[block_start:block_end + 1]
+    block_labels = labels[block_start:block_end + 1]
+    day_row = block[block_labels.index("day")]
+    day_cols = [i for i, v in enumerate(day_row) if re.fullmatch(r"day\s*\d{1,2}", v.lower())][:days]
+
+    end_date = START_DATE + timedelta(days=days - 1)
+    period = f"{START_DATE.strftime('%d-%b-%Y')} To {end_date.strftime('%d-%b-%Y')}"
+    for row in template[:block_start]:
+        yield [period if re.search(cleaner.MONTHLY_PERIOD_PATTERN, v.lower()) else v for v in row]
+
+    rng = random.Random(seed)
+    code_row = block[0]
+    # Employee code and name sit in the first filled cell after their labels
+    filled = [i for i, v in enumerate(code_row) if v]
+    label_cols = {code_row[i].lower().rstrip(":- "): i for i in filled}
+    code_col = next(i for i in filled if i > label_cols["employee code"])
+    name_col = next(i for i in filled if i > label_cols["employee name"])
+
+    # Rows from "Day" down to "Status" hold one value per day column
+    per_day_labels = set(block_labels[block_labels.index("day"):])
+
+    for n in range(1, employees + 1):
+        per_day = [_random_day(rng) for _ in day_cols]
+        for label, template_row in zip(block_labels, block):
+            if label not in per_day_labels:
+                row = list(template_row)
+                if label == "employee code":
+                    row[code_col] = f"{n:04d}"
+                    row[name_col] = f"Employee {n}"
+                yield row
+                continue
+            row = [v if i == 0 or v.lower().rstrip(":- ") == label else "" for i, v in enumerate(template_row)]
+            for col, punched in zip(day_cols, per_day):
+                if label == "day":
+                    row[col] = template_row[col]
+                elif label == "in time":
+                    row[col] = f"{_hhmm(punched[0])}:00" if punched else "00:00"
+                elif label == "out time":
+                    row[col] = f"{_hhmm(punched[1])}:00" if punched else "00:00"
+                elif label in ("duration", "t duration"):
+                    row[col] = _hhmm(punched[2]) if punched else "00:00"
+                elif label == "status":
+                    row[col] = "P" if punched else "A"
+                elif label == "shift":
+                    row[col] = "GS"
+                elif label:
+                    row[col] = "00:00"
+            yield row
+
+def to_xlsx(rows):
+    import xlsxwriter
+    buf = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buf, {"in_memory": True})
+    sheet = workbook.add_worksheet()
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            if value:
+                sheet.write_string(r, c, value)
+    workbook.close()
+    return buf.getvalue()
+
+def to_csv(rows):
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+SYNTHESIZERS = {"inout": synthesize_inout, "monthly": synthesize_monthly}
+WRITERS = {"xlsx": to_xlsx, "csv": to_csv}
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def measure(fn, track_memory):
+    """Run fn once; returns (result, seconds, peak_bytes or None)"""
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = fn()
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = None
+        if track_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+def reset_database(employees):
+    """Fresh schema with the admin user and RBIS0001..RBISnnnn"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add(Employee(emp_id="BENCH_ADMIN", email="bench@example.com", full_name="Bench Admin", role=UserRole.SUPER_ADMIN))
+        db.bulk_insert_mappings(Employee, [
+            {"emp_id": f"RBIS{n:04d}", "email": f"bench{n}@example.com", "full_name": f"Employee {n}", "is_active": True}
+            for n in range(1, employees + 1)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+def run_case(report, employees, days, file_format, track_memory):
+    rows = SYNTHESIZERS[report](employees, days)
+    content = WRITERS[file_format](rows)
+    case = f"{report}/{file_format} {employees}x{days}"
+    results = []
+
+    def record(phase, count, seconds, peak):
+        results.append({
+            "case": case, "phase": phase, "rows": count, "seconds": round(seconds, 4),
+            "rows_per_sec": round(count / seconds, 1) if seconds else None,
+            "peak_mb": round(peak / 1024 / 1024, 2) if peak is not None else None,
+            "file_kb": round(len(content) / 1024, 1)
+        })
+
+    (records, detected), seconds, peak = measure(lambda: cleaner.detect_and_clean_memory(content), track_memory)
+    if records is None:
+        raise RuntimeError(f"{case}: synthesized file rejected: {detected}")
+    record("parse", len(records), seconds, peak)
+
+    def stream():
+        chunks, _ = cleaner.stream_clean_chunks(content)
+        return sum(len(chunk) for chunk in chunks)
+    count, seconds, peak = measure(stream, track_memory)
+    record("stream", count, seconds, peak)
+
+    reset_database(employees)
+    db = SessionLocal()
+    try:
+        service = AttendanceService(db)
+        admin = db.query(Employee).filter(Employee.emp_id == "BENCH_ADMIN").first()
+
+        _, seconds, peak = measure(lambda: service._validate_chunk(records, 0), track_memory)
+        record("validate", len(records), seconds, peak)
+
+        chunks = [records[i:i + cleaner.DEFAULT_CHUNK_SIZE] for i in range(0, len(records), cleaner.DEFAULT_CHUNK_SIZE)]
+        def write():
+            total, _ = service._process_attendance_records(chunks, f"bench.{file_format}")
+            db.commit()
+            return total
+        count, seconds, peak = measure(write, track_memory)
+        record("write", count, seconds, peak)
+
+        def upload():
+            upload_file = UploadFile(file=io.BytesIO(content), filename=f"bench.{file_format}")
+            result = service.process_uploaded_files([upload_file], admin)["results"][0]
+            if result["status"] != "success":
+                raise RuntimeError(f"{case}: upload failed: {result.get('reason')}")
+            return len(records)
+        db.query(Attendance).update({Attendance.content_hash: None}, synchronize_session=False)
+        db.commit()
+        count, seconds, peak = measure(upload, track_memory)
+        record("upload", count, seconds, peak)
+    finally:
+        db.close()
+
+    return results
+
+def print_table(results):
+    print(f"{'case':<28} {'phase':<9} {'rows':>9} {'seconds':>9} {'rows/sec':>11} {'peak MB':>8}")
+    for r in results:
+        peak = f"{r['peak_mb']:.2f}" if r["peak_mb"] is not None else "-"
+        print(f"{r['case']:<28} {r['phase']:<9} {r['rows']:>9} {r['seconds']:>9.3f} {r['rows_per_sec']:>11.0f} {peak:>8}")
+
+def compare_to_baseline(results, baseline_path, tolerance):
+    """Returns the list of (case, phase, old, new) whose rows/sec dropped by more than tolerance"""
+    with open(baseline_path) as f:
+        baseline = {(r["case"], r["phase"]): r for r in json.load(f)}
+    regressions = []
+    for r in results:
+        old = baseline.get((r["case"], r["phase"]))
+        if old and old["rows_per_sec"] and r["rows_per_sec"] < old["rows_per_sec"] * (1 - tolerance):
+            regressions.append((r["case"], r["phase"], old["rows_per_sec"], r["rows_per_sec"]))
+    return regressions
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Attendance ingestion benchmark")
+    parser.add_argument("--employees", type=_int_list, default=[100, 1000, 9999], help="Comma-separated employee counts (max 9999)")
+    parser.add_argument("--days", type=_int_list, default=[1, 31], help="Comma-separated day counts (max 31)")
+    parser.add_argument("--report", default="inout,monthly", help="Comma-separated report layouts: inout, monthly")
+    parser.add_argument("--format", dest="file_format", default="xlsx", choices=sorted(WRITERS), help="Synthesized file format")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (its overhead inflates timings)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare rows/sec with a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed rows/sec drop versus the baseline (fraction)")
+    args = parser.parse_args()
+
+    reports = [r.strip() for r in args.report.split(",") if r.strip()]
+    for report in reports:
+        if report not in SYNTHESIZERS:
+            parser.error(f"unknown report layout '{report}'")
+    if any(n < 1 or n > MAX_EMPLOYEES for n in args.employees):
+        parser.error(f"--employees values must be between 1 and {MAX_EMPLOYEES}")
+    if any(d < 1 or d > MAX_DAYS for d in args.days):
+        parser.error(f"--days values must be between 1 and {MAX_DAYS}")
+
+    print(f"SQLite database: {DB_PATH}")
+    results = []
+    try:
+        for report in reports:
+            for employees in args.employees:
+                for days in args.days:
+                    case_results = run_case(report, employees, days, args.file_format, not args.no_memory)
+                    print_table(case_results)
+                    results.extend(case_results)
+    finally:
+        engine.dispose()
+        try:
+            os.remove(DB_PATH)
+            os.rmdir(_db_dir)
+        except OSError:
+            pass
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        for case, phase, old, new in regressions:
+            print(f"REGRESSION {case} {phase}: {old:.0f} -> {new:.0f} rows/sec")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
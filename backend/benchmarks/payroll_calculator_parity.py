@@ -0,0 +1,100 @@
+"""
+Payroll Calculator Parity Check
+Computes random payroll cases on both net pay paths and fails if they ever
+differ by a paisa:
+
+    decimal     PayrollService._build_payroll_data (process_payroll)
+    vectorized  payroll_calculator.calculate_net_paise (process_all_payroll)
+
+Deduction lines come from PayrollService._deduction_lines on both paths, as
+in the services. Cases mix realistic salaries with edge cases: half days,
+paid days above the working days, zero working days and deductions larger
+than the prorated pay. No database is needed.
+
+Usage (from the backend folder):
+    python benchmarks/payroll_calculator_parity.py
+    python benchmarks/payroll_calculator_parity.py --cases 1000000 --seed 42
+"""
+import sys
+import os
+import random
+import argparse
+from decimal import Decimal
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from app.services.payroll_calculator import calculate_net_paise, from_paise, paise_array, to_paise
+from app.services.payroll_service import PayrollService
+
+ALLOWANCES = (
+    "hra", "transport_allowance", "dearness_allowance",
+    "medical_allowance", "special_allowance", "other_allowances"
+)
+
+def _money(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)).scaleb(-2)
+
+def random_case(rng):
+    """(salary, deduction pairs, attendance, working_days) for one employee-month"""
+    components = {"basic_salary": _money(rng, 0, 500000)}
+    for field in ALLOWANCES:
+        components[field] = _money(rng, 0, 100000)
+    salary = SimpleNamespace(emp_id="RBIS0001", gross_salary=sum(components.values()), **components)
+
+    deductions = []
+    for _ in range(rng.randint(0, 4)):
+        if rng.random() < 0.5:
+            deduction = SimpleNamespace(calculation_type="PERCENTAGE", value=_money(rng, 0, 100))
+        else:
+            deduction = SimpleNamespace(calculation_type="FIXED", value=_money(rng, 0, 200000 if rng.random() < 0.1 else 5000))
+        deductions.append((deduction, "Deduction"))
+
+    working_days = 0 if rng.random() < 0.01 else rng.randint(20, 31)
+    present = Decimal(rng.randint(0, 62)) / 2  # half days
+    attendance = {
+        "present_days": float(present),
+        "on_leave_days": rng.randint(0, 5),
+        "absent_days": 0
+    }
+    return salary, deductions, attendance, working_days
+
+def check(cases, seed):
+    """Returns the list of (case index, decimal net, vectorized net) that differ"""
+    rng = random.Random(seed)
+    computed = []
+    for _ in range(cases):
+        salary, pairs, attendance, working_days = random_case(rng)
+        lines = PayrollService._deduction_lines(salary, pairs)
+        record = PayrollService._build_payroll_data(salary, lines, attendance, working_days, 1, 2026, "PARITY")
+        computed.append((salary, lines, attendance, working_days, record["net_salary"]))
+
+    net_paise = calculate_net_paise(
+        paise_array(salary.gross_salary for salary, _, _, _, _ in computed),
+        [att["present_days"] + att["on_leave_days"] for _, _, att, _, _ in computed],
+        [working_days for _, _, _, working_days, _ in computed],
+        [sum(to_paise(line["amount"]) for line in lines) for _, lines, _, _, _ in computed]
+    )
+    return [
+        (index, expected, from_paise(net))
+        for index, ((_, _, _, _, expected), net) in enumerate(zip(computed, net_paise))
+        if from_paise(net) != expected
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Payroll calculator parity check")
+    parser.add_argument("--cases", type=int, default=200000, help="Random cases to compare")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    mismatches = check(args.cases, args.seed)
+    for index, expected, actual in mismatches[:20]:
+        print(f"MISMATCH case {index}: decimal {expected} vectorized {actual}")
+    if mismatches:
+        print(f"{len(mismatches)} of {args.cases} cases differ")
+        sys.exit(1)
+    print(f"{args.cases} cases: decimal and vectorized net pay agree to the paisa")
+
+if __name__ == "__main__":
+    main()
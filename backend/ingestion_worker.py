@@ -0,0 +1,92 @@
+"""
+Attendance Ingestion Worker
+Processes queued attendance upload jobs outside the web workers, so large
+uploads survive API restarts and uvicorn workers never hold ingestion data.
+
+Usage (from the backend folder):
+    python ingestion_worker.py          # run forever, polling for jobs
+    python ingestion_worker.py --once   # drain the queue and exit
+"""
+import sys
+import os
+import time
+import logging
+import argparse
+from datetime import timedelta
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal, engine, Base
+from app.models import models
+from app.models.models import get_ist_now
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.services.attendance_service import AttendanceService
+
+logger = logging.getLogger("ingestion_worker")
+
+def requeue_stale_jobs() -> int:
+    """Return jobs orphaned by a crashed worker to the queue"""
+    settings = get_settings()
+    db = SessionLocal()
+    try:
+        cutoff = get_ist_now() - timedelta(minutes=settings.INGESTION_STALE_MINUTES)
+        count = IngestionJobRepository(db).requeue_stale(cutoff, settings.INGESTION_MAX_ATTEMPTS)
+        if count:
+            logger.warning(f"Requeued {count} stale ingestion job(s)")
+        return count
+    finally:
+        db.close()
+
+def run_pending_jobs() -> int:
+    """Process queued jobs until the queue is empty; returns the number handled"""
+    max_attempts = get_settings().INGESTION_MAX_ATTEMPTS
+    handled = 0
+    while True:
+        db = SessionLocal()
+        job_id = None
+        try:
+            job = IngestionJobRepository(db).claim_next()
+            if not job:
+                return handled
+            job_id = job.id
+            logger.info(f"Processing upload job {job.id} ({job.filename})")
+            result = AttendanceService(db).run_upload_job(job)
+            logger.info(f"Upload job {job.id} finished: {result.get('status')} - {result.get('details') or result.get('reason')}")
+            handled += 1
+        except Exception as e:
+            # Unexpected failure: retry the job later, up to INGESTION_MAX_ATTEMPTS;
+            # if even that fails (e.g. DB outage) the stale sweep picks it up
+            logger.error(f"Ingestion worker error: {e}", exc_info=True)
+            db.rollback()
+            if job_id is not None:
+                try:
+                    IngestionJobRepository(db).release_failed(job_id, (str(e).splitlines() or [repr(e)])[0], max_attempts)
+                except Exception:
+                    db.rollback()
+            return handled
+        finally:
+            db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Attendance ingestion worker")
+    parser.add_argument("--once", action="store_true", help="Drain the queue and exit")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    # Make sure the job table exists when the worker starts before the API
+    Base.metadata.create_all(bind=engine)
+
+    logger.info("Attendance ingestion worker started")
+    while True:
+        requeue_stale_jobs()
+        run_pending_jobs()
+        if args.once:
+            break
+        time.sleep(settings.INGESTION_POLL_SECONDS)
+
+if __name__ == "__main__":
+    main()
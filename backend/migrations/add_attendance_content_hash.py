@@ -0,0 +1,26 @@
+"""
+Database Migration: content fingerprint on attendance
+Adds attendance.content_hash. Existing rows stay NULL, so the first
+re-upload of a file writes its days once and records their fingerprints;
+later re-uploads skip the days that did not change.
+
+Run from the backend folder: python migrations/add_attendance_content_hash.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+from app.core.database import engine
+
+def migrate():
+    existing = {col["name"] for col in inspect(engine).get_columns("attendance")}
+    if "content_hash" in existing:
+        print("Column attendance.content_hash already exists.")
+        return
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE attendance ADD content_hash VARCHAR(16) NULL"))
+    print("Added column attendance.content_hash")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,74 @@
+"""
+Database Migration: Integer minute columns on attendance
+Adds first_in_min, last_out_min, in_duration_min, out_duration_min and
+total_duration_min, then backfills them from the "HH:MM" text columns in
+id-ordered batches so the table is never locked for long.
+
+Run from the backend folder: python migrations/add_attendance_minute_columns.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text, update, or_
+from app.core.database import SessionLocal, engine
+from app.models.attendance import Attendance
+from app.repositories.attendance_repository import MINUTE_COLUMNS
+from app.utils.date_utils import time_to_minutes
+
+BATCH_SIZE = 1000
+
+def add_columns():
+    existing = {col["name"] for col in inspect(engine).get_columns("attendance")}
+    with engine.begin() as conn:
+        for minute_col in MINUTE_COLUMNS.values():
+            if minute_col not in existing:
+                conn.execute(text(f"ALTER TABLE attendance ADD {minute_col} INTEGER NULL"))
+                print(f"Added column attendance.{minute_col}")
+
+def backfill():
+    text_cols = [getattr(Attendance, col) for col in MINUTE_COLUMNS]
+    # Only rows that have text but no minutes yet, so the script can be re-run;
+    # keyset paging on id means unparseable values ("--:--") are passed once
+    pending = or_(*(
+        getattr(Attendance, text_col).isnot(None) & getattr(Attendance, minute_col).is_(None)
+        for text_col, minute_col in MINUTE_COLUMNS.items()
+    ))
+
+    db = SessionLocal()
+    last_id = 0
+    updated = 0
+    try:
+        while True:
+            rows = db.query(Attendance.id, *text_cols).filter(
+                Attendance.id > last_id, pending
+            ).order_by(Attendance.id).limit(BATCH_SIZE).all()
+            if not rows:
+                break
+
+            db.execute(update(Attendance), [
+                {
+                    "id": row.id,
+                    **{minute_col: time_to_minutes(getattr(row, text_col)) for text_col, minute_col in MINUTE_COLUMNS.items()}
+                }
+                for row in rows
+            ])
+            db.commit()
+            last_id = rows[-1].id
+            updated += len(rows)
+            print(f"Backfilled {updated} rows (up to id {last_id})")
+    except Exception as e:
+        print(f"Error during backfill: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"Done. {updated} attendance rows backfilled.")
+
+def migrate():
+    add_columns()
+    backfill()
+
+if __name__ == "__main__":
+    migrate()
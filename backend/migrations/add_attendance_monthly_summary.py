@@ -0,0 +1,34 @@
+"""
+Database Migration: attendance_monthly_summary rollup table
+Creates the table and fills it from the existing attendance rows. Safe to
+re-run: the rollup is rebuilt from scratch each time.
+
+Run from the backend folder (after add_attendance_minute_columns.py):
+    python migrations/add_attendance_monthly_summary.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal, engine
+from app.models.attendance_summary import AttendanceMonthlySummary
+from app.repositories.attendance_summary_repository import AttendanceSummaryRepository
+
+def migrate():
+    AttendanceMonthlySummary.__table__.create(bind=engine, checkfirst=True)
+    print("Table attendance_monthly_summary is in place.")
+
+    db = SessionLocal()
+    try:
+        count = AttendanceSummaryRepository(db).rebuild_all()
+        db.commit()
+        print(f"Built {count} employee-month summary rows.")
+    except Exception as e:
+        print(f"Error while building summaries: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,69 @@
+"""
+Database Migration: packed punch column on attendance
+Adds punch_minutes (punch_records packed as 2 bytes per punch, see
+app/utils/punch_utils.py) and backfills it from the stored punch logs in
+id-ordered batches.
+
+Run from the backend folder: python migrations/add_attendance_punch_minutes.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text, update, LargeBinary
+from app.core.database import SessionLocal, engine
+from app.models.attendance import Attendance
+from app.utils.punch_utils import pack_punches, MAX_PUNCH_BYTES
+
+BATCH_SIZE = 1000
+
+def add_column():
+    existing = {col["name"] for col in inspect(engine).get_columns("attendance")}
+    if "punch_minutes" in existing:
+        return
+    column_type = LargeBinary(MAX_PUNCH_BYTES).compile(dialect=engine.dialect)
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE attendance ADD punch_minutes {column_type} NULL"))
+    print("Added column attendance.punch_minutes")
+
+def backfill():
+    db = SessionLocal()
+    last_id = 0
+    updated = 0
+    try:
+        while True:
+            rows = db.query(Attendance.id, Attendance.punch_records).filter(
+                Attendance.id > last_id,
+                Attendance.punch_records.isnot(None),
+                Attendance.punch_minutes.is_(None)
+            ).order_by(Attendance.id).limit(BATCH_SIZE).all()
+            if not rows:
+                break
+
+            # Logs without any punch time stay NULL and are passed once
+            params = [
+                {"id": row.id, "punch_minutes": packed}
+                for row in rows
+                if (packed := pack_punches(row.punch_records)) is not None
+            ]
+            if params:
+                db.execute(update(Attendance), params)
+            db.commit()
+            last_id = rows[-1].id
+            updated += len(params)
+            print(f"Backfilled {updated} rows (up to id {last_id})")
+    except Exception as e:
+        print(f"Error during backfill: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"Done. {updated} attendance rows backfilled.")
+
+def migrate():
+    add_column()
+    backfill()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,44 @@
+"""
+Database Migration: Unique (emp_id, date) on attendance
+Removes duplicate attendance rows (keeping the newest per employee and day)
+and creates the uq_attendance_emp_date unique index used by bulk upserts.
+
+Run from the backend folder: python migrations/add_attendance_unique_key.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.core.database import SessionLocal, engine
+from app.models.attendance import Attendance
+
+DEDUPE_SQL = """
+DELETE FROM attendance
+WHERE id NOT IN (
+    SELECT keep_id FROM (
+        SELECT MAX(id) AS keep_id FROM attendance GROUP BY emp_id, date
+    ) AS latest
+)
+"""
+
+def migrate():
+    db = SessionLocal()
+    try:
+        removed = db.execute(text(DEDUPE_SQL)).rowcount
+        db.commit()
+        print(f"Removed {removed} duplicate attendance rows.")
+    except Exception as e:
+        print(f"Error while removing duplicates: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    for index in Attendance.__table__.indexes:
+        if index.name == "uq_attendance_emp_date":
+            index.create(bind=engine, checkfirst=True)
+            print("Unique index uq_attendance_emp_date is in place.")
+
+if __name__ == "__main__":
+    migrate()
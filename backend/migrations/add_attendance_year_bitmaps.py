@@ -0,0 +1,33 @@
+"""
+Database Migration: attendance_year_bitmaps table
+Creates the table and builds the per-employee yearly status bitmaps from the
+existing attendance rows. Safe to re-run: every bitmap is rebuilt.
+
+Run from the backend folder: python migrations/add_attendance_year_bitmaps.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal, engine
+from app.models.attendance_calendar import AttendanceYearBitmap
+from app.repositories.attendance_bitmap_repository import AttendanceBitmapRepository
+
+def migrate():
+    AttendanceYearBitmap.__table__.create(bind=engine, checkfirst=True)
+    print("Table attendance_year_bitmaps is in place.")
+
+    db = SessionLocal()
+    try:
+        count = AttendanceBitmapRepository(db).rebuild_all()
+        db.commit()
+        print(f"Built bitmaps for {count} employee-years.")
+    except Exception as e:
+        print(f"Error while building bitmaps: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,39 @@
+"""
+Database Migration: updated_at on payroll inputs
+Adds updated_at to salary_structures, employee_deductions and
+deduction_types. The payroll preview cache versions its inputs with
+(COUNT, MAX(updated_at)) per table. Existing rows are stamped with the
+migration time (salary structures with their created_at when known).
+Safe to re-run.
+
+Run from the backend folder: python migrations/add_payroll_input_updated_at.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+from app.core.database import engine
+from app.models.base import get_ist_now
+
+TABLES = ("salary_structures", "employee_deductions", "deduction_types")
+
+def migrate():
+    inspector = inspect(engine)
+    now = get_ist_now()
+    for table in TABLES:
+        existing = {col["name"] for col in inspector.get_columns(table)}
+        if "updated_at" in existing:
+            print(f"Column {table}.updated_at already exists.")
+            continue
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {table} ADD updated_at DATETIME NULL"))
+        with engine.begin() as conn:
+            if table == "salary_structures":
+                conn.execute(text(f"UPDATE {table} SET updated_at = COALESCE(created_at, :now)"), {"now": now})
+            else:
+                conn.execute(text(f"UPDATE {table} SET updated_at = :now"), {"now": now})
+        print(f"Added column {table}.updated_at")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,20 @@
+"""
+Database Migration: payroll_recompute_marks table
+Creates the queue of unpaid payroll records to recompute after late
+attendance, leave or salary changes. Safe to re-run.
+
+Run from the backend folder: python migrations/add_payroll_recompute_marks.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import engine
+from app.models.payroll import PayrollRecomputeMark
+
+def migrate():
+    PayrollRecomputeMark.__table__.create(bind=engine, checkfirst=True)
+    print("Table payroll_recompute_marks is in place.")
+
+if __name__ == "__main__":
+    migrate()
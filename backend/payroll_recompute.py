@@ -0,0 +1,54 @@
+"""
+Payroll Recompute Job
+Recalculates only the unpaid payroll records queued by attendance
+corrections, leave approvals and salary changes made after the month was
+processed (see PayrollService.recompute_marked_payroll). Meant to run on a
+schedule, e.g. every few minutes from cron or a Windows scheduled task.
+
+Usage (from the backend folder):
+    python payroll_recompute.py                  # handle every queued record
+    python payroll_recompute.py --limit 1000     # at most 1000 per run
+"""
+import sys
+import os
+import json
+import logging
+import argparse
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.services.payroll_service import PayrollService
+
+logger = logging.getLogger("payroll_recompute")
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute queued payroll records")
+    parser.add_argument("--limit", type=int, default=None, help="Handle at most this many queued records")
+    parser.add_argument("--processed-by", default="SYSTEM", help="Recorded as processed_by on the recomputed records")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    db = SessionLocal()
+    try:
+        report = PayrollService(db).recompute_marked_payroll(args.processed_by, limit=args.limit)
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for result in report["results"]:
+            if result["status"] != "success":
+                print(f"  {result['emp_id']} {result['month']}/{result['year']}: {result['status']} ({result['error']})")
+        print(f"Recomputed {report['recomputed']}, skipped {report['skipped']}, failed {report['failed']}")
+
+    sys.exit(1 if report["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Parallel Payroll Run
+Processes a month's payroll for every employee with an active salary,
+sharded across worker processes (see app/services/payroll_run_service.py).
+
+Usage (from the backend folder):
+    python payroll_run.py 1 2026                 # January 2026, one process per CPU core
+    python payroll_run.py 1 2026 --workers 4     # four shards
+"""
+import sys
+import os
+import json
+import logging
+import argparse
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import get_settings
+from app.services.payroll_run_service import run_parallel_payroll
+
+logger = logging.getLogger("payroll_run")
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel payroll run")
+    parser.add_argument("month", type=int, help="Month (1-12)")
+    parser.add_argument("year", type=int, help="Year")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: PAYROLL_RUN_WORKERS)")
+    parser.add_argument("--processed-by", default="SYSTEM", help="Recorded as processed_by on the payroll records")
+    parser.add_argument("--json", action="store_true", help="Print the full run report as JSON")
+    args = parser.parse_args()
+    if not 1 <= args.month <= 12:
+        parser.error("month must be between 1 and 12")
+
+    settings = get_settings()
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    report = run_parallel_payroll(args.month, args.year, args.processed_by, workers=args.workers)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for shard in report["shards"]:
+            first, last = shard["emp_id_range"]
+            detail = shard.get("error") or f"{shard['processed']} employees"
+            print(f"{first}..{last}: {shard['status']} ({detail})")
+        for result in report["results"]:
+            if result["status"] != "success":
+                print(f"  {result['emp_id']}: {result['error']}")
+        print(f"Processed {report['processed']}: {report['succeeded']} succeeded, {report['failed']} failed, "
+              f"{report['failed_shards']} failed shard(s)")
+
+    sys.exit(1 if report["failed_shards"] else 0)
+
+if __name__ == "__main__":
+    main()